@@ -0,0 +1,78 @@
+"""Microbenchmark the precompiled AdClassifier against the original per-indicator loop.
+
+Usage: python benchmarks/bench_ad_classifier.py [posts] [words_per_post]
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from ad_classifier import PROMOTIONAL_RULES, AdClassifier
+from synthetic import FILLER_WORDS, TOPIC_WORDS
+
+AD_INDICATORS = [
+    "sponsored", "advertisement", "promoted", "download now", "get the full report",
+    "sign up", "register now", "limited time", "special offer", "free trial",
+    "contact us", "book a demo", "schedule a call", "learn more", "click here",
+    "check out", "try now", "get started", "join us", "subscribe",
+    "our product", "our service", "our solution", "our platform", "our tool",
+    "we help", "we provide", "we offer", "we deliver", "we create",
+    "gofund.me", "bit.ly", "hubs.la", "lnkd.in", "t.co"
+]
+
+def legacy_is_advertisement(text):
+    """The original LinkedInScraper.is_advertisement."""
+    if not text:
+        return True
+    text_lower = text.lower()
+    for indicator in AD_INDICATORS:
+        if indicator in text_lower:
+            return True
+    promotional_patterns = [
+        r'\b(?:download|get|sign up|register|book|schedule|try|join|subscribe)\b.*\b(?:now|today|free|demo|call)\b',
+        r'\b(?:our|we|us)\b.*\b(?:product|service|solution|platform|tool|help|provide|offer|deliver|create)\b',
+        r'\b(?:limited time|special offer|free trial|exclusive|discount|deal)\b',
+        r'\b(?:click|check|learn|find|discover)\b.*\b(?:more|out|here|now)\b'
+    ]
+    for pattern in promotional_patterns:
+        if re.search(pattern, text_lower):
+            return True
+    return False
+
+def long_posts(count, words_per_post, seed=0):
+    """Long single-paragraph posts; trigger words without targets force full-line scans."""
+    rng = random.Random(seed)
+    targets = {word for _, _, rule_targets in PROMOTIONAL_RULES for word in rule_targets or []}
+    vocabulary = [word for word in TOPIC_WORDS + FILLER_WORDS if word not in targets] + ["get", "click", "we"]
+    posts = []
+    for _ in range(count):
+        words = [rng.choice(vocabulary) for _ in range(words_per_post)]
+        if rng.random() < 0.1:
+            words.append(rng.choice(["book a demo today", "we help teams", "check it out"]))
+        posts.append(' '.join(words))
+    return posts
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    words_per_post = int(sys.argv[2]) if len(sys.argv) > 2 else 1500
+    texts = long_posts(count, words_per_post)
+
+    start = time.perf_counter()
+    expected = [legacy_is_advertisement(text) for text in texts]
+    legacy_time = time.perf_counter() - start
+
+    classifier = AdClassifier(AD_INDICATORS)
+    start = time.perf_counter()
+    rules = classifier.classify_many(texts)
+    classifier_time = time.perf_counter() - start
+
+    assert expected == [rule is not None for rule in rules], "classifier disagrees with legacy path"
+    print(f"{count} posts x {words_per_post} words, {sum(expected)} flagged")
+    print(f"legacy loop:   {legacy_time:.3f}s ({count / legacy_time:,.0f} posts/s)")
+    print(f"AdClassifier:  {classifier_time:.3f}s ({count / classifier_time:,.0f} posts/s)")
+
+if __name__ == "__main__":
+    main()
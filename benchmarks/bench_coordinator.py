@@ -0,0 +1,59 @@
+"""Scrape several fake accounts with 1..N parallel workers and check the merged output.
+
+Each account's feed is a FakeFeedDriver page with a simulated load delay; feeds
+overlap, so the merge has duplicates to drop.
+
+Usage: python benchmarks/bench_coordinator.py [accounts] [posts_per_feed] [load_delay]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from coordinator import ScrapeCoordinator
+from fake_driver import FakeFeedDriver
+from synthetic import generate_feed_html, generate_posts
+
+def account_feeds(accounts, per_feed):
+    """One feed per account; a third of each feed is shared with the next account."""
+    shared = per_feed // 3
+    pool = generate_posts(accounts * per_feed, seed=13)
+    urns = [7000000000000000000 + i for i in range(len(pool))]
+    feeds = {}
+    for index in range(accounts):
+        start = index * (per_feed - shared)
+        feeds[f"account{index}"] = generate_feed_html(pool[start:start + per_feed], urns[start:start + per_feed])
+    return feeds
+
+def main():
+    accounts = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    per_feed = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+    load_delay = float(sys.argv[3]) if len(sys.argv) > 3 else 0.2
+    feeds = account_feeds(accounts, per_feed)
+    account_list = [{'name': name, 'email': f"{name}@example.com", 'password': 'x'} for name in feeds]
+
+    for workers in sorted({1, accounts}):
+        with tempfile.TemporaryDirectory() as tmp:
+            coordinator = ScrapeCoordinator(
+                accounts=[dict(account) for account in account_list], workers=workers,
+                driver_factory=lambda account: FakeFeedDriver(feeds[account['name']], page_size=10, load_delay=load_delay),
+                seen_dir=tmp
+            )
+            start = time.perf_counter()
+            posts = coordinator.scrape_feed(num_posts=accounts * per_feed)
+            elapsed = time.perf_counter() - start
+            ids = [post['post_id'] for post in posts]
+            assert len(ids) == len(set(ids)), "duplicate posts in merged output"
+
+            report = coordinator.report()
+            scraped = sum(stats['posts'] for stats in report)
+            print(f"{workers} worker(s): {scraped} posts scraped, {len(posts)} unique in {elapsed:.2f}s "
+                  f"({len(posts) / elapsed:.1f} unique posts/s)")
+            for stats in report:
+                print(f"  {stats['account']}: {stats['posts']} posts, {stats['unique_posts']} unique, "
+                      f"{stats['posts_per_second']:.1f} posts/s, error={stats['error']}")
+
+if __name__ == "__main__":
+    main()
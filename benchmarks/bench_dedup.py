@@ -0,0 +1,88 @@
+"""Build and lookup cost of the MinHash/LSH near-duplicate index as the archive grows.
+
+Each corpus is synthetic posts plus lightly edited reshares of earlier posts.
+The corpus is indexed in ingest-sized batches, then a fresh batch (half
+reshares, half new posts) is matched against it; lookup time should stay
+roughly flat as the archive grows.
+
+Usage: python benchmarks/bench_dedup.py [sizes...]   (default: 10000 100000 500000)
+"""
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from dedup import NearDuplicateIndex
+from synthetic import generate_post
+
+RESHARE_RATE = 0.1
+BATCH = 1000
+
+def reshare(text, rng):
+    """A lightly edited copy of a post: one to three words replaced."""
+    words = text.split()
+    for _ in range(rng.randint(1, 3)):
+        words[rng.randrange(len(words))] = rng.choice(("honestly", "agree", "so", "thread"))
+    return ' '.join(words)
+
+def generate_corpus(n, rng):
+    """Return (texts, origin) where origin[i] is the index of the post text i reshares, or None."""
+    texts, origin = [], []
+    for _ in range(n):
+        if texts and rng.random() < RESHARE_RATE:
+            source = rng.randrange(len(texts))
+            source = origin[source] if origin[source] is not None else source
+            texts.append(reshare(texts[source], rng))
+            origin.append(source)
+        else:
+            texts.append(generate_post(rng)['text'])
+            origin.append(None)
+    return texts, origin
+
+def run(n):
+    rng = random.Random(n)
+    texts, origin = generate_corpus(n, rng)
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, 'dedup.db'))
+        index = NearDuplicateIndex(conn)
+
+        start = time.perf_counter()
+        clusters = []
+        for offset in range(0, n, BATCH):
+            cluster_ids, new_clusters = index.match(texts[offset:offset + BATCH])
+            with conn:
+                index.add(new_clusters)
+            clusters.extend(cluster_ids)
+        build = time.perf_counter() - start
+
+        reshares = [i for i, source in enumerate(origin) if source is not None]
+        found = sum(clusters[i] == clusters[origin[i]] for i in reshares)
+        merged = n - len(reshares) - len({clusters[i] for i, source in enumerate(origin) if source is None})
+
+        sources = [rng.randrange(n) for _ in range(BATCH // 2)]
+        probe = [reshare(texts[i], rng) for i in sources] + [generate_post(rng)['text'] for _ in range(BATCH // 2)]
+        start = time.perf_counter()
+        probe_clusters, _ = index.match(probe)
+        lookup = time.perf_counter() - start
+        probe_found = sum(cluster == clusters[i] for cluster, i in zip(probe_clusters, sources))
+        size = os.path.getsize(os.path.join(tmp, 'dedup.db'))
+        cluster_count = index.cluster_count()
+        conn.close()
+
+    print(f"{n:>8} posts: build {build:7.1f}s ({n / build:>7.0f} posts/s), {cluster_count:>7} clusters, "
+          f"index {size / 2**20:6.1f} MiB")
+    print(f"{'':>8}        reshares found {found}/{len(reshares)} ({found / max(len(reshares), 1):.1%}), "
+          f"distinct posts merged {merged}")
+    print(f"{'':>8}        match {BATCH} new posts: {lookup * 1000:6.1f} ms, reshares found {probe_found}/{len(sources)}")
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 500000]
+    for n in sizes:
+        run(n)
+
+if __name__ == "__main__":
+    main()
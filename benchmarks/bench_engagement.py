@@ -0,0 +1,80 @@
+"""Compare vectorized engagement analytics against the original per-row lambdas.
+
+Usage: python benchmarks/bench_engagement.py [sizes...] (default: 10000 100000 1000000)
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import CountVectorizer
+from engagement import analyze_engagement
+from synthetic import TOPIC_WORDS
+
+def legacy_analyze_engagement(df):
+    """The original LinkedInAnalyzer.analyze_engagement over a column of dicts."""
+    avg_engagement = {
+        'likes': df['engagement'].apply(lambda x: x['likes']).mean(),
+        'comments': df['engagement'].apply(lambda x: x['comments']).mean(),
+        'shares': df['engagement'].apply(lambda x: x['shares']).mean()
+    }
+    df['total_engagement'] = df['engagement'].apply(lambda x: x['likes'] + x['comments'] + x['shares'])
+    top_posts = df.nlargest(5, 'total_engagement')
+    return {
+        'average_engagement': avg_engagement,
+        'top_posts': top_posts[['text', 'total_engagement']].to_dict('records')
+    }
+
+def make_frame(size, seed=0):
+    """Flat-column posts frame as loaded from the store."""
+    rng = np.random.default_rng(seed)
+    words = np.array(TOPIC_WORDS)
+    return pd.DataFrame({
+        'text': [f"post {i}" for i in range(size)],
+        'likes': (rng.pareto(1.2, size) * 10).astype(np.int64),
+        'comments': rng.integers(0, 40, size),
+        'shares': rng.integers(0, 10, size),
+        'timestamp': pd.Timestamp('2024-01-01') + pd.to_timedelta(rng.integers(0, 365 * 86400, size), unit='s'),
+        'tokens': [' '.join(pair) for pair in rng.choice(words, (size, 2))]
+    })
+
+def measure(func, *args, **kwargs):
+    """Run func once for wall time and once under tracemalloc for peak allocation (MB)."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func(*args, **kwargs)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 2 ** 20
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+
+    print("vectorized also computes percentiles, per-day/hour and per-topic engagement")
+    print(f"{'posts':>9} {'legacy':>9} {'peak MB':>8} {'vectorized':>11} {'peak MB':>8}")
+    for size in sizes:
+        df = make_frame(size, seed=size)
+        legacy_df = df[['text', 'timestamp']].copy()
+        legacy_df['engagement'] = [
+            {'likes': likes, 'comments': comments, 'shares': shares}
+            for likes, comments, shares in zip(df['likes'], df['comments'], df['shares'])
+        ]
+
+        expected, legacy_time, legacy_peak = measure(legacy_analyze_engagement, legacy_df)
+        # The analyzer passes in the topic columns of its TF-IDF matrix; build the equivalent here
+        topics = TOPIC_WORDS[:10]
+        mentions = CountVectorizer(vocabulary=topics, binary=True).transform(df['tokens'])
+        result, vector_time, vector_peak = measure(analyze_engagement, df, topics=topics, topic_mentions=mentions)
+
+        assert np.allclose(list(expected['average_engagement'].values()), list(result['average_engagement'].values()))
+        assert expected['top_posts'] == result['top_posts']
+        print(f"{size:>9} {legacy_time:>8.3f}s {legacy_peak:>8.1f} {vector_time:>10.3f}s {vector_peak:>8.1f}")
+
+if __name__ == "__main__":
+    main()
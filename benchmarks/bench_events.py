@@ -0,0 +1,107 @@
+"""Check the job event stream end to end with a simulated scraper, and time EventBus.publish.
+
+Runs an analysis job through the Flask app with a scraper that yields synthetic
+posts in timed passes, reads /jobs/<id>/events and prints what arrived. Then
+publishes to a bus whose subscribers never read, to show publishing stays
+constant-time and old events are dropped.
+
+Usage: python benchmarks/bench_events.py [passes] [posts_per_pass]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from events import EventBus
+from synthetic import generate_posts
+
+class SimulatedScraper:
+    """Yields synthetic posts in passes, pausing like a feed loading, and reports progress."""
+
+    passes = 10
+    per_pass = 20
+    delay = 0.3
+
+    def iter_feed(self, num_posts=200, on_progress=None):
+        posts = generate_posts(self.passes * self.per_pass, seed=16)
+        kept = 0
+        for start in range(0, len(posts), self.per_pass):
+            time.sleep(self.delay)
+            batch = posts[start:start + self.per_pass][:num_posts - kept]
+            kept += len(batch)
+            if on_progress:
+                on_progress({'scraped': start + self.per_pass, 'ads_filtered': start + self.per_pass - kept, 'kept': kept})
+            yield from batch
+            if kept >= num_posts:
+                return
+
+    def close(self):
+        pass
+
+def parse_stream(chunks):
+    """Split a text/event-stream body into (event, data) pairs."""
+    buffer = ''
+    for chunk in chunks:
+        buffer += chunk.decode('utf-8')
+        while '\n\n' in buffer:
+            block, buffer = buffer.split('\n\n', 1)
+            fields = dict(line.split(': ', 1) for line in block.split('\n') if not line.startswith(':'))
+            if 'event' in fields:
+                yield fields['event'], json.loads(fields['data'])
+
+def run_job():
+    os.environ.setdefault('LINKEDIN_EMAIL', 'member@example.com')
+    os.environ.setdefault('LINKEDIN_PASSWORD', 'x')
+    import app as app_module
+    app_module.pipeline.scraper_factory = SimulatedScraper
+    app_module.pipeline.topic_interval = 0.5
+    client = app_module.app.test_client()
+
+    job_id = client.post('/jobs').get_json()['job']['id']
+    start = time.perf_counter()
+    response = client.get(f'/jobs/{job_id}/events', buffered=False)
+    print(f"GET /jobs/<id>/events -> {response.status_code} {response.mimetype}")
+    seen = Counter()
+    for event, data in parse_stream(response.response):
+        seen[event] += 1
+        elapsed = time.perf_counter() - start
+        if event == 'stage':
+            print(f"  {elapsed:6.2f}s stage    {data['name']} {data['status']}")
+        elif event == 'progress':
+            print(f"  {elapsed:6.2f}s progress {data}")
+        elif event == 'topics':
+            print(f"  {elapsed:6.2f}s topics   {[topic for topic, _ in data['top_topics'][:5]]} "
+                  f"after {data['posts_ingested']} posts")
+        elif event == 'done':
+            print(f"  {elapsed:6.2f}s done     {data['status']}, {data['result']['total_posts_analyzed']} posts analyzed")
+    response.close()
+    assert seen['done'] == 1 and seen['progress'] > 0 and seen['stage'] == 8, seen
+
+def publish_cost(events=200000, subscribers=10):
+    bus = EventBus(maxlen=256)
+    stalled = [bus.subscribe() for _ in range(subscribers)]
+    start = time.perf_counter()
+    for i in range(events):
+        bus.publish('progress', {'scraped': i})
+    elapsed = time.perf_counter() - start
+    print(f"publish to {subscribers} stalled subscribers: {elapsed / events * 1e6:.2f}us per event, "
+          f"{stalled[0].dropped} dropped and {len(stalled[0].get(timeout=0))} buffered per subscriber")
+
+def main():
+    SimulatedScraper.passes = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    SimulatedScraper.per_pass = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            run_job()
+        finally:
+            os.chdir(cwd)
+    publish_cost()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Compare per-post outerHTML parsing against bulk feed extraction on saved HTML.
+
+Usage: python benchmarks/bench_extraction.py [posts]
+
+The legacy figure excludes the 0.5s per-post sleep and the WebDriver
+round-trip per post that the old scrape loop also paid.
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from bs4 import BeautifulSoup
+from extraction import HTML_PARSER, extract_posts_from_html
+from synthetic import generate_feed_html, generate_posts, render_post_html
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'feed.html')
+
+def legacy_extract(outer_html):
+    """The original LinkedInScraper.extract_post_data, minus the WebDriver call."""
+    soup = BeautifulSoup(outer_html, 'html.parser')
+    post_text = soup.find('div', {'class': 'feed-shared-update-v2__description'})
+    post_text = post_text.get_text().strip() if post_text else ""
+    engagement = {'likes': 0, 'comments': 0, 'shares': 0}
+    engagement_elements = soup.find_all('span', {'class': 'social-details-social-counts__reactions-count'})
+    if engagement_elements:
+        likes_text = engagement_elements[0].get_text().strip() or "0"
+        engagement['likes'] = int(likes_text.replace(',', ''))
+    return {'text': post_text, 'engagement': engagement}
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    with open(FIXTURE, 'r', encoding='utf-8') as f:
+        fixture_posts = extract_posts_from_html(f.read())
+    print(f"fixture: {len(fixture_posts)} posts extracted from {os.path.basename(FIXTURE)}")
+
+    posts = generate_posts(count, seed=4)
+    fragments = [render_post_html(post, i) for i, post in enumerate(posts)]
+    page = generate_feed_html(posts)
+
+    start = time.perf_counter()
+    legacy = [legacy_extract(fragment) for fragment in fragments]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bulk = extract_posts_from_html(page)
+    bulk_time = time.perf_counter() - start
+
+    assert [(p['text'], p['engagement']) for p in legacy] == [(p['text'], p['engagement']) for p in bulk]
+    print(f"legacy per-post html.parser: {count / legacy_time:>10,.0f} posts/s")
+    print(f"bulk {HTML_PARSER} + SoupStrainer: {count / bulk_time:>10,.0f} posts/s")
+
+if __name__ == "__main__":
+    main()
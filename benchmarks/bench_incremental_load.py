@@ -0,0 +1,48 @@
+"""Show that LinkedInAnalyzer.load_data cost tracks new posts, not archive size.
+
+Usage: python benchmarks/bench_incremental_load.py [runs] [posts_per_file]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from analyzer import LinkedInAnalyzer
+from synthetic import generate_posts
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    posts_per_file = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    with tempfile.TemporaryDirectory() as tmp:
+        raw_dir = os.path.join(tmp, 'raw')
+        os.makedirs(raw_dir)
+        analyzer = LinkedInAnalyzer(
+            store_path=os.path.join(tmp, 'analysis.db'),
+            token_cache_path=os.path.join(tmp, 'token_cache.db'),
+            topic_state_dir=os.path.join(tmp, 'topic_state')
+        )
+
+        print(f"{'run':>4} {'new posts':>10} {'total posts':>12} {'load (s)':>9} {'insights (s)':>13}")
+        for run in range(runs):
+            # Each run sees exactly one new scraper file
+            filename = os.path.join(raw_dir, f"linkedin_feed_{run:04d}.json")
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(generate_posts(posts_per_file, seed=run), f)
+
+            start = time.perf_counter()
+            analyzer.load_data(raw_dir)
+            loaded = time.perf_counter()
+            analyzer.generate_insights()
+            done = time.perf_counter()
+
+            print(f"{run:>4} {posts_per_file:>10} {len(analyzer.posts):>12} "
+                  f"{loaded - start:>9.3f} {done - loaded:>13.3f}")
+
+        analyzer.store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Load-test GET /insights/latest with Flask's test client over a large insights history.
+
+Usage: python benchmarks/bench_insights_endpoint.py [history_files] [requests]
+"""
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('LINKEDIN_EMAIL', 'benchmark@example.com')
+os.environ.setdefault('LINKEDIN_PASSWORD', 'benchmark')
+
+from src.app import app
+
+INSIGHTS = {
+    'top_topics': [[f"topic{i}", 0.1 / (i + 1)] for i in range(10)],
+    'engagement_analysis': {
+        'average_engagement': {'likes': 42.0, 'comments': 3.5, 'shares': 1.2},
+        'top_posts': [{'text': 'word ' * 200, 'total_engagement': 1000 - i} for i in range(5)]
+    },
+    'total_posts_analyzed': 200,
+    'date_range': {'start': '2024-01-01T00:00:00', 'end': '2024-01-02T00:00:00'}
+}
+
+def legacy_latest():
+    """The old lookup: list data/, take the max name, re-read and re-serialize it."""
+    files = [f for f in os.listdir('data') if f.startswith('analysis_insights_')]
+    with open(os.path.join('data', max(files)), 'r') as f:
+        return json.dumps({'success': True, 'data': json.load(f)})
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return (statistics.median(samples) * 1000, samples[int(len(samples) * 0.99) - 1] * 1000)
+
+def timed_requests(client, count, **kwargs):
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = client.get('/insights/latest', **kwargs)
+        samples.append(time.perf_counter() - start)
+    return response, samples
+
+def main():
+    history = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            os.makedirs('data')
+            for i in range(history):
+                with open(f"data/analysis_insights_{20240101 + i // 1000:08d}_{i % 1000:06d}.json", 'w') as f:
+                    json.dump(INSIGHTS, f)
+
+            client = app.test_client()
+            start = time.perf_counter()
+            first = client.get('/insights/latest')
+            print(f"{history} insights files; first request (imports them into the history): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+            samples = []
+            for _ in range(min(count, 200)):
+                start = time.perf_counter()
+                legacy_latest()
+                samples.append(time.perf_counter() - start)
+            print("legacy listdir + max + reload:  p50 %.2f ms  p99 %.2f ms" % percentiles(samples))
+
+            _, samples = timed_requests(client, count)
+            print("cached, identity:               p50 %.2f ms  p99 %.2f ms" % percentiles(samples))
+
+            response, samples = timed_requests(client, count, headers={'Accept-Encoding': 'gzip'})
+            assert response.headers['Content-Encoding'] == 'gzip'
+            print("cached, gzip:                   p50 %.2f ms  p99 %.2f ms" % percentiles(samples))
+
+            response, samples = timed_requests(client, count, headers={'If-None-Match': first.headers['ETag']})
+            assert response.status_code == 304
+            print("conditional (304):              p50 %.2f ms  p99 %.2f ms" % percentiles(samples))
+        finally:
+            os.chdir(cwd)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Compare per-run insights JSON files with the SQLite insights history.
+
+Writes a directory of pretty-printed analysis_insights_*.json files (as
+save_insights used to), imports them into an InsightsHistory, then times
+loading the latest insights and reading one topic's score over the last runs
+both ways.
+
+Usage: python benchmarks/bench_insights_history.py [runs] [trend_runs]
+"""
+import glob
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from insights_history import InsightsHistory
+
+TOPICS = [f"topic{i}" for i in range(200)]
+
+def make_insights(rng):
+    """Insights shaped like generate_insights output, with 10 of TOPICS ranked."""
+    top_topics = sorted(((topic, rng.random()) for topic in rng.sample(TOPICS, 10)), key=lambda t: -t[1])
+    return {
+        'top_topics': [[topic, round(score, 4)] for topic, score in top_topics],
+        'engagement_analysis': {
+            'average_engagement': {'likes': 42.0, 'comments': 3.5, 'shares': 1.2},
+            'top_posts': [{'text': 'word ' * 200, 'total_engagement': 1000 - i} for i in range(5)]
+        },
+        'topic_index': [
+            {'topic': topic, 'posts': 20, 'total_engagement': 500, 'related': [[TOPICS[0], 3]]}
+            for topic, _ in top_topics
+        ],
+        'total_posts_analyzed': 200,
+        'date_range': {'start': '2024-01-01T00:00:00', 'end': '2024-01-02T00:00:00'}
+    }
+
+def legacy_latest(data_dir):
+    """The old ContentSuggestions.load_insights: glob, getctime on every file, load the newest."""
+    files = glob.glob(os.path.join(data_dir, 'analysis_insights_*.json'))
+    with open(max(files, key=os.path.getctime), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def legacy_topic_history(data_dir, topic, runs):
+    """A topic's score over the last runs files, opening each one."""
+    history = []
+    for path in sorted(glob.glob(os.path.join(data_dir, 'analysis_insights_*.json')))[-runs:]:
+        with open(path, 'r', encoding='utf-8') as f:
+            scores = dict(json.load(f)['top_topics'])
+        history.append(scores.get(topic))
+    return history
+
+def timed(func, repeat):
+    """Median milliseconds per call."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        durations.append(time.perf_counter() - start)
+    return sorted(durations)[len(durations) // 2] * 1000, result
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    trend_runs = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    rng = random.Random(21)
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        for i in range(runs):
+            stamp = (datetime(2024, 1, 1) + timedelta(hours=i)).strftime('%Y%m%d_%H%M%S')
+            with open(os.path.join(data_dir, f"analysis_insights_{stamp}.json"), 'w', encoding='utf-8') as f:
+                json.dump(make_insights(rng), f, ensure_ascii=False, indent=2)
+        files_size = sum(os.path.getsize(path) for path in glob.glob(os.path.join(data_dir, '*.json')))
+
+        start = time.perf_counter()
+        history = InsightsHistory(data_dir)
+        print(f"Imported {history.run_count()} runs in {time.perf_counter() - start:.2f}s; "
+              f"JSON files {files_size / 2**20:.1f} MiB, history {os.path.getsize(history.db_path) / 2**20:.1f} MiB")
+
+        topic = TOPICS[0]
+        legacy_ms, legacy = timed(lambda: legacy_latest(data_dir), 20)
+        history_ms, latest = timed(history.latest, 200)
+        assert latest == legacy
+        print(f"latest insights, glob + getctime:  {legacy_ms:9.3f} ms")
+        print(f"latest insights, history:          {history_ms:9.3f} ms")
+
+        legacy_ms, legacy = timed(lambda: legacy_topic_history(data_dir, topic, trend_runs), 5)
+        history_ms, trend = timed(lambda: history.topic_history(topic, trend_runs), 200)
+        assert [run['score'] for run in trend] == legacy
+        print(f"'{topic}' over {trend_runs} runs, open each file: {legacy_ms:9.3f} ms")
+        print(f"'{topic}' over {trend_runs} runs, history:        {history_ms:9.3f} ms "
+              f"(ranked in {sum(run['score'] is not None for run in trend)} runs)")
+
+        history_ms, _ = timed(lambda: history.record(make_insights(rng)), 50)
+        print(f"record one run:                    {history_ms:9.3f} ms")
+        history.close()
+
+if __name__ == "__main__":
+    main()
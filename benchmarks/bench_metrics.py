@@ -0,0 +1,77 @@
+"""Overhead of the metrics layer, enabled and disabled, and a sample /metrics page.
+
+Times span(), timed() and increment() against a bare call, then runs the
+in-process pipeline (synthetic scraper) with metrics on and off.
+
+Usage: python benchmarks/bench_metrics.py [runs] [posts_per_run]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from bench_pipeline import FixtureScraper
+from metrics import Metrics, metrics
+from pipeline import AnalysisPipeline
+
+def call_overhead(calls=200000):
+    """Nanoseconds per call of each instrumentation primitive."""
+    def bare():
+        pass
+
+    print(f"{'':<22}{'enabled':>10}{'disabled':>10}   (ns per call, bare call subtracted)")
+    baseline = timeit.timeit(bare, number=calls)
+    for label, make in (
+        ('with span():', None),
+        ('@timed', lambda m: m.timed('bench')(bare)),
+        ('increment()', lambda m: lambda: m.increment('bench')),
+    ):
+        row = []
+        for enabled in (True, False):
+            instrumented = Metrics(enabled=enabled)
+            if make is None:
+                def func(m=instrumented):
+                    with m.span('bench'):
+                        pass
+            else:
+                func = make(instrumented)
+            row.append((timeit.timeit(func, number=calls) - baseline) / calls * 1e9)
+        print(f"{label:<22}{row[0]:>10.0f}{row[1]:>10.0f}")
+
+def pipeline_runs(runs, posts_per_run):
+    """Median seconds per pipeline run."""
+    pipeline = AnalysisPipeline(scraper_factory=FixtureScraper, num_posts=posts_per_run)
+    pipeline.run()  # Warm-up: loads the analyzer and suggestion generator
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        pipeline.run()
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    posts_per_run = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    call_overhead()
+
+    cwd = os.getcwd()
+    for enabled in (False, True):
+        metrics.enabled = enabled
+        metrics.reset()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                median = pipeline_runs(runs, posts_per_run)
+            finally:
+                os.chdir(cwd)
+        print(f"pipeline, metrics {'on ' if enabled else 'off'}: {median:.3f}s median per run of {posts_per_run} posts")
+
+    print("\n/metrics after the instrumented runs:")
+    print(metrics.render())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Peak memory and time of streamed NDJSON feed files vs the old buffered JSON array.
+
+Usage: python benchmarks/bench_ndjson.py [posts]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from feed_files import FeedWriter, iter_posts
+from synthetic import generate_post
+
+def post_stream(count):
+    """Posts generated one at a time, like a scrape producing them."""
+    rng = random.Random(15)
+    for _ in range(count):
+        yield generate_post(rng)
+
+def measure(label, action):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = action()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<34} {elapsed:>7.2f}s  peak {peak / 2**20:>7.1f} MiB")
+    return result
+
+def write_buffered(path, count):
+    """The old flow: collect every post, then write one indented JSON array."""
+    posts = list(post_stream(count))
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(posts, f, ensure_ascii=False, indent=2)
+
+def write_streamed(path, count):
+    with FeedWriter(path) as writer:
+        for post in post_stream(count):
+            writer.write(post)
+
+def read_all(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return sum(1 for _ in json.load(f))
+
+def read_streamed(path):
+    return sum(1 for _ in iter_posts(path))
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = os.path.join(tmp, 'feed.json')
+        plain = os.path.join(tmp, 'feed.ndjson')
+        compressed = os.path.join(tmp, 'feed.ndjson.gz')
+
+        print(f"{count} posts")
+        measure("write: buffered JSON array", lambda: write_buffered(legacy, count))
+        measure("write: streamed NDJSON", lambda: write_streamed(plain, count))
+        measure("write: streamed NDJSON (gzip)", lambda: write_streamed(compressed, count))
+        for path in (legacy, plain, compressed):
+            print(f"  {os.path.basename(path):<18} {os.path.getsize(path) / 2**20:>7.1f} MiB on disk")
+
+        assert measure("read: json.load", lambda: read_all(legacy)) == count
+        assert measure("read: NDJSON generator", lambda: read_streamed(plain)) == count
+        assert measure("read: NDJSON generator (gzip)", lambda: read_streamed(compressed)) == count
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Compare per-run startup of the old three-subprocess flow with the in-process pipeline.
+
+Usage: python benchmarks/bench_pipeline.py [runs] [posts_per_run]
+
+The subprocess figure only counts interpreter start-up plus module imports for
+each stage, a lower bound: the old analyzer also hit the NLTK downloader three
+times on every import.
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, os.path.abspath(SRC))
+
+from pipeline import AnalysisPipeline
+from synthetic import generate_posts
+
+class FixtureScraper:
+    """Stands in for LinkedInScraper, returning synthetic posts without a browser."""
+
+    run = 0
+
+    def iter_feed(self, num_posts=200, on_progress=None):
+        FixtureScraper.run += 1
+        yield from generate_posts(num_posts, seed=FixtureScraper.run)
+
+    def close(self):
+        pass
+
+def subprocess_startup():
+    """Seconds to start one interpreter per stage and import its module."""
+    start = time.perf_counter()
+    for module in ('scraper', 'analyzer', 'suggestions'):
+        code = f"import sys; sys.path.insert(0, {os.path.abspath(SRC)!r}); import {module}"
+        subprocess.run([sys.executable, '-c', code], check=True, capture_output=True)
+    return time.perf_counter() - start
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    posts_per_run = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    startup = min(subprocess_startup() for _ in range(3))
+    print(f"subprocess path: {startup:.2f}s of interpreter start-up and imports per run")
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            pipeline = AnalysisPipeline(scraper_factory=FixtureScraper, num_posts=posts_per_run)
+            for run in range(runs):
+                context = {}
+                timings = []
+                for name, stage in pipeline.stages:
+                    start = time.perf_counter()
+                    stage(context)
+                    timings.append(f"{name} {time.perf_counter() - start:.3f}s")
+                print(f"in-process run {run}: " + ', '.join(timings))
+        finally:
+            os.chdir(cwd)
+
+if __name__ == "__main__":
+    main()
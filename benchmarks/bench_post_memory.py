@@ -0,0 +1,139 @@
+"""Peak RSS of loading a large post archive: the original loader, the DataFrame loader and PostColumns.
+
+Builds a store of realistic synthetic posts, then loads it and runs the
+engagement analytics in a fresh process per loader, so each peak RSS is
+measured on its own:
+
+- original: every raw post as a dict in posts_data, plus a DataFrame with a
+  column of nested engagement dicts (the analyzer before the SQLite store)
+- frame: PostStore.load_frame as it was before PostColumns (object text and
+  tokens columns, int64 counts)
+- columns: PostStore.load_columns in RAM
+- mmap: PostStore.load_columns memory-mapped from a directory (file-backed
+  pages can be dropped by the kernel, so anonymous RSS is what has to fit)
+
+Usage: python benchmarks/bench_post_memory.py [posts] [loaders...]
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BENCHMARKS_DIR, '..', 'src'))
+
+LOADERS = ('original', 'frame', 'columns', 'mmap')
+CHUNK = 50000
+
+def build_store(db_path, count):
+    """Store count realistic posts, each its own cluster, with noun-like token strings."""
+    from store import PostStore
+    from synthetic import generate_realistic_posts
+
+    store = PostStore(db_path)
+    for start in range(0, count, CHUNK):
+        posts = generate_realistic_posts(min(CHUNK, count - start), seed=start)
+        tokens = [' '.join(word for word in post['text'].lower().split()[:40] if word.isalpha()) for post in posts]
+        store.add_file(f"feed_{start}.ndjson", posts, tokens, cluster_ids=list(range(start, start + len(posts))))
+    store.close()
+
+def legacy_load_frame(conn):
+    """PostStore.load_frame before PostColumns."""
+    import pandas as pd
+    df = pd.read_sql_query("""
+        SELECT text, likes, comments, shares, timestamp, tokens, cluster_size FROM (
+            SELECT text, likes, comments, shares, timestamp, cluster_id,
+                FIRST_VALUE(tokens) OVER (PARTITION BY cluster_id ORDER BY id) AS tokens,
+                COUNT(*) OVER (PARTITION BY cluster_id) AS cluster_size,
+                ROW_NUMBER() OVER (
+                    PARTITION BY cluster_id ORDER BY likes + comments + shares DESC, id
+                ) AS rank
+            FROM posts
+        )
+        WHERE rank = 1
+        ORDER BY cluster_id
+    """, conn)
+    df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601', errors='coerce')
+    return df
+
+def rss_anon_mb():
+    """Anonymous resident memory of this process (Linux), or None."""
+    try:
+        with open('/proc/self/status', 'r') as f:
+            for line in f:
+                if line.startswith('RssAnon:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def measure(loader, db_path, columns_dir):
+    """Load the store with one loader and run the engagement analytics; runs in its own process."""
+    import pandas as pd
+    from bench_engagement import legacy_analyze_engagement
+    from engagement import analyze_engagement
+    from store import PostStore
+
+    store = PostStore(db_path)
+    imported = peak_rss_mb()
+    start = time.perf_counter()
+    if loader == 'original':
+        posts_data = [json.loads(raw) for (raw,) in store.conn.execute("SELECT raw FROM posts ORDER BY id")]
+        posts = pd.DataFrame(posts_data)
+    elif loader == 'frame':
+        posts = legacy_load_frame(store.conn)
+    else:
+        posts = store.load_columns(directory=columns_dir if loader == 'mmap' else None)
+    loaded = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if loader == 'original':
+        result = legacy_analyze_engagement(posts)
+    else:
+        result = analyze_engagement(posts)
+    analyzed = time.perf_counter() - start
+    print(json.dumps({
+        'rows': len(posts), 'load': loaded, 'engagement': analyzed, 'imported': imported,
+        'peak': peak_rss_mb(), 'anon': rss_anon_mb(), 'top': result['top_posts'][0]['total_engagement']
+    }))
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--measure':
+        measure(*sys.argv[2:5])
+        return
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    loaders = sys.argv[2:] or LOADERS
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'analysis.db')
+        start = time.perf_counter()
+        build_store(db_path, count)
+        print(f"Stored {count} posts in {time.perf_counter() - start:.0f}s "
+              f"({os.path.getsize(db_path) / 2**20:.0f} MiB)")
+
+        print(f"{'loader':<10}{'load (s)':>10}{'engage (s)':>12}{'peak RSS MB':>13}"
+              f"{'over imports':>14}{'anon RSS MB':>13}")
+        tops = set()
+        for loader in loaders:
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--measure', loader, db_path, os.path.join(tmp, 'columns')],
+                capture_output=True, text=True, check=True, cwd=BENCHMARKS_DIR
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            assert result['rows'] == count
+            tops.add(result['top'])
+            anon = '-' if result['anon'] is None else f"{result['anon']:.0f}"
+            print(f"{loader:<10}{result['load']:>10.2f}{result['engagement']:>12.2f}{result['peak']:>13.0f}"
+                  f"{result['peak'] - result['imported']:>14.0f}{anon:>13}")
+        # Every loader found the same top post
+        assert len(tops) == 1
+
+if __name__ == "__main__":
+    main()
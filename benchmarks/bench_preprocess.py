@@ -0,0 +1,62 @@
+"""Compare the sequential per-post preprocessing path against the batched, cached engine.
+
+"next batch" tags as many unseen texts with the process pool already started,
+as every ingest after the first does.
+
+Usage: python benchmarks/bench_preprocess.py [sizes...] (default: 1000 10000 100000)
+"""
+import os
+import re
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import nltk
+from nltk.tokenize import word_tokenize
+from preprocessing import TextPreprocessor
+from synthetic import generate_posts
+
+STOP_WORDS = {"the", "and", "our", "this", "about"}
+
+def sequential_preprocess(text, stop_words=STOP_WORDS):
+    """The original one-post-at-a-time LinkedInAnalyzer.preprocess_text."""
+    text = text.lower()
+    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+    text = re.sub(r'[^\w\s]', '', text)
+    text = re.sub(r'\d+', '', text)
+    tokens = word_tokenize(text)
+    tagged = nltk.pos_tag(tokens)
+    tokens = [word for word, pos in tagged if pos in ("NN", "NNS", "NNP", "NNPS")]
+    tokens = [token for token in tokens if token not in stop_words and len(token) > 2]
+    return ' '.join(tokens)
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+
+    print(f"{'posts':>8} {'sequential':>11} {'batched cold':>13} {'batched warm':>13} {'next batch':>11} {'match':>6}")
+    for size in sizes:
+        texts = [post['text'] for post in generate_posts(size, seed=size)]
+
+        expected, sequential_time = timed(lambda: [sequential_preprocess(text) for text in texts])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            preprocessor = TextPreprocessor(STOP_WORDS, cache_path=os.path.join(tmp, 'token_cache.db'))
+            cold, cold_time = timed(preprocessor.preprocess_many, texts)
+            warm, warm_time = timed(preprocessor.preprocess_many, texts)
+            unseen = [post['text'] + ' again' for post in generate_posts(size, seed=size + 1)]
+            _, next_time = timed(preprocessor.preprocess_many, unseen)
+            preprocessor.close()
+
+        match = expected == cold == warm
+        print(f"{size:>8} {sequential_time:>10.2f}s {cold_time:>12.2f}s {warm_time:>12.2f}s {next_time:>10.2f}s "
+              f"{str(match):>6}")
+
+if __name__ == "__main__":
+    main()
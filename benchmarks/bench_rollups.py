@@ -0,0 +1,93 @@
+"""Time trending/engagement queries over a year of rollups against a rescan of the raw posts.
+
+Usage: python benchmarks/bench_rollups.py [posts_per_day]
+"""
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import pandas as pd
+from rollups import TopicRollups
+from synthetic import TOPIC_WORDS
+
+VOCABULARY = TOPIC_WORDS + [f"term{i}" for i in range(5000)]
+
+def day_of_posts(rng, day, count):
+    """One day's posts and token strings; topic popularity drifts over the year."""
+    posts, tokens = [], []
+    hot = TOPIC_WORDS[day.timetuple().tm_yday // 30 % len(TOPIC_WORDS)]
+    for _ in range(count):
+        words = [hot if rng.random() < 0.05 else VOCABULARY[int(rng.paretovariate(0.8)) % len(VOCABULARY)]
+                 for _ in range(rng.randint(3, 25))]
+        tokens.append(' '.join(words))
+        posts.append({
+            'timestamp': (datetime.combine(day, datetime.min.time()) + timedelta(minutes=rng.randint(0, 1439))).isoformat(),
+            'engagement': {'likes': int(rng.paretovariate(1.2) * 10), 'comments': rng.randint(0, 40), 'shares': rng.randint(0, 10)}
+        })
+    return posts, tokens
+
+def rescan_trending(frame, reference, top_n=10):
+    """The same trending answer computed by scanning every raw post."""
+    current_start = pd.Timestamp(reference - timedelta(days=reference.weekday()))
+    previous_start = current_start - pd.Timedelta(days=7)
+    counts = []
+    for start in (current_start, previous_start):
+        window = frame[(frame['timestamp'] >= start) & (frame['timestamp'] < start + pd.Timedelta(days=7))]
+        counts.append(Counter(term for tokens in window['tokens'] for term in tokens.split()))
+    current, previous = counts
+    ranked = sorted(current.items(), key=lambda item: (item[1] - previous.get(item[0], 0), item[1], item[0]), reverse=True)
+    return [term for term, _ in ranked[:top_n]]
+
+def main():
+    per_day = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    rng = random.Random(12)
+    first_day = date(2025, 1, 6)
+    days = [first_day + timedelta(days=i) for i in range(365)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rollups = TopicRollups(sqlite3.connect(os.path.join(tmp, 'analysis.db')))
+        frames = []
+        start = time.perf_counter()
+        for day in days:
+            posts, tokens = day_of_posts(rng, day, per_day)
+            rollups.add_posts(posts, tokens)
+            frames.append(pd.DataFrame({'timestamp': [p['timestamp'] for p in posts], 'tokens': tokens}))
+        ingest_time = time.perf_counter() - start
+        frame = pd.concat(frames, ignore_index=True)
+        frame['timestamp'] = pd.to_datetime(frame['timestamp'])
+        print(f"Rolled up {len(frame)} posts over {len(days)} days in {ingest_time:.2f}s "
+              f"({ingest_time / len(days) * 1000:.1f}ms per daily batch)")
+
+        references = days[7::7]
+        timings, matches = [], 0
+        for reference in references:
+            start = time.perf_counter()
+            trending = rollups.trending('week', reference=reference)
+            timings.append(time.perf_counter() - start)
+            matches += [item['topic'] for item in trending] == rescan_trending(frame, reference)
+
+        start = time.perf_counter()
+        series = rollups.engagement_series('week')
+        series_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        rescan_trending(frame, references[-1])
+        rescan_time = time.perf_counter() - start
+
+        timings.sort()
+        print(f"Trending (this week vs last), {len(references)} weeks: "
+              f"median {timings[len(timings) // 2] * 1000:.1f}ms, max {timings[-1] * 1000:.1f}ms, "
+              f"matches rescan {matches}/{len(references)}")
+        print(f"Weekly engagement series ({len(series)} weeks): {series_time * 1000:.1f}ms")
+        print(f"Rescan of raw posts for one trending query: {rescan_time * 1000:.1f}ms")
+        print(f"Under 100ms: {max(timings[-1], series_time) < 0.1}")
+
+if __name__ == "__main__":
+    main()
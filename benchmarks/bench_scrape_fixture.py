@@ -0,0 +1,57 @@
+"""Scrape a local fixture feed through the fake driver and check each post is extracted once.
+
+Usage: python benchmarks/bench_scrape_fixture.py [posts]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import scraper as scraper_module
+from fake_driver import FakeFeedDriver
+from sessions import SessionStore
+from synthetic import generate_feed_html, generate_posts
+
+def run(html, seen_path, num_posts):
+    driver = FakeFeedDriver(html, page_size=10)
+    scraper = scraper_module.LinkedInScraper(
+        driver_factory=lambda: driver, seen_path=seen_path,
+        session_store=SessionStore(os.path.join(os.path.dirname(seen_path), 'sessions'))
+    )
+    start = time.perf_counter()
+    posts = scraper.scrape_feed(num_posts=num_posts)
+    elapsed = time.perf_counter() - start
+    scraper.close()
+    return driver, posts, elapsed
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 150
+
+    posts = generate_posts(count, seed=5)
+    urns = [7000000000000000000 + i for i in range(count)]
+    # Every tenth post is re-rendered further down the feed under the same URN
+    feed = posts + posts[::10]
+    feed_urns = urns + urns[::10]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        seen_path = os.path.join(tmp, 'seen_posts.db')
+
+        driver, scraped, elapsed = run(generate_feed_html(feed, feed_urns), seen_path, num_posts=10 * count)
+        extracted_twice = [index for index, n in driver.extraction_counts.items() if n != 1]
+        ids = [post['post_id'] for post in scraped]
+        print(f"run 1: {len(driver.extraction_counts)} nodes extracted, {len(scraped)} organic posts in {elapsed:.3f}s")
+        assert not extracted_twice, f"nodes extracted more than once: {extracted_twice}"
+        assert len(ids) == len(set(ids)), "duplicate posts in output"
+
+        # Second run: 20 fresh posts on top of the feed we already scraped
+        fresh = generate_posts(20, seed=6)
+        fresh_urns = [8000000000000000000 + i for i in range(20)]
+        driver, scraped, elapsed = run(generate_feed_html(fresh + posts, fresh_urns + urns), seen_path, num_posts=10 * count)
+        print(f"run 2: {len(driver.extraction_counts)} of {20 + count} nodes extracted, "
+              f"{len(scraped)} organic posts in {elapsed:.3f}s")
+        assert all(post['post_id'].startswith('urn:li:activity:8') for post in scraped)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Report how a scrape splits its time between waiting for the feed and extracting posts.
+
+Usage: python benchmarks/bench_scrape_waits.py [--chrome]
+
+By default the feed is served by the in-process fake driver with a simulated
+network delay. With --chrome, a real browser loads fixtures/stub_feed.html from
+disk, a static page that appends posts after each scroll to the bottom.
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from scraper import LinkedInScraper
+from fake_driver import FakeFeedDriver
+from sessions import SessionStore
+from synthetic import generate_feed_html, generate_posts
+
+FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'stub_feed.html')
+LEGACY_SCROLL_SLEEP = 2.0
+
+def main():
+    use_chrome = '--chrome' in sys.argv
+
+    with tempfile.TemporaryDirectory() as tmp:
+        kwargs = {
+            'seen_path': os.path.join(tmp, 'seen_posts.db'),
+            'session_store': SessionStore(os.path.join(tmp, 'sessions'))
+        }
+        if use_chrome:
+            kwargs['feed_url'] = 'file://' + FIXTURE
+        else:
+            html = generate_feed_html(generate_posts(60, seed=7))
+            kwargs['driver_factory'] = lambda: FakeFeedDriver(html, page_size=10, load_delay=0.3)
+
+        scraper = LinkedInScraper(**kwargs)
+        if use_chrome:
+            # The local fixture has no login page
+            scraper.authenticate = lambda: True
+        start = time.perf_counter()
+        try:
+            posts = scraper.scrape_feed(num_posts=1000)
+        finally:
+            scraper.close()
+        elapsed = time.perf_counter() - start
+
+    timings = scraper.timings.report()
+    print(f"{len(posts)} organic posts in {elapsed:.2f}s")
+    print(f"waiting:    {timings.get('waiting', 0):.2f}s")
+    print(f"extracting: {timings.get('extracting', 0):.2f}s")
+    print(f"fixed {LEGACY_SCROLL_SLEEP:.0f}s sleeps would have waited at least "
+          f"{LEGACY_SCROLL_SLEEP * 30:.0f}s (30 scrolls, the feed never fills 1000 posts)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Compare login time with and without saved session cookies against the fake login page.
+
+Runs several scrapes in a row: the first logs in, later ones reuse the encrypted
+session, and after the server expires every session the scraper falls back to
+a full login again.
+
+Usage: python benchmarks/bench_sessions.py [runs] [login_delay]
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from fake_driver import FakeFeedDriver, FakeLoginServer
+from scraper import LinkedInScraper
+from sessions import SessionStore
+from synthetic import generate_feed_html, generate_posts
+
+EMAIL, PASSWORD = 'member@example.com', 'correct horse'
+
+def scrape(html, server, seen_path, session_store):
+    scraper = LinkedInScraper(
+        driver_factory=lambda: FakeFeedDriver(html, page_size=10, login_server=server),
+        seen_path=seen_path,
+        email=EMAIL, password=PASSWORD, session_store=session_store
+    )
+    try:
+        posts = scraper.scrape_feed(num_posts=5)
+    finally:
+        scraper.close()
+    return scraper.login_method, scraper.timings.report().get('login', 0.0), len(posts)
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    login_delay = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+    html = generate_feed_html(generate_posts(200, seed=14))
+    server = FakeLoginServer({EMAIL: PASSWORD}, login_delay=login_delay)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        session_store = SessionStore(os.path.join(tmp, 'sessions'))
+        for run in range(runs):
+            if run == runs - 1:
+                server.expire_sessions()
+            # A fresh seen-posts file per run, so every run scrapes the same feed
+            method, seconds, count = scrape(html, server, os.path.join(tmp, f"seen_{run}.db"), session_store)
+            print(f"run {run + 1}: {method:<8} login {seconds:.3f}s, {count} posts")
+
+        stored = [name for name in os.listdir(os.path.join(tmp, 'sessions')) if name.endswith('.session')]
+        with open(os.path.join(tmp, 'sessions', stored[0]), 'rb') as f:
+            assert b'li_at' not in f.read(), "session file is not encrypted"
+    print(f"full logins: {server.logins} of {runs} runs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Compare the old random topic suggestions with the engagement-ranked SuggestionIndex.
+
+Builds insights (including the topic index) from a realistic synthetic feed,
+then times suggestions one call at a time and for a batch of topic filters.
+
+Usage: python benchmarks/bench_suggestions.py [posts] [filters]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from analyzer import LinkedInAnalyzer
+from feed_files import FeedWriter
+from suggestions import ContentSuggestions
+from synthetic import generate_realistic_posts
+
+def legacy_topic_suggestions(insights, template_categories, num_suggestions=5):
+    """The original ContentSuggestions.generate_topic_suggestions."""
+    topics = [topic for topic, _ in insights['top_topics']]
+    suggestions = []
+    for _ in range(num_suggestions):
+        topic = random.choice(topics)
+        category = random.choice(list(template_categories.keys()))
+        template = random.choice(template_categories[category])
+        suggestions.append({
+            'topic': topic,
+            'template': template.format(topic=topic),
+            'category': category,
+            'engagement_potential': 'High' if topic in [t for t, _ in insights['top_topics'][:3]] else 'Medium'
+        })
+    return suggestions
+
+def build_insights(count, workdir):
+    raw_dir = os.path.join(workdir, 'raw')
+    os.makedirs(raw_dir)
+    with FeedWriter(os.path.join(raw_dir, 'feed.ndjson')) as writer:
+        writer.write_many(generate_realistic_posts(count, seed=20))
+    analyzer = LinkedInAnalyzer(
+        store_path=os.path.join(workdir, 'analysis.db'),
+        token_cache_path=os.path.join(workdir, 'token_cache.db'),
+        topic_state_dir=os.path.join(workdir, 'topic_state')
+    )
+    analyzer.load_data(raw_dir)
+    start = time.perf_counter()
+    insights = analyzer.generate_insights()
+    print(f"generate_insights over {count} posts: {time.perf_counter() - start:.3f}s "
+          f"({len(insights['topic_index'])} topics indexed)")
+    return insights
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    filters_count = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    k = 5
+
+    with tempfile.TemporaryDirectory() as workdir:
+        insights = build_insights(count, workdir)
+
+    suggester = ContentSuggestions()
+    suggester.insights = insights
+    start = time.perf_counter()
+    suggester.index
+    print(f"SuggestionIndex build: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    calls = 2000
+    start = time.perf_counter()
+    for _ in range(calls):
+        legacy_topic_suggestions(insights, suggester.template_categories, k)
+    legacy = (time.perf_counter() - start) / (calls * k)
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        suggester.generate_topic_suggestions(k)
+    single = (time.perf_counter() - start) / (calls * k)
+
+    rng = random.Random(20)
+    topics = [entry['topic'] for entry in insights['topic_index']]
+    filters = [None if rng.random() < 0.1 else rng.sample(topics, rng.randint(1, 3)) for _ in range(filters_count)]
+    start = time.perf_counter()
+    batches = suggester.generate_suggestions_batch(filters, k)
+    batched = (time.perf_counter() - start) / sum(len(batch) for batch in batches)
+
+    for batch in batches:
+        assert len({suggestion['topic'] for suggestion in batch}) == len(batch)
+    print(f"legacy random suggestions:    {legacy * 1e6:8.2f} us per suggestion")
+    print(f"ranked, one call at a time:   {single * 1e6:8.2f} us per suggestion")
+    print(f"ranked, {filters_count} filters batched: {batched * 1e6:8.2f} us per suggestion")
+
+    print("\nTop suggestions:")
+    for suggestion in suggester.generate_topic_suggestions(k):
+        print(f"- {suggestion['template']} [{suggestion['category']}, {suggestion['engagement_potential']}, "
+              f"~{suggestion['expected_engagement']} per post, related: {', '.join(suggestion['related_topics'])}]")
+    print(f"\nFor {filters[1]}:")
+    for suggestion in batches[1]:
+        print(f"- {suggestion['topic']}: ~{suggestion['expected_engagement']} per post")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Check TopicState against a full TfidfVectorizer refit and time incremental updates.
+
+Usage: python benchmarks/bench_topics.py [batches] [posts_per_batch]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from topics import TopicState
+
+def token_batch(rng, size):
+    """Noun-token strings with a long-tailed vocabulary, so max_features actually prunes."""
+    vocabulary = [f"term{i}" for i in range(3000)] + ["data", "team", "growth", "ai", "x"]
+    return [
+        ' '.join(rng.choice(vocabulary[:int(rng.paretovariate(0.6)) % len(vocabulary) + 5])
+                 for _ in range(rng.randint(0, 40)))
+        for _ in range(size)
+    ]
+
+def full_refit(documents, top_n=10):
+    """The original analyze_topics computation."""
+    vectorizer = TfidfVectorizer(max_features=1000)
+    tfidf_matrix = vectorizer.fit_transform(documents)
+    term_scores = dict(zip(vectorizer.get_feature_names_out(), tfidf_matrix.mean(axis=0).A1))
+    return sorted(term_scores.items(), key=lambda x: x[1], reverse=True)[:top_n]
+
+def main():
+    batches = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    per_batch = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    rng = random.Random(11)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        state = TopicState(os.path.join(tmp, 'topic_state'))
+        documents = []
+        print(f"{'docs':>8} {'update':>9} {'top terms':>10} {'full refit':>11} {'match':>6}")
+        for _ in range(batches):
+            batch = token_batch(rng, per_batch)
+            documents.extend(batch)
+
+            start = time.perf_counter()
+            state.add_documents(batch)
+            update_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            incremental = state.top_terms(10)
+            query_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            expected = full_refit(documents)
+            refit_time = time.perf_counter() - start
+
+            match = ([term for term, _ in incremental] == [term for term, _ in expected]
+                     and np.allclose([s for _, s in incremental], [s for _, s in expected], rtol=1e-12))
+            print(f"{len(documents):>8} {update_time:>8.3f}s {query_time:>9.3f}s {refit_time:>10.3f}s {str(match):>6}")
+            assert match, (incremental, expected)
+
+        # Persisted state reloads to the same answer, and merging split states matches too
+        assert TopicState(state.state_dir).top_terms(10) == incremental
+        left, right = TopicState(), TopicState()
+        left.add_documents(documents[:len(documents) // 2])
+        right.add_documents(documents[len(documents) // 2:])
+        left.merge(right)
+        assert np.allclose([s for _, s in left.top_terms(10)], [s for _, s in expected], rtol=1e-12)
+        print("reloaded and merged states match the full refit")
+        segment_files = [name for name in os.listdir(state.state_dir) if name.startswith('segment_')]
+        print(f"{batches} batches persisted as {len(segment_files)} segment files")
+        assert len(segment_files) <= state.max_segments
+
+if __name__ == "__main__":
+    main()
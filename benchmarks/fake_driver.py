@@ -0,0 +1,166 @@
+"""In-process WebDriver stand-in that serves a local feed HTML page."""
+import json
+import os
+import secrets
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from bs4 import BeautifulSoup
+from selenium.common.exceptions import NoSuchElementException
+from extraction import EXTRACT_POSTS_JS, HTML_PARSER, POST_CLASS, POST_STRAINER, raw_fields
+from waits import POST_COUNT_JS, RESOURCE_COUNT_JS, SCROLL_JS
+
+SESSION_COOKIE = 'li_at'
+
+class FakeElement:
+    """Minimal WebElement that accepts input and clicks."""
+
+    def __init__(self, on_click=None):
+        self.value = ''
+        self.on_click = on_click
+
+    def send_keys(self, *keys):
+        self.value += ''.join(key for key in keys if key)
+
+    def click(self):
+        if self.on_click:
+            self.on_click()
+
+class FakeLoginServer:
+    """Accounts and live session tokens shared by the fake drivers of one simulated site.
+
+    Logging in takes login_delay seconds and issues a session cookie; sessions
+    stay valid until expire_sessions() is called.
+    """
+
+    def __init__(self, accounts, login_delay=0.0):
+        self.accounts = accounts
+        self.login_delay = login_delay
+        self.sessions = set()
+        self.logins = 0
+
+    def login(self, email, password):
+        """Return a new session token, or None for wrong credentials."""
+        time.sleep(self.login_delay)
+        if self.accounts.get(email) != password:
+            return None
+        self.logins += 1
+        token = secrets.token_hex(16)
+        self.sessions.add(token)
+        return token
+
+    def expire_sessions(self):
+        self.sessions.clear()
+
+class FakeFeedDriver:
+    """Serves the posts of a feed HTML page, loading page_size more load_delay seconds after each scroll.
+
+    With a FakeLoginServer, the feed is only shown to a browser holding a valid
+    session cookie; other requests land on a login page with username/password
+    fields. Without one, every page counts as logged in.
+    """
+
+    def __init__(self, html, page_size=10, load_delay=0.0, login_server=None):
+        soup = BeautifulSoup(html, HTML_PARSER, parse_only=POST_STRAINER)
+        self.posts = soup.find_all(class_=POST_CLASS)
+        self.page_size = page_size
+        self.load_delay = load_delay
+        self.loaded = min(page_size, len(self.posts))
+        self.pending_since = None
+        self.requests = 0
+        self.extracted = set()
+        # How many times each DOM node was returned by the extraction script
+        self.extraction_counts = Counter()
+        self.current_url = None
+        self.login_server = login_server
+        self.cookies = {}
+        self.login_form = {}
+
+    def _logged_in(self):
+        if self.login_server is None:
+            return True
+        cookie = self.cookies.get(SESSION_COOKIE)
+        return cookie is not None and cookie['value'] in self.login_server.sessions
+
+    def get(self, url):
+        self.current_url = url
+        if '/login' in url or self._logged_in():
+            return
+        # Like LinkedIn's auth wall: signed-out feed requests end up on the login page
+        self.current_url = 'https://www.linkedin.com/login?session_redirect=' + url
+
+    def find_element(self, by, value):
+        if self.login_server is None:
+            return FakeElement()
+        on_login_page = '/login' in (self.current_url or '')
+        if on_login_page and value in ('username', 'password'):
+            return self.login_form.setdefault(value, FakeElement())
+        if on_login_page and value == "button[type='submit']":
+            return FakeElement(on_click=self._submit_login)
+        if not on_login_page and value == POST_CLASS and self.loaded:
+            return FakeElement()
+        raise NoSuchElementException(f"no element {value!r} on {self.current_url}")
+
+    def find_elements(self, by, value):
+        if '/login' in (self.current_url or ''):
+            return []
+        return [FakeElement() for _ in range(self.loaded)]
+
+    def execute_script(self, script, *args):
+        self._apply_pending_load()
+        if script == EXTRACT_POSTS_JS:
+            return self._extract()
+        if script == POST_COUNT_JS:
+            return self.loaded
+        if script == RESOURCE_COUNT_JS:
+            return self.requests
+        if script == SCROLL_JS:
+            if self.pending_since is None and self.loaded < len(self.posts):
+                self.pending_since = time.monotonic()
+                self.requests += 1
+            return None
+        raise NotImplementedError(f"FakeFeedDriver cannot run script: {script[:60]}")
+
+    def get_cookies(self):
+        return [dict(cookie) for cookie in self.cookies.values()]
+
+    def add_cookie(self, cookie):
+        self.cookies[cookie['name']] = dict(cookie)
+
+    def delete_all_cookies(self):
+        self.cookies.clear()
+
+    def quit(self):
+        pass
+
+    def _submit_login(self):
+        """Check the entered credentials against the login server."""
+        token = self.login_server.login(self.login_form['username'].value, self.login_form['password'].value)
+        self.login_form = {}
+        if token is None:
+            return
+        self.cookies[SESSION_COOKIE] = {
+            'name': SESSION_COOKIE, 'value': token, 'domain': '.linkedin.com', 'path': '/',
+            'secure': True, 'httpOnly': True, 'expiry': int(time.time()) + 365 * 86400
+        }
+        self.current_url = 'https://www.linkedin.com/feed/'
+
+    def _apply_pending_load(self):
+        """Reveal the next page once the simulated network delay has passed."""
+        if self.pending_since is not None and time.monotonic() - self.pending_since >= self.load_delay:
+            self.loaded = min(self.loaded + self.page_size, len(self.posts))
+            self.pending_since = None
+
+    def _extract(self):
+        """Python equivalent of EXTRACT_POSTS_JS over the loaded nodes."""
+        result = []
+        for index in range(self.loaded):
+            if index in self.extracted:
+                continue
+            self.extracted.add(index)
+            self.extraction_counts[index] += 1
+            result.append(raw_fields(self.posts[index]))
+        return json.dumps(result)
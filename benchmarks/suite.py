@@ -0,0 +1,245 @@
+"""Benchmark suite for the scraper, analyzer and suggestion hot paths, with a regression report.
+
+Every case runs on realistic synthetic feeds (see synthetic.generate_realistic_posts)
+at each corpus size. Save a run as a baseline, then compare later runs to it:
+
+    python benchmarks/suite.py --save baseline.json
+    python benchmarks/suite.py --baseline baseline.json --threshold 0.1
+
+A case whose best time is more than threshold slower than the baseline is
+reported as a regression, and the run exits with status 1.
+
+This is a script rather than pytest-benchmark tests so it runs with the
+project's own requirements: the pytest suite in tests/ checks behaviour in a
+few seconds and doesn't need NLTK data, while these cases do and take
+minutes at the larger sizes. --save/--baseline play the part of
+pytest-benchmark's --benchmark-save/--benchmark-compare.
+
+Usage: python benchmarks/suite.py [--sizes N ...] [--repeat N] [--only CASE ...]
+                                  [--save FILE] [--baseline FILE] [--threshold FRACTION]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+from functools import cached_property
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from analyzer import LinkedInAnalyzer
+from feed_files import FeedWriter
+from preprocessing import TextPreprocessor
+from scraper import LinkedInScraper
+from sessions import SessionStore
+from suggestions import ContentSuggestions
+from synthetic import generate_realistic_posts, render_posts_html
+
+DEFAULT_SIZES = [1000, 5000, 20000]
+
+class HtmlElement:
+    """Stands in for a WebDriver element holding one rendered post."""
+
+    def __init__(self, html):
+        self.html = html
+
+    def get_attribute(self, name):
+        return self.html
+
+class Corpus:
+    """One synthetic feed and the objects the cases run against, built on first use."""
+
+    def __init__(self, size, workdir):
+        self.size = size
+        self.workdir = workdir
+
+    @cached_property
+    def posts(self):
+        return generate_realistic_posts(self.size, seed=self.size)
+
+    @cached_property
+    def texts(self):
+        return [post['text'] for post in self.posts]
+
+    @cached_property
+    def elements(self):
+        urns = [7000000000000000000 + i for i in range(self.size)]
+        return [HtmlElement(html) for html in render_posts_html(self.posts, urns)]
+
+    @cached_property
+    def raw_dir(self):
+        raw_dir = os.path.join(self.workdir, 'raw')
+        os.makedirs(raw_dir)
+        with FeedWriter(os.path.join(raw_dir, 'feed.ndjson')) as writer:
+            writer.write_many(self.posts)
+        return raw_dir
+
+    @cached_property
+    def scraper(self):
+        return LinkedInScraper(
+            driver_factory=lambda: None,
+            seen_path=os.path.join(self.workdir, 'seen_posts.db'),
+            session_store=SessionStore(os.path.join(self.workdir, 'sessions'))
+        )
+
+    def new_analyzer(self, name):
+        """An analyzer with its own empty stores under the work directory."""
+        base = os.path.join(self.workdir, name)
+        return LinkedInAnalyzer(
+            store_path=os.path.join(base, 'analysis.db'),
+            token_cache_path=os.path.join(base, 'token_cache.db'),
+            topic_state_dir=os.path.join(base, 'topic_state')
+        )
+
+    @cached_property
+    def analyzer(self):
+        """An analyzer with the corpus already ingested."""
+        analyzer = self.new_analyzer('loaded')
+        analyzer.load_data(self.raw_dir)
+        return analyzer
+
+    @cached_property
+    def insights(self):
+        return self.analyzer.generate_insights()
+
+# name -> function(corpus) returning the callable to time
+CASES = {}
+
+def case(name):
+    """Register a benchmark case."""
+    def register(func):
+        CASES[name] = func
+        return func
+    return register
+
+@case('is_advertisement')
+def bench_is_advertisement(corpus):
+    scraper, texts = corpus.scraper, corpus.texts
+    return lambda: [scraper.is_advertisement(text) for text in texts]
+
+@case('extract_post_data')
+def bench_extract_post_data(corpus):
+    scraper, elements = corpus.scraper, corpus.elements
+    return lambda: [scraper.extract_post_data(element) for element in elements]
+
+@case('preprocess_text')
+def bench_preprocess_text(corpus):
+    # No token cache, so every run tags every text; the process pool stays up between runs, as in the app
+    preprocessor = TextPreprocessor(corpus.analyzer.stop_words, cache_path=None)
+    texts = corpus.texts
+    return lambda: preprocessor.preprocess_many(texts)
+
+@case('analyze_topics')
+def bench_analyze_topics(corpus):
+    return corpus.analyzer.analyze_topics
+
+@case('analyze_engagement')
+def bench_analyze_engagement(corpus):
+    topics = [topic for topic, _ in corpus.insights['top_topics']]
+    return lambda: corpus.analyzer.analyze_engagement(topics=topics)
+
+@case('generate_insights')
+def bench_generate_insights(corpus):
+    return corpus.analyzer.generate_insights
+
+@case('suggestions')
+def bench_suggestions(corpus):
+    suggester = ContentSuggestions()
+    suggester.insights = corpus.insights
+    return lambda: (suggester.generate_topic_suggestions(), suggester.generate_best_practices())
+
+@case('end_to_end')
+def bench_end_to_end(corpus):
+    """Ingest the raw feed into empty stores, then generate insights."""
+    raw_dir, runs = corpus.raw_dir, []
+
+    def run():
+        runs.append(None)
+        analyzer = corpus.new_analyzer(f"end_to_end_{len(runs)}")
+        analyzer.load_data(raw_dir)
+        return analyzer.generate_insights()
+    return run
+
+def measure(func, repeat):
+    """Best and median wall-clock seconds over repeat calls."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return min(durations), statistics.median(durations)
+
+def run_suite(sizes, repeat, only=None):
+    """Run the selected cases at every size; returns {'<case>[<size>]': result}."""
+    results = {}
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as workdir:
+            corpus = Corpus(size, workdir)
+            for name, build in CASES.items():
+                if only and name not in only:
+                    continue
+                best, median = measure(build(corpus), repeat)
+                results[f"{name}[{size}]"] = {
+                    'case': name, 'size': size, 'best': best, 'median': median,
+                    'per_post_us': best / size * 1e6
+                }
+                print(f"{name:<20}{size:>8}  best {best:>9.4f}s  median {median:>9.4f}s  "
+                      f"{best / size * 1e6:>9.1f}us/post")
+            if 'scraper' in corpus.__dict__:
+                corpus.scraper.close()
+    return results
+
+def compare(results, baseline, threshold):
+    """Print each case's change against the baseline; returns the keys that regressed."""
+    regressions = []
+    print(f"\n{'case':<30}{'baseline':>11}{'current':>11}{'change':>9}")
+    for key, result in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            print(f"{key:<30}{'-':>11}{result['best']:>10.4f}s{'new':>9}")
+            continue
+        change = result['best'] / previous['best'] - 1
+        status = ''
+        if change > threshold:
+            status = '  REGRESSION'
+            regressions.append(key)
+        elif change < -threshold:
+            status = '  improved'
+        print(f"{key:<30}{previous['best']:>10.4f}s{result['best']:>10.4f}s{change:>+9.1%}{status}")
+    print(f"\n{len(regressions)} regression(s) beyond {threshold:.0%}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the scraper, analyzer and suggestion hot paths.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES, help="corpus sizes in posts")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per case; the best is compared")
+    parser.add_argument('--only', nargs='+', choices=sorted(CASES), help="run only these cases")
+    parser.add_argument('--save', help="write the results to this JSON file")
+    parser.add_argument('--baseline', help="compare against results saved earlier with --save")
+    parser.add_argument('--threshold', type=float, default=0.1, help="slowdown reported as a regression")
+    args = parser.parse_args()
+
+    results = run_suite(args.sizes, args.repeat, args.only)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({
+                'created_at': datetime.now().isoformat(),
+                'python': platform.python_version(),
+                'machine': platform.platform(),
+                'results': results
+            }, f, indent=2)
+        print(f"Results saved to {args.save}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""Deterministic synthetic LinkedIn posts for benchmarks."""
+import random
+from html import escape
+from datetime import datetime, timedelta
+
+TOPIC_WORDS = [
+    "leadership", "strategy", "marketing", "analytics", "engineering", "product",
+    "customer", "hiring", "culture", "security", "cloud", "design", "sales",
+    "growth", "startup", "funding", "research", "automation", "community", "career",
+    "team", "data", "platform", "innovation", "feedback", "mentorship", "pipeline",
+]
+FILLER_WORDS = [
+    "the", "a", "our", "we", "this", "is", "about", "with", "for", "and",
+    "learned", "shared", "building", "thinking", "about", "from", "every", "into",
+]
+
+def generate_post(rng, start=datetime(2024, 1, 1)):
+    """Generate a single post dict in the scraper's output format."""
+    length = rng.randint(20, 120)
+    words = [
+        rng.choice(TOPIC_WORDS) if rng.random() < 0.4 else rng.choice(FILLER_WORDS)
+        for _ in range(length)
+    ]
+    return {
+        'text': ' '.join(words).capitalize() + '.',
+        'engagement': {
+            'likes': int(rng.paretovariate(1.2) * 10),
+            'comments': rng.randint(0, 40),
+            'shares': rng.randint(0, 10)
+        },
+        'timestamp': (start + timedelta(minutes=rng.randint(0, 525600))).isoformat()
+    }
+
+def generate_posts(n, seed=0):
+    """Generate n posts; the same seed always yields the same posts."""
+    rng = random.Random(seed)
+    return [generate_post(rng) for _ in range(n)]
+
+# Realistic feed mix: share of promoted posts, and how often organic posts carry links and hashtags
+AD_RATIO = 0.15
+URL_RATE = 0.25
+HASHTAG_RATE = 0.5
+LINK_DOMAINS = ["github.com", "medium.com", "hbr.org", "substack.com", "youtube.com", "techcrunch.com"]
+AD_LINK_DOMAINS = ["bit.ly", "lnkd.in", "hubs.la"]
+AD_PHRASES = [
+    "Book a demo today.", "Start your free trial.", "Limited time offer.", "Sign up now.",
+    "Our platform helps teams like yours.", "Download the full report.", "Learn more about our solution.",
+    "Register now for the webinar.", "Special offer for new customers.",
+]
+SENTENCE_ENDINGS = [".", ".", ".", "!", "?"]
+# Organic posts are mostly first person singular; "we"/"our" next to "platform" reads as self-promotion
+POST_FILLER_WORDS = [word for word in FILLER_WORDS if word not in ("we", "our")] + [
+    "i", "my", "what", "how", "when", "it", "was", "that", "people", "because",
+]
+
+def generate_sentence(rng):
+    """One sentence of 6-20 topic and filler words."""
+    words = [
+        rng.choice(TOPIC_WORDS) if rng.random() < 0.4 else rng.choice(POST_FILLER_WORDS)
+        for _ in range(rng.randint(6, 20))
+    ]
+    return ' '.join(words).capitalize() + rng.choice(SENTENCE_ENDINGS)
+
+def generate_realistic_post(rng, ad=False, start=datetime(2024, 1, 1)):
+    """A post with a long-tailed length, paragraphs, links, hashtags and long-tailed engagement.
+
+    Promoted posts (ad=True) add call-to-action copy and a shortened tracking
+    link, and get less engagement than organic ones.
+    """
+    # Median around 55 words with a long tail, capped near LinkedIn's 3000 character limit
+    target = min(400, max(5, int(rng.lognormvariate(4.0, 0.7))))
+    paragraphs, sentences, words = [], [], 0
+    while words < target:
+        sentence = generate_sentence(rng)
+        sentences.append(sentence)
+        words += sentence.count(' ') + 1
+        if len(sentences) >= rng.randint(2, 4):
+            paragraphs.append(' '.join(sentences))
+            sentences = []
+    if sentences:
+        paragraphs.append(' '.join(sentences))
+
+    if ad:
+        paragraphs.append(' '.join(rng.sample(AD_PHRASES, rng.randint(1, 2))))
+        paragraphs.append(f"https://{rng.choice(AD_LINK_DOMAINS)}/{rng.randrange(16 ** 6):06x}")
+    elif rng.random() < URL_RATE:
+        paragraphs.append(f"https://{rng.choice(LINK_DOMAINS)}/{'-'.join(rng.sample(TOPIC_WORDS, 3))}")
+    if rng.random() < HASHTAG_RATE:
+        paragraphs.append(' '.join(f"#{word}" for word in rng.sample(TOPIC_WORDS, rng.randint(1, 5))))
+
+    # Reactions are heavy-tailed; comments and shares follow them at lower rates
+    likes = int(rng.lognormvariate(1.5 if ad else 2.5, 1.4))
+    return {
+        'text': '\n\n'.join(paragraphs),
+        'engagement': {
+            'likes': likes,
+            'comments': int(likes * rng.uniform(0.0, 0.15)),
+            'shares': int(likes * rng.uniform(0.0, 0.05))
+        },
+        'timestamp': (start + timedelta(minutes=rng.randint(0, 525600))).isoformat()
+    }
+
+def generate_realistic_posts(n, seed=0, ad_ratio=AD_RATIO):
+    """Generate n realistic posts, about ad_ratio of them promoted; the same seed always yields the same posts."""
+    rng = random.Random(seed)
+    return [generate_realistic_post(rng, ad=rng.random() < ad_ratio) for _ in range(n)]
+
+POST_HTML = """<div class="feed-shared-update-v2 feed-shared-update-v2--minimal-padding" data-urn="urn:li:activity:{urn}">
+  <div class="update-components-actor"><span class="update-components-actor__name">Member {urn}</span>
+    <span class="update-components-actor__sub-description"><span aria-hidden="true">{age} • </span></span></div>
+  <div class="feed-shared-update-v2__description-wrapper">
+    <div class="feed-shared-update-v2__description feed-shared-inline-show-more-text">
+      <span class="break-words"><span dir="ltr">{text}</span></span>
+    </div>
+  </div>
+  <div class="social-details-social-counts">
+    <span class="social-details-social-counts__reactions-count">{likes}</span>
+  </div>
+</div>
+"""
+
+def relative_age(delta):
+    """Format a post's age the way the feed shows it, e.g. '5h', '2d', '1mo'."""
+    minutes = max(1, int(delta.total_seconds() // 60))
+    for unit, size in (('yr', 525600), ('mo', 43200), ('w', 10080), ('d', 1440), ('h', 60)):
+        if minutes >= size:
+            return f"{minutes // size}{unit}"
+    return f"{minutes}m"
+
+def render_post_html(post, urn, age='1d'):
+    """Render one post with LinkedIn's feed-shared-update-v2 markup."""
+    return POST_HTML.format(urn=urn, age=age, text=escape(post['text']), likes=f"{post['engagement']['likes']:,}")
+
+def render_posts_html(posts, urns):
+    """Render posts with ages relative to the newest one, as if scraped right after it."""
+    times = [datetime.fromisoformat(post['timestamp']) for post in posts]
+    now = max(times, default=None)
+    return [render_post_html(post, urn, relative_age(now - time)) for post, urn, time in zip(posts, urns, times)]
+
+def generate_feed_html(posts, urns=None):
+    """Render a static feed page containing the given posts (with optional explicit URNs)."""
+    urns = urns or [7000000000000000000 + i for i in range(len(posts))]
+    body = ''.join(render_posts_html(posts, urns))
+    return f"<!DOCTYPE html>\n<html><head><title>Feed</title></head><body><main class=\"scaffold-finite-scroll__content\">\n{body}</main></body></html>\n"
+
+INFINITE_SCROLL_JS = """<script>
+var pending = Array.from(document.getElementById('pending').content.children);
+var loading = false;
+function loadPage() {
+  if (loading || !pending.length) return;
+  loading = true;
+  setTimeout(function () {
+    var feed = document.querySelector('main');
+    pending.splice(0, %(page_size)d).forEach(function (post) { feed.appendChild(post); });
+    loading = false;
+  }, %(delay_ms)d);
+}
+window.addEventListener('scroll', function () {
+  if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 10) loadPage();
+});
+</script>"""
+
+def generate_infinite_feed_html(posts, page_size=10, delay_ms=300):
+    """Render a feed page that reveals page_size more posts, delay_ms after each scroll to the bottom."""
+    rendered = render_posts_html(posts, [7000000000000000000 + i for i in range(len(posts))])
+    visible, pending = ''.join(rendered[:page_size]), ''.join(rendered[page_size:])
+    script = INFINITE_SCROLL_JS % {'page_size': page_size, 'delay_ms': delay_ms}
+    return ("<!DOCTYPE html>\n<html><head><title>Feed</title></head><body>"
+            f"<main class=\"scaffold-finite-scroll__content\">\n{visible}</main>\n"
+            f"<template id=\"pending\">{pending}</template>\n{script}</body></html>\n")
@@ -0,0 +1,81 @@
+import re
+
+# Promotional language rules, in the order they are checked. A rule with targets
+# matches a trigger followed later on the same line by a target; it replaces a
+# `\b(?:...)\b.*\b(?:...)\b` regex that could backtrack badly on long posts.
+PROMOTIONAL_RULES = [
+    ('call_to_action',
+     ["download", "get", "sign up", "register", "book", "schedule", "try", "join", "subscribe"],
+     ["now", "today", "free", "demo", "call"]),
+    ('self_promotion',
+     ["our", "we", "us"],
+     ["product", "service", "solution", "platform", "tool", "help", "provide", "offer", "deliver", "create"]),
+    ('offer',
+     ["limited time", "special offer", "free trial", "exclusive", "discount", "deal"],
+     None),
+    ('click_through',
+     ["click", "check", "learn", "find", "discover"],
+     ["more", "out", "here", "now"]),
+]
+
+def _word_pattern(words):
+    """Compile an alternation of whole words/phrases."""
+    return re.compile(r'\b(?:' + '|'.join(re.escape(word) for word in words) + r')\b')
+
+class AdClassifier:
+    """Single-pass advertisement classifier built once from a list of indicator strings."""
+
+    def __init__(self, indicators):
+        # Longest first so the reported indicator is the most specific one at a position
+        ordered = sorted(set(indicators), key=len, reverse=True)
+        self.indicator_pattern = re.compile('|'.join(re.escape(indicator) for indicator in ordered))
+        self.rules = [
+            (name, _word_pattern(triggers), _word_pattern(targets) if targets else None)
+            for name, triggers, targets in PROMOTIONAL_RULES
+        ]
+
+    def classify(self, text):
+        """Return the name of the rule that flags text as an ad, or None for organic posts."""
+        if not text:
+            return 'empty'
+
+        text_lower = text.lower()
+
+        match = self.indicator_pattern.search(text_lower)
+        if match:
+            return f"indicator:{match.group(0)}"
+
+        for name, triggers, targets in self.rules:
+            if targets is None:
+                matched = triggers.search(text_lower) is not None
+            else:
+                matched = self._pair_matches(text_lower, triggers, targets)
+            if matched:
+                return f"pattern:{name}"
+
+        return None
+
+    def classify_many(self, texts):
+        """Classify a batch of texts, returning one rule name (or None) per text."""
+        return [self.classify(text) for text in texts]
+
+    def is_advertisement(self, text):
+        """Check if a post is likely an advertisement."""
+        return self.classify(text) is not None
+
+    @staticmethod
+    def _pair_matches(text, triggers, targets):
+        """Check for a trigger followed by a target on the same line in linear time."""
+        pos = 0
+        while True:
+            trigger = triggers.search(text, pos)
+            if not trigger:
+                return False
+
+            # Only the earliest trigger on a line matters; search the rest of that line once
+            line_end = text.find('\n', trigger.end())
+            if line_end == -1:
+                line_end = len(text)
+            if targets.search(text, trigger.end(), line_end):
+                return True
+            pos = line_end + 1
@@ -1,129 +1,217 @@
 import json
 import os
 import glob
+import numpy as np
 import pandas as pd
-import nltk
-from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
 from nltk.probability import FreqDist
-from sklearn.feature_extraction.text import TfidfVectorizer
 from collections import Counter
-import re
-
-# Download required NLTK data
-nltk.download('punkt')
-nltk.download('stopwords')
-nltk.download('averaged_perceptron_tagger')
+from store import PostStore
+from preprocessing import TextPreprocessor, ensure_nltk_resources
+from insights_history import InsightsHistory
+from engagement import analyze_engagement
+from topics import TopicState
+from feed_files import FEED_FILE_PATTERNS, is_ndjson, iter_posts, iter_records
+from rollups import TopicRollups
+from dedup import NearDuplicateIndex
+from metrics import metrics
+from suggestion_index import build_topic_index
 
 class LinkedInAnalyzer:
-    def __init__(self):
+    def __init__(self, store_path='data/analysis.db', token_cache_path='data/token_cache.db', workers=None,
+                 topic_state_dir='data/topic_state', history_dir='data', columns_dir=None):
+        # NLTK data is checked here rather than downloaded on every import
+        ensure_nltk_resources()
         self.stop_words = set(stopwords.words('english'))
         # Add common contractions and LinkedIn filler words
         self.stop_words.update({
             "im", "youre", "theyre", "weve", "ive", "dont", "doesnt", "didnt", "cant", "couldnt", "wouldnt", "shouldnt", "wont", "isnt", "arent", "wasnt", "werent", "linkedin", "get", "got", "new", "work", "great", "like", "just", "one", "us", "make", "see", "use", "using", "used", "also", "even", "still", "much", "many", "may", "might", "well", "really", "need", "want", "way", "time", "now", "today", "next", "last", "year", "years", "day", "days", "week", "weeks", "month", "months", "etc"
         })
-        self.posts_data = []
-        self.df = None
-
+        self.preprocessor = TextPreprocessor(self.stop_words, cache_path=token_cache_path, workers=workers)
+        self.store = PostStore(store_path)
+        self.topics = TopicState(topic_state_dir)
+        self.rollups = TopicRollups(self.store.conn)
+        self.duplicates = NearDuplicateIndex(self.store.conn)
+        self.history_dir = history_dir
+        self._history = None
+        # Memory-map the loaded posts from this directory instead of holding them in RAM
+        self.columns_dir = columns_dir if columns_dir is not None else os.getenv('POST_COLUMNS_DIR')
+        self.posts = None
+
+    @metrics.timed('load_data')
     def load_data(self, data_dir='data/raw'):
-        """Load all JSON files from the data directory."""
-        json_files = glob.glob(os.path.join(data_dir, '*.json'))
-        for file in json_files:
-            with open(file, 'r', encoding='utf-8') as f:
-                self.posts_data.extend(json.load(f))
-        
-        # Convert to DataFrame
-        self.df = pd.DataFrame(self.posts_data)
-
+        """Ingest new or grown feed files from the data directory and load the stored archive."""
+        feed_files = sorted(
+            file for pattern in FEED_FILE_PATTERNS for file in glob.glob(os.path.join(data_dir, pattern))
+        )
+        # Only files missing from the store's manifest (or appended to since) are parsed and tokenized
+        for file in self.store.pending_files(feed_files):
+            self.ingest_file(file)
+
+        # Archives stored before near-duplicate detection are clustered once, oldest post first
+        self.cluster_archive()
+
+        # Rebuild topic statistics if they fell out of step with the store (e.g. after a crash)
+        if self.topics.n_docs != self.store.cluster_count():
+            self.topics.clear()
+            self.topics.add_documents(self.store.load_tokens())
+        if self.rollups.posts_rolled_up() != self.store.cluster_count():
+            self.rollups.clear()
+            self.rollups.add_posts(*self.store.load_posts())
+
+        self.posts = self.store.load_columns(directory=self.columns_dir)
+
+    def ingest_file(self, path, batch_size=1000):
+        """Stream a feed file into the store in batches, resuming NDJSON where the last read stopped."""
+        if not is_ndjson(path):
+            self.ingest_posts(list(iter_posts(path)), path)
+            return
+
+        # Size before reading: if the file grows meanwhile, it stays pending
+        file_size = os.path.getsize(path)
+        read_offset = self.store.read_offset(path)
+        batch = []
+        for post, read_offset in iter_records(path, read_offset):
+            batch.append(post)
+            if len(batch) >= batch_size:
+                self.ingest_posts(batch, path, read_offset=read_offset)
+                batch = []
+        self.ingest_posts(batch, path, read_offset=read_offset, file_size=file_size)
+
+    @metrics.timed('ingest_posts')
+    def ingest_posts(self, posts, source, read_offset=None, file_size=None):
+        """Tokenize posts already in memory and add them to the store under their raw file name.
+
+        Near-duplicates of a stored post (or of an earlier post in the batch)
+        join its cluster: only each new cluster's first post is tokenized and
+        counted in the topic statistics and rollups.
+        """
+        texts = [post.get('text') or "" for post in posts]
+        cluster_ids, new_clusters = self.duplicates.match(texts)
+        started = {cluster_id for cluster_id, _, _ in new_clusters}
+        firsts = []
+        for i, cluster_id in enumerate(cluster_ids):
+            if cluster_id in started:
+                started.discard(cluster_id)
+                firsts.append(i)
+
+        tokens = [""] * len(posts)
+        if firsts:
+            for i, post_tokens in zip(firsts, self.preprocessor.preprocess_many([texts[i] for i in firsts])):
+                tokens[i] = post_tokens
+
+        with self.store.conn:
+            self.duplicates.add(new_clusters)
+            self.store.add_file(source, posts, tokens, cluster_ids=cluster_ids,
+                                read_offset=read_offset, file_size=file_size)
+        metrics.increment('posts_ingested', len(posts))
+        metrics.increment('duplicates_collapsed', len(posts) - len(firsts))
+        if firsts:
+            self.topics.add_documents([tokens[i] for i in firsts])
+            self.rollups.add_posts([posts[i] for i in firsts], [tokens[i] for i in firsts])
+
+    def cluster_archive(self, batch_size=10000):
+        """Assign stored posts that have no near-duplicate cluster yet to one."""
+        rows = self.store.unclustered_posts()
+        for start in range(0, len(rows), batch_size):
+            post_ids, texts = zip(*rows[start:start + batch_size])
+            cluster_ids, new_clusters = self.duplicates.match(list(texts))
+            with self.store.conn:
+                self.duplicates.add(new_clusters)
+                self.store.set_clusters(post_ids, cluster_ids)
+
+    @metrics.timed('preprocess_text')
     def preprocess_text(self, text):
         """Clean and preprocess text data, keeping only nouns/proper nouns."""
-        text = text.lower()
-        text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
-        text = re.sub(r'[^\w\s]', '', text)
-        text = re.sub(r'\d+', '', text)
-        tokens = word_tokenize(text)
-        # POS tagging
-        tagged = nltk.pos_tag(tokens)
-        # Keep only nouns and proper nouns
-        tokens = [word for word, pos in tagged if pos in ("NN", "NNS", "NNP", "NNPS")]
-        # Remove stopwords and short words
-        tokens = [token for token in tokens if token not in self.stop_words and len(token) > 2]
-        return ' '.join(tokens)
+        return self.preprocessor.preprocess(text)
 
+    @metrics.timed('analyze_topics')
     def analyze_topics(self, top_n=10):
         """Analyze and extract top topics from posts."""
-        if self.df is None or len(self.df) == 0:
+        if self.posts is None or len(self.posts) == 0:
             return []
 
-        # Preprocess all posts
-        processed_texts = self.df['text'].apply(self.preprocess_text)
-        
-        # Create TF-IDF vectorizer
-        vectorizer = TfidfVectorizer(max_features=1000)
-        tfidf_matrix = vectorizer.fit_transform(processed_texts)
-        
-        # Get feature names
-        feature_names = vectorizer.get_feature_names_out()
-        
-        # Calculate average TF-IDF scores for each term
-        avg_tfidf = tfidf_matrix.mean(axis=0).A1
-        
-        # Create a dictionary of terms and their scores
-        term_scores = dict(zip(feature_names, avg_tfidf))
-        
-        # Get top N terms
-        top_terms = sorted(term_scores.items(), key=lambda x: x[1], reverse=True)[:top_n]
-        
-        return top_terms
+        # Term statistics are updated incrementally as posts are ingested
+        return self.topics.top_terms(top_n, max_features=1000)
 
-    def analyze_engagement(self):
-        """Analyze engagement patterns."""
-        if self.df is None or len(self.df) == 0:
+    @metrics.timed('analyze_engagement')
+    def analyze_engagement(self, topics=None):
+        """Analyze engagement patterns, overall and for the given topics."""
+        if self.posts is None or len(self.posts) == 0:
             return {}
 
-        # Calculate average engagement metrics
-        avg_engagement = {
-            'likes': self.df['engagement'].apply(lambda x: x['likes']).mean(),
-            'comments': self.df['engagement'].apply(lambda x: x['comments']).mean(),
-            'shares': self.df['engagement'].apply(lambda x: x['shares']).mean()
-        }
+        if not topics:
+            return analyze_engagement(self.posts)
 
-        # Find posts with highest engagement
-        self.df['total_engagement'] = self.df['engagement'].apply(
-            lambda x: x['likes'] + x['comments'] + x['shares']
-        )
-        top_posts = self.df.nlargest(5, 'total_engagement')
+        # Reuse the stored term counts instead of re-tokenizing
+        mentions = self.topics.mentions(topics)
+        return analyze_engagement(self.posts, topics=topics, topic_mentions=mentions)
 
+    @metrics.timed('analyze_trends')
+    def analyze_trends(self, reference=None, top_n=10, weeks=8):
+        """Trending topics (this week vs last week) and weekly engagement, read from the rollups."""
+        reference = reference or pd.Timestamp.now()
         return {
-            'average_engagement': avg_engagement,
-            'top_posts': top_posts[['text', 'total_engagement']].to_dict('records')
+            'trending_topics': self.rollups.trending('week', reference=reference.date(), top_n=top_n),
+            'weekly_engagement': self.rollups.engagement_series(
+                'week', start=(reference - pd.Timedelta(weeks=weeks - 1)).date()
+            )
         }
 
+    @metrics.timed('build_topic_index')
+    def build_topic_index(self, top_n=50):
+        """Engagement and co-occurrence statistics of the top topics, for ranking suggestions.
+
+        Ranks topics with the TF-IDF scores already computed for analyze_topics and
+        reads their mentions from the stored term counts, so nothing is refitted.
+        """
+        topics = [topic for topic, _ in self.topics.top_terms(top_n, max_features=1000)]
+        return build_topic_index(self.topics.mentions(topics), self.posts.totals(), topics)
+
     def generate_insights(self):
         """Generate comprehensive insights from the data."""
-        if self.df is None or len(self.df) == 0:
+        if self.posts is None or len(self.posts) == 0:
             return {}
 
+        top_topics = self.analyze_topics()
+        timestamps = pd.DatetimeIndex(self.posts.timestamp)
+        start, end = timestamps.min(), timestamps.max()
         insights = {
-            'top_topics': self.analyze_topics(),
-            'engagement_analysis': self.analyze_engagement(),
-            'total_posts_analyzed': len(self.df),
+            'top_topics': top_topics,
+            'engagement_analysis': self.analyze_engagement(topics=[topic for topic, _ in top_topics]),
+            # Weeks are counted back from the newest post, so an older archive still shows its trends
+            **self.analyze_trends(reference=end if not pd.isna(end) else None),
+            'topic_index': self.build_topic_index(),
+            'total_posts_analyzed': len(self.posts),
+            'duplicates_collapsed': int(self.posts.cluster_size.sum(dtype=np.int64) - len(self.posts)),
             'date_range': {
-                'start': self.df['timestamp'].min(),
-                'end': self.df['timestamp'].max()
+                'start': start.isoformat() if not pd.isna(start) else None,
+                'end': end.isoformat() if not pd.isna(end) else None
             }
         }
 
         return insights
 
+    @property
+    def history(self):
+        """The insights history, opened on first save."""
+        if self._history is None:
+            self._history = InsightsHistory(self.history_dir)
+        return self._history
+
+    @metrics.timed('save_insights')
     def save_insights(self, insights, filename=None):
-        """Save analysis insights to a JSON file."""
-        if filename is None:
-            filename = f"data/analysis_insights_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.json"
-        
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(insights, f, ensure_ascii=False, indent=2)
+        """Append analysis insights to the insights history; returns the run id.
+
+        With a filename, the insights are also exported to that JSON file.
+        """
+        run_id = self.history.record(insights)
+        if filename is not None:
+            if os.path.dirname(filename):
+                os.makedirs(os.path.dirname(filename), exist_ok=True)
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(insights, f, ensure_ascii=False, indent=2)
+        return run_id
 
 def main():
     analyzer = LinkedInAnalyzer()
@@ -141,6 +229,10 @@ def main():
         print(f"\nTop Topics:")
         for topic, score in insights['top_topics']:
             print(f"- {topic}: {score:.3f}")
+
+        print(f"\nTrending This Week:")
+        for trend in insights['trending_topics']:
+            print(f"- {trend['topic']}: {trend['current']} mentions ({trend['change']:+d} vs last week)")
         
         print(f"\nAverage Engagement:")
         for metric, value in insights['engagement_analysis']['average_engagement'].items():
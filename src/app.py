@@ -1,17 +1,28 @@
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, Response, render_template, jsonify, request, stream_with_context, url_for
 import os
-import subprocess
+import sys
 from datetime import datetime
 import json
 from dotenv import load_dotenv
 
+# Sibling modules are imported flat, whether run as a script or as src.app
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from jobs import JobQueue, JobQueueFullError
+from pipeline import AnalysisPipeline
+from coordinator import ScrapeCoordinator
+from scraper import LinkedInScraper
+from insights_cache import InsightsCache
+from insights_history import InsightsHistory
+from events import format_sse
+from metrics import metrics
+
 # Load environment variables
 load_dotenv()
 
 app = Flask(__name__)
 
-# Ensure required environment variables are set
-required_env_vars = ['LINKEDIN_EMAIL', 'LINKEDIN_PASSWORD']
+# Ensure required environment variables are set (an accounts file replaces the single account)
+required_env_vars = [] if os.getenv('LINKEDIN_ACCOUNTS_FILE') else ['LINKEDIN_EMAIL', 'LINKEDIN_PASSWORD']
 missing_vars = [var for var in required_env_vars if not os.getenv(var)]
 if missing_vars:
     raise EnvironmentError(f"Missing required environment variables: {', '.join(missing_vars)}")
@@ -20,43 +31,140 @@ if missing_vars:
 def index():
     return render_template('index.html')
 
+# Scraper, analyzer and suggestions run in this process; NLTK and the stores stay loaded between jobs
+# With several accounts configured, each run scrapes them in parallel and merges the feeds
+pipeline = AnalysisPipeline(
+    scraper_factory=ScrapeCoordinator if os.getenv('LINKEDIN_ACCOUNTS_FILE') else LinkedInScraper
+)
+
+# One analysis at a time by default: each run drives its own Chrome session
+# Jobs live in this process's memory, so serve with one (threaded) gunicorn worker; see Procfile
+job_queue = JobQueue(pipeline.stages, max_workers=int(os.getenv('ANALYSIS_WORKERS', 1)))
+
+@app.route('/jobs', methods=['POST'])
+def create_job():
+    try:
+        job, created = job_queue.submit('analysis')
+    except JobQueueFullError as e:
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 429
+
+    response = jsonify({
+        'success': True,
+        'coalesced': not created,
+        'job': job.to_dict()
+    })
+    response.status_code = 202
+    response.headers['Location'] = url_for('get_job', job_id=job.id)
+    return response
+
+@app.route('/jobs/<job_id>')
+def get_job(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found'
+        }), 404
+
+    return jsonify({
+        'success': True,
+        'job': job.to_dict()
+    })
+
+# Seconds between keep-alive comments on an idle event stream
+SSE_KEEPALIVE = 15
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found'
+        }), 404
+
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    subscription = job.events.subscribe(last_event_id)
+
+    def stream():
+        try:
+            # Current state first, so a client connecting mid-job can render straight away
+            yield format_sse({'id': None, 'event': 'snapshot', 'data': job.to_dict()})
+            while not subscription.finished:
+                messages = subscription.get(timeout=SSE_KEEPALIVE)
+                if not messages:
+                    yield ": keep-alive\n\n"
+                for message in messages:
+                    yield format_sse(message)
+        finally:
+            subscription.close()
+
+    response = Response(stream_with_context(stream()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Stop reverse proxies from buffering the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+# Latest insights response, rebuilt only when a new run is recorded in the insights history
+insights_cache = InsightsCache(InsightsHistory)
+
+@app.route('/insights/latest')
+def latest_insights():
+    entry = insights_cache.get()
+    if entry is None:
+        return jsonify({
+            'success': False,
+            'error': 'No analysis results found'
+        }), 404
+
+    # Each encoding has its own ETag, checked against the representation this request would get
+    gzipped = bool(request.accept_encodings['gzip'])
+    etag = entry.gzip_etag if gzipped else entry.etag
+    if request.if_none_match.contains(etag):
+        response = app.response_class(status=304)
+    elif gzipped:
+        response = app.response_class(entry.gzip_body, mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = app.response_class(entry.body, mimetype='application/json')
+
+    response.set_etag(etag)
+    response.headers['Vary'] = 'Accept-Encoding'
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/metrics')
+def metrics_endpoint():
+    # Prometheus text format: span timings and counters since the server started
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/run-analysis', methods=['POST'])
 def run_analysis():
+    # Synchronous form of POST /jobs: joins or starts the analysis job and answers once it has finished
     try:
-        # Create data directory if it doesn't exist
-        os.makedirs('data', exist_ok=True)
-        
-        # Run the scraper
-        subprocess.run(['python', 'src/scraper.py'], check=True)
-        
-        # Run the analyzer
-        subprocess.run(['python', 'src/analyzer.py'], check=True)
-        
-        # Run the suggestions generator
-        subprocess.run(['python', 'src/suggestions.py'], check=True)
-        
-        # Get the latest analysis results
-        data_dir = 'data'
-        analysis_files = [f for f in os.listdir(data_dir) if f.startswith('analysis_insights_')]
-        if not analysis_files:
-            raise Exception("No analysis results found")
-            
-        latest_analysis = max(analysis_files)
-        
-        with open(os.path.join(data_dir, latest_analysis), 'r') as f:
-            analysis_data = json.load(f)
-            
-        return jsonify({
-            'success': True,
-            'data': analysis_data
-        })
-    except Exception as e:
-        app.logger.error(f"Analysis failed: {str(e)}")
+        job, _ = job_queue.submit('analysis')
+    except JobQueueFullError as e:
         return jsonify({
             'success': False,
             'error': str(e)
+        }), 429
+
+    job.wait()
+    if job.status == 'failed':
+        app.logger.error(f"Analysis failed: {job.error}")
+        return jsonify({
+            'success': False,
+            'error': job.error
         }), 500
 
+    return jsonify({
+        'success': True,
+        'data': job.result
+    })
+
 if __name__ == '__main__':
     # Use environment variable for port, default to 5000
     port = int(os.getenv('PORT', 5000))
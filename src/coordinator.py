@@ -0,0 +1,243 @@
+import json
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+from feed_files import FeedWriter
+from scraper import LinkedInScraper, env_flag, save_posts
+from seen_posts import SeenPosts
+from sessions import SessionStore
+
+def load_accounts(path=None):
+    """Read scraping accounts from a JSON list of {"email", "password", "name"} objects.
+
+    Without a file (LINKEDIN_ACCOUNTS_FILE), the single LINKEDIN_EMAIL/LINKEDIN_PASSWORD
+    account is used. Raises ValueError if the file lists no accounts.
+    """
+    load_dotenv()
+    path = path or os.getenv('LINKEDIN_ACCOUNTS_FILE')
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            accounts = json.load(f)
+        if not accounts:
+            raise ValueError(f"No accounts in {path}")
+    else:
+        accounts = [{'email': os.getenv('LINKEDIN_EMAIL'), 'password': os.getenv('LINKEDIN_PASSWORD')}]
+    for index, account in enumerate(accounts):
+        account.setdefault('name', account.get('email') or f"account{index}")
+    return accounts
+
+def account_slug(account):
+    """File-name-safe label for an account."""
+    return re.sub(r'[^A-Za-z0-9]+', '_', account['name']).strip('_').lower()
+
+class WorkerStats:
+    """Throughput of one scraping worker."""
+
+    def __init__(self, worker, account):
+        self.worker = worker
+        self.account = account
+        self.posts = 0
+        self.unique_posts = 0
+        self.elapsed = 0.0
+        self.login_method = None
+        self.progress = {}
+        self.timings = {}
+        self.error = None
+
+    @property
+    def posts_per_second(self):
+        return self.posts / self.elapsed if self.elapsed else 0.0
+
+    def to_dict(self):
+        return {
+            'worker': self.worker,
+            'account': self.account,
+            'posts': self.posts,
+            'unique_posts': self.unique_posts,
+            'elapsed': round(self.elapsed, 3),
+            'posts_per_second': round(self.posts_per_second, 2),
+            'login_method': self.login_method,
+            'timings': self.timings,
+            'error': self.error
+        }
+
+class ScrapeCoordinator:
+    """Scrape several accounts' feeds with parallel headless browsers and merge the results.
+
+    Each account gets its own LinkedInScraper (and seen-posts file); at most
+    `workers` of them run at once. Posts are merged as they arrive and
+    deduplicated by post_id. The coordinator has the scraper's scrape_feed /
+    iter_feed / save_data / close interface, so AnalysisPipeline can use it as
+    scraper_factory.
+    driver_factory, if given, is called with the account dict to create its driver.
+    """
+
+    def __init__(self, accounts=None, workers=None, driver_factory=None, scraper_factory=LinkedInScraper,
+                 headless=None, seen_dir='data'):
+        self.accounts = accounts if accounts is not None else load_accounts()
+        if not self.accounts:
+            raise ValueError("ScrapeCoordinator needs at least one account")
+        self.workers = workers or int(os.getenv('SCRAPER_WORKERS', len(self.accounts)))
+        self.driver_factory = driver_factory
+        self.scraper_factory = scraper_factory
+        self.headless = env_flag('SCRAPER_HEADLESS', default=True) if headless is None else headless
+        self.seen_dir = seen_dir
+        # Shared by the workers; each account has its own session file
+        self.session_store = SessionStore(os.path.join(seen_dir, 'sessions'))
+        self.stats = []
+
+    def scrape_feed(self, num_posts=200):
+        """Scrape every account, splitting num_posts between them, and return the merged posts."""
+        return list(self.iter_feed(num_posts))
+
+    def iter_feed(self, num_posts=200, on_progress=None):
+        """Yield unique posts from all workers as they arrive, up to num_posts in total.
+
+        on_progress receives the workers' summed counts (see LinkedInScraper.iter_feed).
+        Workers don't record their posts as seen; once they have finished, the
+        posts taken from each account (emitted, or already emitted from another
+        account) are recorded in its seen-posts file. Posts dropped over quota
+        or after the stop are found again next run. If every worker fails
+        before any post arrives (e.g. no account can sign in), raises
+        RuntimeError with their errors.
+        """
+        quota = -(-num_posts // len(self.accounts))
+        self.stats = [WorkerStats(index, account['name']) for index, account in enumerate(self.accounts)]
+        arrivals = queue.Queue()
+        stop = threading.Event()
+        seen = set()
+        taken = [[] for _ in self.accounts]
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, min(self.workers, len(self.accounts)))) as executor:
+                for index in range(len(self.accounts)):
+                    executor.submit(self._scrape_account, index, quota, arrivals, stop, on_progress)
+                try:
+                    running = len(self.accounts)
+                    while running:
+                        item = arrivals.get()
+                        if item is None:
+                            running -= 1
+                            continue
+                        index, post = item
+                        if post['post_id'] in seen:
+                            taken[index].append(post['post_id'])
+                            continue
+                        if len(seen) >= num_posts:
+                            continue
+                        seen.add(post['post_id'])
+                        self.stats[index].unique_posts += 1
+                        if len(seen) >= num_posts:
+                            stop.set()
+                        yield post
+                        # The consumer asked for the next post, so this one was kept
+                        taken[index].append(post['post_id'])
+                finally:
+                    # Also reached when the consumer stops early: workers finish their current pass and exit
+                    stop.set()
+            if not seen and all(stats.error for stats in self.stats):
+                raise RuntimeError("Every account failed: " + '; '.join(
+                    f"{stats.account}: {stats.error}" for stats in self.stats
+                ))
+        finally:
+            self._record_seen(taken)
+
+    def _record_seen(self, taken):
+        """Record each account's taken post IDs in its seen-posts file."""
+        for account, post_ids in zip(self.accounts, taken):
+            if not post_ids:
+                continue
+            seen_posts = SeenPosts(self._seen_path(account))
+            try:
+                seen_posts.add_many(post_ids)
+            finally:
+                seen_posts.close()
+
+    def _scrape_account(self, index, quota, arrivals, stop, on_progress=None):
+        """Run one account's scrape, passing its posts on as they arrive; errors are recorded, not raised."""
+        account, stats = self.accounts[index], self.stats[index]
+        start = time.perf_counter()
+        scraper = feed = None
+        try:
+            scraper = self._make_scraper(account)
+            report = lambda counts: self._progress(stats, counts, on_progress)
+            # The coordinator records the posts it keeps once the workers are done
+            feed = scraper.iter_feed(num_posts=quota, on_progress=report, record_seen=False)
+            for post in feed:
+                if stop.is_set():
+                    break
+                stats.posts += 1
+                arrivals.put((index, post))
+            stats.timings = scraper.timings.report()
+            stats.login_method = scraper.login_method
+        except Exception as e:
+            stats.error = str(e)
+            print(f"Worker {index} ({account['name']}) failed: {str(e)}")
+        finally:
+            if feed:
+                feed.close()
+            if scraper:
+                scraper.close()
+            stats.elapsed = time.perf_counter() - start
+            arrivals.put(None)
+
+    def _progress(self, stats, counts, on_progress):
+        """Record one worker's counts and report the totals across workers."""
+        stats.progress = counts
+        if on_progress:
+            totals = {}
+            for worker in self.stats:
+                for name, value in worker.progress.items():
+                    totals[name] = totals.get(name, 0) + value
+            on_progress(totals)
+
+    def _seen_path(self, account):
+        return os.path.join(self.seen_dir, f"seen_posts_{account_slug(account)}.db")
+
+    def _make_scraper(self, account):
+        """Create the scraper for one account, with its own driver and seen-posts file."""
+        driver_factory = None
+        if self.driver_factory:
+            driver_factory = lambda: self.driver_factory(account)
+        return self.scraper_factory(
+            driver_factory=driver_factory,
+            seen_path=self._seen_path(account),
+            email=account.get('email'),
+            password=account.get('password'),
+            headless=self.headless,
+            session_store=self.session_store
+        )
+
+    def report(self):
+        """Per-worker throughput metrics of the last scrape."""
+        return [stats.to_dict() for stats in self.stats]
+
+    def save_data(self, data, filename=None):
+        """Save the merged posts to a JSON file."""
+        return save_posts(data, filename)
+
+    def close(self):
+        """Workers close their browsers as they finish; nothing is left open."""
+
+def main():
+    coordinator = ScrapeCoordinator()
+    try:
+        print(f"Scraping {len(coordinator.accounts)} accounts with {coordinator.workers} workers...")
+        with FeedWriter(compress=env_flag('FEED_COMPRESS')) as writer:
+            for post in coordinator.iter_feed(num_posts=200):
+                writer.write(post)
+        print(f"Successfully scraped {writer.count} unique posts into {writer.filename}")
+        for stats in coordinator.report():
+            print(f"- worker {stats['worker']} ({stats['account']}): {stats['posts']} posts, "
+                  f"{stats['unique_posts']} unique, {stats['posts_per_second']:.2f} posts/s"
+                  + (f", error: {stats['error']}" if stats['error'] else ""))
+    except Exception as e:
+        print(f"An error occurred: {str(e)}")
+    finally:
+        coordinator.close()
+
+if __name__ == "__main__":
+    main()
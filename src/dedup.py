@@ -0,0 +1,174 @@
+import re
+import zlib
+from collections import defaultdict
+import numpy as np
+
+WORD_PATTERN = re.compile(r"\w+")
+MERSENNE_PRIME = (1 << 31) - 1
+# Bound parameters per IN (...) query, well under SQLite's limit
+QUERY_CHUNK = 500
+
+class NearDuplicateIndex:
+    """MinHash/LSH index of near-duplicate post clusters, kept next to the post store.
+
+    Each post's word shingles are MinHashed into num_perm values, split into
+    bands. A post that shares a band with a cluster's first post is a candidate,
+    and joins the most similar candidate whose estimated Jaccard similarity is
+    at least threshold; otherwise it starts a new cluster. Bands are looked up
+    through an indexed bucket table, so matching new posts never scans the
+    archive.
+    """
+
+    def __init__(self, conn, num_perm=64, bands=16, threshold=0.6, shingle_size=3, seed=17):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.conn = conn
+        self.num_perm = num_perm
+        self.bands = bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        # Fixed seed: stored signatures are only comparable under the same permutations
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+        self.b = rng.integers(0, MERSENNE_PRIME, size=(num_perm, 1), dtype=np.uint64)
+        self.word_hashes = {}
+        self._create_tables()
+
+    def _create_tables(self):
+        """Create the cluster signature and LSH bucket tables."""
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS minhash_clusters (
+                    cluster_id INTEGER PRIMARY KEY,
+                    signature BLOB
+                )
+            """)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS lsh_buckets (
+                    bucket INTEGER NOT NULL,
+                    cluster_id INTEGER NOT NULL,
+                    PRIMARY KEY (bucket, cluster_id)
+                ) WITHOUT ROWID
+            """)
+
+    def shingles(self, text):
+        """Stable 31-bit hashes of the text's lowercase word n-grams (the whole text if shorter)."""
+        words = WORD_PATTERN.findall(text.lower())
+        if not words:
+            return np.zeros(0, dtype=np.uint64)
+        hashes = []
+        for word in words:
+            value = self.word_hashes.get(word)
+            if value is None:
+                value = self.word_hashes[word] = zlib.crc32(word.encode('utf-8'))
+            hashes.append(value)
+        hashes = np.array(hashes, dtype=np.uint64)
+        size = min(self.shingle_size, len(hashes))
+        combined = hashes[:len(hashes) - size + 1].copy()
+        for offset in range(1, size):
+            combined = combined * np.uint64(1000003) + hashes[offset:len(hashes) - size + 1 + offset]
+        return np.unique(combined % np.uint64(MERSENNE_PRIME))
+
+    def signatures(self, texts, chunk_shingles=50000):
+        """MinHash signatures (len(texts) x num_perm) and a mask of the texts that had any words."""
+        shingles = [self.shingles(text) for text in texts]
+        has_words = np.array([len(values) > 0 for values in shingles], dtype=bool)
+        signatures = np.zeros((len(texts), self.num_perm), dtype=np.uint32)
+        rows = np.flatnonzero(has_words)
+
+        # Hash a chunk of posts at a time to bound the (num_perm x shingles) work array
+        start = 0
+        while start < len(rows):
+            end, total = start, 0
+            while end < len(rows) and (end == start or total + len(shingles[rows[end]]) <= chunk_shingles):
+                total += len(shingles[rows[end]])
+                end += 1
+            chunk = [shingles[row] for row in rows[start:end]]
+            offsets = np.cumsum([0] + [len(values) for values in chunk[:-1]])
+            permuted = (self.a * np.concatenate(chunk) + self.b) % np.uint64(MERSENNE_PRIME)
+            signatures[rows[start:end]] = np.minimum.reduceat(permuted, offsets, axis=1).T
+            start = end
+        return signatures, has_words
+
+    def band_keys(self, signatures):
+        """One 64-bit bucket key per band of each signature."""
+        rows = self.num_perm // self.bands
+        banded = signatures.astype(np.uint64).reshape(len(signatures), self.bands, rows)
+        keys = np.broadcast_to(np.arange(self.bands, dtype=np.uint64), banded.shape[:2]).copy()
+        for row in range(rows):
+            keys = keys * np.uint64(0x100000001B3) + banded[:, :, row]
+        return keys.view(np.int64)
+
+    def match(self, texts):
+        """Assign each text to a cluster. Returns (cluster_ids, new_clusters).
+
+        new_clusters lists (cluster_id, signature, band keys) for the clusters
+        started by this batch; pass it to add() in the same transaction that
+        stores the posts.
+        """
+        if not texts:
+            return [], []
+        signatures, has_words = self.signatures(texts)
+        keys = self.band_keys(signatures)
+        buckets = self._buckets(np.unique(keys[has_words]).tolist())
+        known = self._signatures({cluster_id for members in buckets.values() for cluster_id in members})
+
+        next_id = self.conn.execute("SELECT COALESCE(MAX(cluster_id), 0) FROM minhash_clusters").fetchone()[0] + 1
+        cluster_ids, new_clusters = [], []
+        for signature, row_keys, indexed in zip(signatures, keys.tolist(), has_words):
+            best = None
+            if indexed:
+                candidates = {cluster_id for key in row_keys for cluster_id in buckets.get(key, ())}
+                best_similarity = self.threshold
+                for cluster_id in candidates:
+                    similarity = np.count_nonzero(known[cluster_id] == signature) / self.num_perm
+                    if similarity >= best_similarity:
+                        best, best_similarity = cluster_id, similarity
+
+            if best is None:
+                best, next_id = next_id, next_id + 1
+                new_clusters.append((best, signature if indexed else None, row_keys if indexed else []))
+                if indexed:
+                    known[best] = signature
+                    for key in row_keys:
+                        buckets[key].append(best)
+            cluster_ids.append(best)
+        return cluster_ids, new_clusters
+
+    def add(self, new_clusters):
+        """Index clusters returned by match(), without committing."""
+        self.conn.executemany(
+            "INSERT INTO minhash_clusters (cluster_id, signature) VALUES (?, ?)",
+            [(cluster_id, None if signature is None else signature.tobytes())
+             for cluster_id, signature, _ in new_clusters]
+        )
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO lsh_buckets (bucket, cluster_id) VALUES (?, ?)",
+            # Sorted by bucket, the inserts touch each index page once instead of at random
+            sorted((key, cluster_id) for cluster_id, _, keys in new_clusters for key in keys)
+        )
+
+    def cluster_count(self):
+        """Return the number of indexed clusters."""
+        return self.conn.execute("SELECT COUNT(*) FROM minhash_clusters").fetchone()[0]
+
+    def _buckets(self, keys):
+        """Map each bucket key to the indexed clusters in it."""
+        buckets = defaultdict(list)
+        for start in range(0, len(keys), QUERY_CHUNK):
+            chunk = keys[start:start + QUERY_CHUNK]
+            query = f"SELECT bucket, cluster_id FROM lsh_buckets WHERE bucket IN ({','.join('?' * len(chunk))})"
+            for key, cluster_id in self.conn.execute(query, chunk):
+                buckets[key].append(cluster_id)
+        return buckets
+
+    def _signatures(self, cluster_ids):
+        """Load the stored signatures of the given clusters."""
+        cluster_ids = list(cluster_ids)
+        signatures = {}
+        for start in range(0, len(cluster_ids), QUERY_CHUNK):
+            chunk = cluster_ids[start:start + QUERY_CHUNK]
+            query = f"SELECT cluster_id, signature FROM minhash_clusters WHERE cluster_id IN ({','.join('?' * len(chunk))})"
+            for cluster_id, blob in self.conn.execute(query, chunk):
+                signatures[cluster_id] = np.frombuffer(blob, dtype=np.uint32)
+        return signatures
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+
+ENGAGEMENT_METRICS = ('likes', 'comments', 'shares')
+PERCENTILES = (50, 90, 99)
+
+def top_k_indices(values, k):
+    """Indices of the k largest values, largest first, earliest first among ties (like nlargest)."""
+    k = min(k, len(values))
+    if k == 0:
+        return np.array([], dtype=np.intp)
+    threshold = values[np.argpartition(values, len(values) - k)[len(values) - k:]].min()
+    above = np.flatnonzero(values > threshold)
+    ties = np.flatnonzero(values == threshold)[:k - len(above)]
+    indices = np.concatenate([above, ties])
+    return indices[np.lexsort((indices, -values[indices]))]
+
+def bucket_engagement(buckets, totals, label=str):
+    """Post count and mean total engagement per time bucket, in bucket order."""
+    keys, inverse = np.unique(buckets, return_inverse=True)
+    posts = np.bincount(inverse, minlength=len(keys))
+    sums = np.bincount(inverse, weights=totals, minlength=len(keys))
+    return [
+        {'bucket': label(key), 'posts': int(count), 'average_total': float(total / count)}
+        for key, count, total in zip(keys, posts, sums)
+    ]
+
+def topic_engagement(mentions, totals, topics):
+    """Post count and mean total engagement of the posts mentioning each topic.
+
+    mentions is a sparse posts x topics matrix, non-zero where a post uses the topic.
+    """
+    mentions = (mentions > 0).astype(np.int64)
+    posts = np.asarray(mentions.sum(axis=0)).ravel()
+    sums = mentions.T @ totals
+    return {
+        topic: {
+            'posts': int(count),
+            'average_total': float(total / count) if count else 0.0
+        }
+        for topic, count, total in zip(topics, posts, sums)
+    }
+
+def analyze_engagement(posts, topics=None, topic_mentions=None, top_k=5):
+    """Engagement statistics computed with vectorized ops over the flat count columns.
+
+    posts is a PostColumns or a DataFrame with text, timestamp and count columns.
+    """
+    counts = np.column_stack([np.asarray(posts[name], dtype=np.int64) for name in ENGAGEMENT_METRICS])
+    totals = counts.sum(axis=1)
+
+    percentiles = {}
+    for name, values in zip(ENGAGEMENT_METRICS + ('total',), list(counts.T) + [totals]):
+        percentiles[name] = dict(zip((f"p{p}" for p in PERCENTILES), np.percentile(values, PERCENTILES).tolist()))
+
+    texts = posts['text']
+    timestamps = pd.DatetimeIndex(posts['timestamp'])
+    dated = ~timestamps.isna()
+    days = timestamps[dated].floor('D').to_numpy()
+    hours = timestamps[dated].hour.to_numpy()
+
+    return {
+        'average_engagement': dict(zip(ENGAGEMENT_METRICS, counts.mean(axis=0).tolist())),
+        'percentiles': percentiles,
+        'top_posts': [
+            {'text': texts[i], 'total_engagement': int(totals[i])}
+            for i in top_k_indices(totals, top_k)
+        ],
+        'by_day': bucket_engagement(days, totals[dated], label=lambda day: np.datetime_as_string(day, unit='D')),
+        'by_hour': bucket_engagement(hours, totals[dated], label=int),
+        'by_topic': topic_engagement(topic_mentions, totals, topics) if topics else {}
+    }
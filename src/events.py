@@ -0,0 +1,86 @@
+import json
+import threading
+from collections import deque
+
+class Subscription:
+    """One listener's bounded buffer of events; the oldest events are dropped when it is full."""
+
+    def __init__(self, bus, maxlen):
+        self.bus = bus
+        self.events = deque(maxlen=maxlen)
+        self.dropped = 0
+
+    def get(self, timeout=None):
+        """Wait up to timeout for events and return them all ([] on timeout or once the bus is closed and drained)."""
+        with self.bus.condition:
+            if not self.events and not self.bus.closed:
+                self.bus.condition.wait(timeout)
+            events = list(self.events)
+            self.events.clear()
+            return events
+
+    @property
+    def finished(self):
+        """True once the bus is closed and every event has been read."""
+        return self.bus.closed and not self.events
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+class EventBus:
+    """Non-blocking fan-out of progress events to any number of subscribers.
+
+    publish() never waits for a reader: each subscriber has a bounded deque, so
+    a slow reader loses its oldest events instead of holding up the publisher.
+    The most recent events are also kept so late subscribers can catch up.
+    """
+
+    def __init__(self, maxlen=256, history=64):
+        self.maxlen = maxlen
+        self.condition = threading.Condition()
+        self.subscribers = []
+        self.history = deque(maxlen=history)
+        self.next_id = 1
+        self.closed = False
+
+    def publish(self, event, data=None):
+        """Send an event to every subscriber."""
+        with self.condition:
+            if self.closed:
+                return
+            message = {'id': self.next_id, 'event': event, 'data': data}
+            self.next_id += 1
+            self.history.append(message)
+            for subscriber in self.subscribers:
+                if len(subscriber.events) == subscriber.events.maxlen:
+                    subscriber.dropped += 1
+                subscriber.events.append(message)
+            self.condition.notify_all()
+
+    def subscribe(self, last_event_id=None):
+        """Start listening; events after last_event_id (or the whole history) are delivered first."""
+        subscription = Subscription(self, self.maxlen)
+        with self.condition:
+            subscription.events.extend(
+                message for message in self.history
+                if last_event_id is None or message['id'] > last_event_id
+            )
+            self.subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.condition:
+            if subscription in self.subscribers:
+                self.subscribers.remove(subscription)
+
+    def close(self):
+        """Mark the stream finished and wake every subscriber."""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+def format_sse(message):
+    """Encode one event for a text/event-stream response (without an id line if its id is None)."""
+    data = json.dumps(message['data'], ensure_ascii=False)
+    event_id = f"id: {message['id']}\n" if message.get('id') is not None else ''
+    return f"{event_id}event: {message['event']}\ndata: {data}\n\n"
@@ -0,0 +1,155 @@
+import hashlib
+import importlib.util
+import json
+import re
+from datetime import datetime, timedelta
+from bs4 import BeautifulSoup, SoupStrainer
+
+POST_CLASS = "feed-shared-update-v2"
+DESCRIPTION_CLASS = "feed-shared-update-v2__description"
+REACTIONS_CLASS = "social-details-social-counts__reactions-count"
+# Holds the post's relative age, e.g. "3h • Edited • "
+AGE_CLASS = "update-components-actor__sub-description"
+# Set on post nodes once extracted, so later scroll passes only return newly loaded posts
+EXTRACTED_ATTRIBUTE = "data-lca-extracted"
+
+# lxml is much faster than the stdlib parser; fall back if it isn't installed
+HTML_PARSER = 'lxml' if importlib.util.find_spec('lxml') else 'html.parser'
+
+def _has_post_class(value):
+    """Match the post class whether the parser hands over a string or a list of classes."""
+    if value is None:
+        return False
+    classes = value.split() if isinstance(value, str) else value
+    return POST_CLASS in classes
+
+# Restricts parsing to post subtrees
+POST_STRAINER = SoupStrainer(class_=_has_post_class)
+
+# Pulls the raw fields of every not-yet-extracted post in a single WebDriver round-trip
+EXTRACT_POSTS_JS = f"""
+var posts = document.querySelectorAll('.{POST_CLASS}:not([{EXTRACTED_ATTRIBUTE}])');
+var result = [];
+for (var i = 0; i < posts.length; i++) {{
+    var description = posts[i].querySelector('.{DESCRIPTION_CLASS}');
+    var reactions = posts[i].querySelector('.{REACTIONS_CLASS}');
+    var age = posts[i].querySelector('.{AGE_CLASS}');
+    posts[i].setAttribute('{EXTRACTED_ATTRIBUTE}', '1');
+    result.push({{
+        urn: posts[i].getAttribute('data-urn'),
+        text: description ? description.textContent : '',
+        likes: reactions ? reactions.textContent : '',
+        age: age ? age.textContent : ''
+    }});
+}}
+return JSON.stringify(result);
+"""
+
+# A count as the feed shows it: "1,234", "1.2K", "1,2K" (decimal comma), "12 reactions"
+COUNT_PATTERN = re.compile(r'(\d[\d.,]*)\s*([KM])?', flags=re.IGNORECASE)
+
+def parse_count(text):
+    """Convert a reaction count such as '1,234' or '1.2K' to an integer; 0 if there is no number."""
+    match = COUNT_PATTERN.search(text or "")
+    if not match:
+        return 0
+    number, suffix = match.group(1).rstrip('.,'), (match.group(2) or '').upper()
+    # A comma is a thousands separator when followed by groups of three digits, else a decimal mark
+    if ',' in number and '.' not in number and not re.fullmatch(r'\d{1,3}(,\d{3})+', number):
+        number = number.replace(',', '.')
+    try:
+        value = float(number.replace(',', ''))
+    except ValueError:
+        return 0
+    return int(value * {'K': 1000, 'M': 1000000}.get(suffix, 1))
+
+# Relative ages as the feed shows them: "45s", "12m", "3h", "2d", "1w", "4mo", "1yr", or spelled out
+AGE_PATTERN = re.compile(
+    r'(\d+)\s*(mo|months?|yrs?|years?|y|w|wks?|weeks?|d|days?|h|hrs?|hours?|m|mins?|minutes?|s|secs?|seconds?)\b',
+    flags=re.IGNORECASE
+)
+AGE_UNITS = (
+    ('mo', timedelta(days=30)),
+    ('y', timedelta(days=365)),
+    ('w', timedelta(weeks=1)),
+    ('d', timedelta(days=1)),
+    ('h', timedelta(hours=1)),
+    ('m', timedelta(minutes=1)),
+    ('s', timedelta(seconds=1)),
+)
+
+def parse_post_age(text, now):
+    """Estimate when a post was published from its relative age, or return None if there is none."""
+    text = (text or "").strip()
+    if text.lower().startswith('now') or 'just now' in text.lower():
+        return now
+    match = AGE_PATTERN.search(text)
+    if not match:
+        return None
+    unit = match.group(2).lower()
+    for prefix, size in AGE_UNITS:
+        if unit.startswith(prefix):
+            return now - int(match.group(1)) * size
+
+def post_identity(urn, text):
+    """Return a stable post ID: the activity URN, or a content hash when there is none."""
+    if urn:
+        return urn
+    return "sha1:" + hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+def build_post(raw, scraped_at=None):
+    """Turn raw extracted fields into the scraper's post record.
+
+    timestamp is the estimated publication time; it falls back to the scrape
+    time when the post shows no age.
+    """
+    text = (raw.get('text') or "").strip()
+    scraped_at = scraped_at or datetime.now()
+    posted_at = parse_post_age(raw.get('age'), scraped_at) or scraped_at
+    return {
+        'post_id': post_identity(raw.get('urn'), text),
+        'text': text,
+        'engagement': {
+            'likes': parse_count(raw.get('likes')),
+            'comments': 0,
+            'shares': 0
+        },
+        'timestamp': posted_at.isoformat(),
+        'scraped_at': scraped_at.isoformat()
+    }
+
+def raw_fields(post_tag):
+    """Read the raw fields from a parsed post element."""
+    description = post_tag.find('div', {'class': DESCRIPTION_CLASS})
+    reactions = post_tag.find('span', {'class': REACTIONS_CLASS})
+    age = post_tag.find('span', {'class': AGE_CLASS})
+    return {
+        'urn': post_tag.get('data-urn'),
+        'text': description.get_text() if description else "",
+        'likes': reactions.get_text() if reactions else "",
+        'age': age.get_text() if age else ""
+    }
+
+def build_posts(raws, scraped_at=None):
+    """Build a post record from each set of raw fields, skipping (and logging) any that fail.
+
+    Extracted nodes are marked and never returned again, so one bad post must
+    not cost the rest of its pass.
+    """
+    scraped_at = scraped_at or datetime.now()
+    posts = []
+    for raw in raws:
+        try:
+            posts.append(build_post(raw, scraped_at))
+        except Exception as e:
+            print(f"Skipping post {raw.get('urn') if isinstance(raw, dict) else raw!r}: {str(e)}")
+    return posts
+
+def parse_posts_json(payload):
+    """Build post records from the JSON returned by EXTRACT_POSTS_JS."""
+    return build_posts(json.loads(payload))
+
+def extract_posts_from_html(html):
+    """Extract every post from saved feed HTML, parsing only the post subtrees."""
+    soup = BeautifulSoup(html, HTML_PARSER, parse_only=POST_STRAINER)
+    return build_posts(raw_fields(post) for post in soup.find_all(class_=POST_CLASS))
@@ -0,0 +1,125 @@
+import gzip
+import json
+import logging
+import os
+import zlib
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+# Raw feed files the analyzer reads: legacy JSON arrays and (optionally gzipped) NDJSON
+FEED_FILE_PATTERNS = ('*.json', '*.ndjson', '*.ndjson.gz')
+
+def feed_filename(compress=False, data_dir='data/raw'):
+    """Return a new timestamped NDJSON file name under data_dir."""
+    suffix = '.ndjson.gz' if compress else '.ndjson'
+    return os.path.join(data_dir, f"linkedin_feed_{datetime.now().strftime('%Y%m%d_%H%M%S')}{suffix}")
+
+def is_ndjson(path):
+    return path.endswith('.ndjson') or path.endswith('.ndjson.gz')
+
+def _open_binary(path, mode):
+    return gzip.open(path, mode) if path.endswith('.gz') else open(path, mode)
+
+def _unused_filename(path):
+    """path, or, if it already exists, path with a _1, _2, ... suffix before .ndjson.gz."""
+    base = path[:-len('.ndjson.gz')]
+    count = 0
+    while os.path.exists(path):
+        count += 1
+        path = f"{base}_{count}.ndjson.gz"
+    return path
+
+class FeedWriter:
+    """Appends posts to an NDJSON file one line at a time, flushing after each post.
+
+    A crash loses at most the line being written. offset is the number of
+    (uncompressed) bytes written so far, i.e. where a reader can resume, and
+    size the file's size on disk at that point.
+
+    Existing gzip files are never appended to: a crash can leave them cut off
+    mid-stream, and nothing after that point can be read. The writer starts a
+    new file next to it instead (see filename); readers resume the old one from
+    the manifest's read offset.
+    """
+
+    def __init__(self, filename=None, compress=False):
+        self.filename = filename or feed_filename(compress)
+        if self.filename.endswith('.ndjson.gz'):
+            self.filename = _unused_filename(self.filename)
+        os.makedirs(os.path.dirname(self.filename) or '.', exist_ok=True)
+        self.offset = os.path.getsize(self.filename) if os.path.exists(self.filename) else 0
+        self.file = _open_binary(self.filename, 'ab')
+        if self.offset and not self._ends_with_newline():
+            # Terminate a line cut short by a crash; readers skip it as malformed
+            self.file.write(b'\n')
+            self.file.flush()
+            self.offset += 1
+        self.size = os.path.getsize(self.filename)
+        self.count = 0
+
+    def _ends_with_newline(self):
+        """Whether the existing (uncompressed, since gzip files are never reopened) file ends with a complete line."""
+        with open(self.filename, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    def write(self, post):
+        """Append one post and flush it to disk."""
+        line = (json.dumps(post, ensure_ascii=False) + '\n').encode('utf-8')
+        self.file.write(line)
+        self.file.flush()
+        self.offset += len(line)
+        self.size = os.path.getsize(self.filename)
+        self.count += 1
+
+    def write_many(self, posts):
+        for post in posts:
+            self.write(post)
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def iter_records(path, offset=0):
+    """Yield (post, end offset) for each post in a feed file, starting at offset.
+
+    NDJSON is read line by line, so memory stays flat; a trailing line without a
+    newline (a write cut short) is left for a later read. Legacy .json arrays are
+    loaded whole and yield an offset of None.
+    """
+    if not is_ndjson(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            for post in json.load(f):
+                yield post, None
+        return
+
+    with _open_binary(path, 'rb') as f:
+        try:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                offset += len(line)
+                if not line.strip():
+                    continue
+                try:
+                    post = json.loads(line)
+                except ValueError:
+                    logger.warning(f"Skipping a malformed line in {path} ending at offset {offset}")
+                    continue
+                yield post, offset
+        except (EOFError, zlib.error, OSError):
+            # A gzip stream that is still being written has no trailer yet, and one cut
+            # off by a crash can't be read past the damage; either way, stop there
+            return
+
+def iter_posts(path):
+    """Yield the posts of a feed file, whatever its format."""
+    for post, _ in iter_records(path):
+        yield post
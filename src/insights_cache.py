@@ -0,0 +1,51 @@
+import gzip
+import hashlib
+import threading
+
+class CachedInsights:
+    """Serialized response body for one insights run, plus its gzip form and a strong ETag for each.
+
+    The two bodies differ byte for byte, so they can't share a strong validator.
+    """
+
+    def __init__(self, run_id, body):
+        self.run_id = run_id
+        self.body = body
+        self.gzip_body = gzip.compress(body)
+        self.etag = hashlib.sha1(body).hexdigest()
+        self.gzip_etag = self.etag + '-gzip'
+
+class InsightsCache:
+    """In-memory cache of the latest insights response, keyed on the latest run in the insights history.
+
+    The history is opened on first use, so importing the app has no side effects on data/.
+    """
+
+    def __init__(self, history_factory):
+        self.history_factory = history_factory
+        self.history = None
+        self.lock = threading.Lock()
+        self.entry = None
+
+    def get(self):
+        """Return the CachedInsights for the newest insights run, or None if there is none."""
+        if self.history is None:
+            with self.lock:
+                if self.history is None:
+                    self.history = self.history_factory()
+
+        latest = self.history.latest_run()
+        entry = self.entry
+        if latest is not None and entry is not None and entry.run_id == latest[0]:
+            return entry
+
+        with self.lock:
+            latest = self.history.latest_json()
+            if latest is None:
+                self.entry = None
+            elif self.entry is None or self.entry.run_id != latest[0]:
+                run_id, payload = latest
+                # The stored payload is already JSON, so it is embedded without a parse/dump round trip
+                body = ('{"success":true,"data":' + payload + '}').encode('utf-8')
+                self.entry = CachedInsights(run_id, body)
+            return self.entry
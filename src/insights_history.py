@@ -0,0 +1,187 @@
+import argparse
+import glob
+import json
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+
+# Per-run JSON files written before the history existed, by kind
+LEGACY_PATTERNS = {
+    'insights': 'analysis_insights_*.json',
+    'suggestions': 'content_suggestions_*.json',
+}
+LEGACY_TIMESTAMP = re.compile(r'_(\d{8}_\d{6})\.json$')
+
+def legacy_run_at(path):
+    """Run time of a per-run JSON file: the timestamp in its name, or its modification time."""
+    match = LEGACY_TIMESTAMP.search(path)
+    if match:
+        try:
+            return datetime.strptime(match.group(1), '%Y%m%d_%H%M%S').isoformat()
+        except ValueError:
+            pass
+    return datetime.fromtimestamp(os.path.getmtime(path)).isoformat()
+
+class InsightsHistory:
+    """Append-only SQLite history of analysis insights and content suggestions, one row per run.
+
+    Runs are indexed on (kind, run_at), so the latest run is a single index
+    seek however long the history grows. Each insights run's top topic scores
+    are also stored one row per topic, keyed on (topic, run_id), so a topic's
+    score across runs is one range scan instead of a file per run.
+    """
+
+    def __init__(self, data_dir='data', db_name='insights_history.db'):
+        self.data_dir = data_dir
+        self.db_path = os.path.join(data_dir, db_name)
+        os.makedirs(data_dir, exist_ok=True)
+        created = not os.path.exists(self.db_path)
+        # Read by the app's request threads while the job worker appends runs
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.lock = threading.Lock()
+        self._create_tables()
+        if created:
+            imported = self.import_files()
+            if imported:
+                print(f"Imported {imported} insights/suggestions files into {self.db_path}")
+
+    def _create_tables(self):
+        """Create the run and topic score tables if they don't exist yet."""
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    run_at TEXT NOT NULL,
+                    source TEXT UNIQUE,
+                    payload TEXT NOT NULL
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS runs_kind_time ON runs (kind, run_at)")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS topic_scores (
+                    topic TEXT NOT NULL,
+                    run_id INTEGER NOT NULL,
+                    rank INTEGER NOT NULL,
+                    score REAL NOT NULL,
+                    PRIMARY KEY (topic, run_id)
+                ) WITHOUT ROWID
+            """)
+
+    def _insert(self, kind, payload, run_at, source=None):
+        """Insert one run without committing; returns its id, or None if source was already imported."""
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO runs (kind, run_at, source, payload) VALUES (?, ?, ?, ?)",
+            (kind, run_at, source, json.dumps(payload, ensure_ascii=False, separators=(',', ':')))
+        )
+        if not cursor.rowcount:
+            return None
+        run_id = cursor.lastrowid
+        if kind == 'insights':
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO topic_scores (topic, run_id, rank, score) VALUES (?, ?, ?, ?)",
+                [(topic, run_id, rank, float(score))
+                 for rank, (topic, score) in enumerate(payload.get('top_topics', []), start=1)]
+            )
+        return run_id
+
+    def record(self, payload, kind='insights', run_at=None):
+        """Append one run's insights (or suggestions, with kind='suggestions'); returns the run id."""
+        run_at = run_at or datetime.now().isoformat()
+        with self.lock, self.conn:
+            return self._insert(kind, payload, run_at)
+
+    def latest_run(self, kind='insights'):
+        """(run_id, run_at) of the newest run of a kind, or None if there is none."""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT id, run_at FROM runs WHERE kind = ? ORDER BY run_at DESC, id DESC LIMIT 1", (kind,)
+            ).fetchone()
+
+    def latest_json(self, kind='insights'):
+        """(run_id, payload as JSON text) of the newest run of a kind, or None if there is none."""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT id, payload FROM runs WHERE kind = ? ORDER BY run_at DESC, id DESC LIMIT 1", (kind,)
+            ).fetchone()
+
+    def latest(self, kind='insights'):
+        """The newest run's insights (or suggestions), or None if there is none."""
+        latest = self.latest_json(kind)
+        return json.loads(latest[1]) if latest else None
+
+    def topic_history(self, topic, runs=10):
+        """A topic's rank and score in each of the last runs insights runs, oldest first.
+
+        Returns [{'run_id', 'run_at', 'rank', 'score'}, ...]; rank and score
+        are None for runs where the topic wasn't among the top topics.
+        """
+        with self.lock:
+            rows = self.conn.execute("""
+                SELECT r.id, r.run_at, t.rank, t.score
+                FROM (
+                    SELECT id, run_at FROM runs WHERE kind = 'insights'
+                    ORDER BY run_at DESC, id DESC LIMIT ?
+                ) r
+                LEFT JOIN topic_scores t ON t.topic = ? AND t.run_id = r.id
+                ORDER BY r.run_at, r.id
+            """, (runs, topic)).fetchall()
+        return [
+            {'run_id': run_id, 'run_at': run_at, 'rank': rank, 'score': score}
+            for run_id, run_at, rank, score in rows
+        ]
+
+    def run_count(self, kind='insights'):
+        """Number of recorded runs of a kind."""
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM runs WHERE kind = ?", (kind,)).fetchone()[0]
+
+    def import_files(self, data_dir=None):
+        """Import per-run insights and suggestions JSON files (one-off migration); returns the number imported.
+
+        Files are keyed on their name, so importing the same directory again
+        skips those already in the history.
+        """
+        data_dir = data_dir or self.data_dir
+        imported = 0
+        with self.lock, self.conn:
+            for kind, pattern in LEGACY_PATTERNS.items():
+                for path in sorted(glob.glob(os.path.join(data_dir, pattern))):
+                    try:
+                        with open(path, 'r', encoding='utf-8') as f:
+                            payload = json.load(f)
+                    except (OSError, ValueError) as e:
+                        print(f"Skipping {path}: {str(e)}")
+                        continue
+                    if self._insert(kind, payload, legacy_run_at(path), source=os.path.basename(path)) is not None:
+                        imported += 1
+        return imported
+
+    def close(self):
+        self.conn.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Import per-run insights JSON files into the insights history.")
+    parser.add_argument('data_dir', nargs='?', default='data', help="directory holding the JSON files and the history")
+    parser.add_argument('--topic', help="also print this topic's score over the latest runs")
+    parser.add_argument('--runs', type=int, default=10, help="number of runs shown for --topic")
+    args = parser.parse_args()
+
+    history = InsightsHistory(args.data_dir)
+    try:
+        print(f"Imported {history.import_files()} new files")
+        print(f"History: {history.run_count('insights')} insights runs, "
+              f"{history.run_count('suggestions')} suggestion runs in {history.db_path}")
+        if args.topic:
+            print(f"\n{args.topic}:")
+            for run in history.topic_history(args.topic, args.runs):
+                score = '-' if run['score'] is None else f"{run['score']:.3f} (#{run['rank']})"
+                print(f"- {run['run_at']}: {score}")
+    finally:
+        history.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from events import EventBus
+from metrics import metrics, profiled
+
+logger = logging.getLogger(__name__)
+
+class JobQueueFullError(Exception):
+    """Raised when too many jobs are already waiting to run."""
+
+class Job:
+    """One pipeline run and its stage-by-stage progress."""
+
+    def __init__(self, key, stage_names):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.status = 'queued'
+        self.stages = [{'name': name, 'status': 'pending'} for name in stage_names]
+        self.result = None
+        self.error = None
+        self.created_at = datetime.now().isoformat()
+        self.finished_at = None
+        # Live progress for /jobs/<id>/events; closed when the job finishes
+        self.events = EventBus()
+        self.finished = threading.Event()
+
+    @property
+    def done(self):
+        return self.status in ('succeeded', 'failed')
+
+    def wait(self, timeout=None):
+        """Block until the job has finished; returns False if timeout passed first."""
+        return self.finished.wait(timeout)
+
+    def to_dict(self):
+        """Serialize the job for the API."""
+        return {
+            'id': self.id,
+            'status': self.status,
+            'stages': [dict(stage) for stage in self.stages],
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at
+        }
+
+class JobQueue:
+    """Runs pipeline jobs on a bounded worker pool, coalescing duplicate in-flight requests.
+
+    Each stage is a (name, callable) pair; the callable receives a context dict
+    shared by the job's stages, and the job's result is context['result'].
+    context['events'] is the job's EventBus, for stages that report progress.
+    """
+
+    def __init__(self, stages, max_workers=1, max_queued=10, max_finished=100):
+        self.stages = stages
+        self.max_queued = max_queued
+        self.max_finished = max_finished
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='analysis-job')
+        self.lock = threading.Lock()
+        self.jobs = OrderedDict()
+        self.in_flight = {}
+
+    def submit(self, key='analysis'):
+        """Start a job for key, or return the one already in flight. Returns (job, created)."""
+        with self.lock:
+            existing = self.in_flight.get(key)
+            if existing:
+                return existing, False
+
+            queued = sum(1 for job in self.in_flight.values() if job.status == 'queued')
+            if queued >= self.max_queued:
+                raise JobQueueFullError("Too many analysis jobs are waiting; try again later")
+
+            job = Job(key, [name for name, _ in self.stages])
+            self.jobs[job.id] = job
+            self.in_flight[key] = job
+            self._prune()
+
+        self.executor.submit(self._run, job)
+        return job, True
+
+    def get(self, job_id):
+        """Return the job with this ID, or None."""
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def shutdown(self, wait=True):
+        """Stop accepting jobs and optionally wait for running ones."""
+        self.executor.shutdown(wait=wait)
+
+    def _run(self, job):
+        """Run every stage of a job in order, recording progress as it goes."""
+        context = {'events': job.events}
+        job.status = 'running'
+        try:
+            # With PROFILE_DIR set, each job's stages are profiled into their own .prof file
+            with profiled(f"job_{job.id}"):
+                for stage, (_, func) in zip(job.stages, self.stages):
+                    stage['status'] = 'running'
+                    stage['started_at'] = datetime.now().isoformat()
+                    job.events.publish('stage', {'name': stage['name'], 'status': 'running'})
+                    with metrics.span(f"stage_{stage['name']}"):
+                        func(context)
+                    stage['status'] = 'done'
+                    stage['finished_at'] = datetime.now().isoformat()
+                    job.events.publish('stage', {'name': stage['name'], 'status': 'done'})
+            job.result = context.get('result')
+            job.status = 'succeeded'
+        except Exception as e:
+            for stage in job.stages:
+                if stage['status'] == 'running':
+                    stage['status'] = 'failed'
+                    job.events.publish('stage', {'name': stage['name'], 'status': 'failed'})
+            job.error = str(e)
+            job.status = 'failed'
+            logger.error(f"Analysis job {job.id} failed: {str(e)}")
+        finally:
+            job.finished_at = datetime.now().isoformat()
+            with self.lock:
+                if self.in_flight.get(job.key) is job:
+                    del self.in_flight[job.key]
+            job.events.publish('done', job.to_dict())
+            job.events.close()
+            job.finished.set()
+
+    def _prune(self):
+        """Forget the oldest finished jobs beyond max_finished."""
+        finished = [job_id for job_id, job in self.jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self.jobs[job_id]
@@ -0,0 +1,142 @@
+import cProfile
+import functools
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+PREFIX = 'linkedin_analyzer'
+COUNTER_HELP = {
+    'posts_scraped': "New posts seen by the scraper.",
+    'ads_filtered': "Scraped posts dropped as advertisements.",
+    'posts_ingested': "Posts added to the archive.",
+    'duplicates_collapsed': "Ingested posts that joined an existing near-duplicate cluster.",
+    'token_cache_hits': "Distinct texts whose nouns came from the token cache.",
+    'token_cache_misses': "Distinct texts that had to be POS-tagged.",
+}
+# Shared by every disabled span, so a disabled span allocates nothing
+NULL_SPAN = nullcontext()
+
+class Span:
+    """Times one block and records it under its name when the block exits."""
+
+    __slots__ = ('metrics', 'name', 'start')
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+
+class Metrics:
+    """Process-wide span timings and counters, rendered in Prometheus text format.
+
+    When disabled, span() returns a shared no-op context and increment() and
+    observe() return immediately, so instrumented code pays one attribute check.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.spans = {}
+        self.counters = {}
+
+    def span(self, name):
+        """Context manager timing a block as the named span."""
+        return Span(self, name) if self.enabled else NULL_SPAN
+
+    def timed(self, name):
+        """Decorator timing every call of a function as the named span."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with Span(self, name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def observe(self, name, seconds):
+        """Record one completed span of the given duration."""
+        if not self.enabled:
+            return
+        with self.lock:
+            count, total = self.spans.get(name, (0, 0.0))
+            self.spans[name] = (count + 1, total + seconds)
+
+    def increment(self, name, value=1):
+        """Add value to a counter."""
+        if not self.enabled or not value:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def snapshot(self):
+        """Return {'spans': {name: {'count', 'seconds'}}, 'counters': {name: value}}."""
+        with self.lock:
+            return {
+                'spans': {name: {'count': count, 'seconds': total} for name, (count, total) in self.spans.items()},
+                'counters': dict(self.counters)
+            }
+
+    def render(self):
+        """The current metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {PREFIX}_span_seconds Time spent in instrumented spans.",
+            f"# TYPE {PREFIX}_span_seconds summary",
+        ]
+        for name, span in sorted(snapshot['spans'].items()):
+            lines.append(f'{PREFIX}_span_seconds_count{{span="{name}"}} {span["count"]}')
+            lines.append(f'{PREFIX}_span_seconds_sum{{span="{name}"}} {span["seconds"]:.6f}')
+        # Known counters are always exported, so they read 0 rather than missing before first use
+        counters = {**dict.fromkeys(COUNTER_HELP, 0), **snapshot['counters']}
+        for name, value in sorted(counters.items()):
+            metric = f"{PREFIX}_{name}_total"
+            if name in COUNTER_HELP:
+                lines.append(f"# HELP {metric} {COUNTER_HELP[name]}")
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        """Forget every recorded span and counter."""
+        with self.lock:
+            self.spans.clear()
+            self.counters.clear()
+
+def env_enabled():
+    """Metrics are on unless METRICS_ENABLED is set to a false value."""
+    return os.getenv('METRICS_ENABLED', '1').strip().lower() in ('1', 'true', 'yes', 'on')
+
+metrics = Metrics(enabled=env_enabled())
+
+@contextmanager
+def profiled(label, profile_dir=None):
+    """Run the block under cProfile and dump its stats to profile_dir (PROFILE_DIR), if set.
+
+    cProfile only sees the calling thread; work handed to other threads or
+    processes shows up as time spent waiting for them.
+    """
+    profile_dir = profile_dir or os.getenv('PROFILE_DIR')
+    if not profile_dir:
+        yield None
+        return
+
+    os.makedirs(profile_dir, exist_ok=True)
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield profile
+    finally:
+        profile.disable()
+        filename = os.path.join(profile_dir, f"{label}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.prof")
+        profile.dump_stats(filename)
+        print(f"Profile written to {filename}")
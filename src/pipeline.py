@@ -0,0 +1,131 @@
+import os
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from analyzer import LinkedInAnalyzer
+from feed_files import FeedWriter
+from metrics import profiled
+from scraper import LinkedInScraper, env_flag
+from suggestions import ContentSuggestions
+
+class AnalysisPipeline:
+    """Scrape, analyze and suggest in-process, keeping the NLP stack warm between runs.
+
+    The analyzer (stopwords, tagger, token cache, post store) and the suggestion
+    generator are created once; each run gets a fresh scraper and browser.
+    Scraped posts are appended to an NDJSON file and ingested by a second
+    thread while the scrape is still running. Stages exchange data through a
+    context dict.
+    """
+
+    def __init__(self, scraper_factory=LinkedInScraper, analyzer_factory=LinkedInAnalyzer, num_posts=200,
+                 compress=None, ingest_batch=50, topic_interval=2.0):
+        self.scraper_factory = scraper_factory
+        self.analyzer_factory = analyzer_factory
+        self.num_posts = num_posts
+        self.compress = env_flag('FEED_COMPRESS') if compress is None else compress
+        self.ingest_batch = ingest_batch
+        # Partial top topics are recomputed at most this often (seconds) while scraping
+        self.topic_interval = topic_interval
+        self.analyzer = None
+        self.suggester = None
+
+    @property
+    def stages(self):
+        """The pipeline as (name, callable) stages for JobQueue."""
+        return [
+            ('prepare', self.prepare),
+            ('scrape', self.scrape),
+            ('analyze', self.analyze),
+            ('suggest', self.suggest)
+        ]
+
+    def run(self):
+        """Run every stage and return the analysis insights (profiled if PROFILE_DIR is set)."""
+        context = {}
+        with profiled('pipeline'):
+            for _, stage in self.stages:
+                stage(context)
+        return context['result']
+
+    def prepare(self, context):
+        """Load the analyzer and suggestion generator on first use."""
+        if self.analyzer is None:
+            self.analyzer = self.analyzer_factory()
+        if self.suggester is None:
+            self.suggester = ContentSuggestions()
+
+    def scrape(self, context):
+        """Stream the feed into a raw NDJSON file, ingesting posts into the store as they arrive."""
+        events = context.get('events')
+        scraper = self.scraper_factory()
+        writer = FeedWriter(compress=self.compress)
+        arrivals = queue.Queue()
+        context['raw_file'] = writer.filename
+        on_progress = (lambda counts: events.publish('progress', counts)) if events else None
+        # The analyzer's SQLite connections (post store, token cache) are opened on
+        # the job thread by prepare, used only by the ingest thread below while it
+        # runs, then by the job thread again in analyze once the executor has joined
+        # it. JobQueue runs one analysis job at a time, and request threads (SSE,
+        # /insights/latest) never reach the analyzer, so no connection is used by
+        # two threads at once and check_same_thread=False is safe without a lock.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            ingesting = executor.submit(self._ingest_stream, arrivals, writer.filename, events)
+            feed = scraper.iter_feed(num_posts=self.num_posts, on_progress=on_progress)
+            try:
+                for post in feed:
+                    writer.write(post)
+                    arrivals.put((post, writer.offset))
+            finally:
+                # Closed before the scraper, so it can still record the posts written as seen
+                feed.close()
+                writer.close()
+                scraper.close()
+                arrivals.put(None)
+            context['posts_scraped'] = ingesting.result()
+
+    def _ingest_stream(self, arrivals, raw_file, events=None):
+        """Ingest queued posts in batches until the scrape ends; returns the number ingested."""
+        batch, read_offset, ingested = [], 0, 0
+        topics, topics_at = None, time.monotonic()
+        while True:
+            item = arrivals.get()
+            if item is None:
+                break
+            post, read_offset = item
+            batch.append(post)
+            # Tokenize whatever has arrived once the queue runs dry, rather than waiting for a full batch
+            if len(batch) >= self.ingest_batch or arrivals.empty():
+                self.analyzer.ingest_posts(batch, raw_file, read_offset=read_offset)
+                ingested += len(batch)
+                batch = []
+                if events and time.monotonic() - topics_at >= self.topic_interval:
+                    topics = self._publish_topics(events, topics, ingested)
+                    topics_at = time.monotonic()
+        # The writer is closed now, so the manifest can record the file's final size
+        self.analyzer.ingest_posts(batch, raw_file, read_offset=read_offset, file_size=os.path.getsize(raw_file))
+        return ingested + len(batch)
+
+    def _publish_topics(self, events, previous, ingested):
+        """Publish the archive's current top topics if their ranking changed; returns the ranking."""
+        top_topics = self.analyzer.topics.top_terms(10)
+        ranking = [topic for topic, _ in top_topics]
+        if ranking != previous:
+            events.publish('topics', {'top_topics': top_topics, 'posts_ingested': ingested})
+        return ranking
+
+    def analyze(self, context):
+        """Generate insights over the archive, which already holds the freshly scraped posts."""
+        # Also picks up raw files written by command-line scrapes
+        self.analyzer.load_data()
+        context['insights'] = self.analyzer.generate_insights()
+        self.analyzer.save_insights(context['insights'])
+
+    def suggest(self, context):
+        """Generate and save content suggestions from the fresh insights."""
+        self.suggester.insights = context['insights']
+        suggestions = self.suggester.generate_topic_suggestions()
+        best_practices = self.suggester.generate_best_practices()
+        self.suggester.save_suggestions(suggestions, best_practices)
+        context['suggestions'] = suggestions
+        context['result'] = context['insights']
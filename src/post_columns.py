@@ -0,0 +1,150 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+
+COUNT_COLUMNS = ('likes', 'comments', 'shares', 'cluster_size')
+META_FILE = 'columns.json'
+TEXT_FILE = 'text.bin'
+
+class StringColumn:
+    """Strings stored Arrow-style: one UTF-8 byte buffer plus int64 offsets, decoded on access.
+
+    Costs the encoded bytes plus 8 bytes per string, where a list of str
+    objects costs roughly 50 bytes of object header per string on top.
+    """
+
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.data[self.offsets[i]:self.offsets[i + 1]].tobytes().decode('utf-8')
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes + self.offsets.nbytes
+
+class PostColumns:
+    """One row per post cluster in typed column arrays: int32 counts, datetime64 timestamps, packed text.
+
+    Built from the store in chunks, so the archive is never held as Python
+    objects. With a directory, the columns are written there as .npy files
+    and memory-mapped, so archives larger than RAM are paged in on demand.
+    Columns are read by name (posts['likes']), like a DataFrame.
+    """
+
+    def __init__(self, text, likes, comments, shares, timestamp, cluster_size):
+        self.text = text
+        self.likes = likes
+        self.comments = comments
+        self.shares = shares
+        self.timestamp = timestamp
+        self.cluster_size = cluster_size
+
+    @classmethod
+    def from_chunks(cls, chunks, size, directory=None):
+        """Build from chunks of (text, likes, comments, shares, timestamp, cluster_size) rows.
+
+        size is an upper bound on the row count, used to preallocate the
+        columns. With a directory, the columns are written there and returned
+        memory-mapped; files of an earlier build are replaced, not overwritten,
+        so columns still mapped from it stay valid.
+        """
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        def allocate(name, dtype, length):
+            if directory:
+                return np.lib.format.open_memmap(os.path.join(directory, f"{name}.npy.new"), mode='w+',
+                                                 dtype=dtype, shape=(length,))
+            return np.zeros(length, dtype=dtype)
+
+        columns = {name: allocate(name, np.int32, size) for name in COUNT_COLUMNS}
+        columns['timestamp'] = allocate('timestamp', 'datetime64[ns]', size)
+        offsets = allocate('text_offsets', np.int64, size + 1)
+        text = open(os.path.join(directory, f"{TEXT_FILE}.new"), 'wb') if directory else bytearray()
+
+        rows = 0
+        try:
+            for chunk in chunks:
+                if rows + len(chunk) > size:
+                    raise ValueError(f"More than the {size} rows allocated")
+                texts, likes, comments, shares, timestamps, cluster_sizes = zip(*chunk)
+                span = slice(rows, rows + len(chunk))
+                columns['likes'][span] = likes
+                columns['comments'][span] = comments
+                columns['shares'][span] = shares
+                columns['cluster_size'][span] = cluster_sizes
+                columns['timestamp'][span] = pd.to_datetime(
+                    pd.Series(timestamps, dtype=object), format='ISO8601', errors='coerce'
+                ).to_numpy(dtype='datetime64[ns]')
+
+                encoded = [value.encode('utf-8') for value in texts]
+                np.cumsum([len(value) for value in encoded], out=offsets[rows + 1:rows + len(chunk) + 1])
+                offsets[rows + 1:rows + len(chunk) + 1] += offsets[rows]
+                if directory:
+                    text.write(b''.join(encoded))
+                else:
+                    text += b''.join(encoded)
+                rows += len(chunk)
+        finally:
+            if directory:
+                text.close()
+
+        if not directory:
+            return cls(StringColumn(np.frombuffer(text, dtype=np.uint8), offsets[:rows + 1]),
+                       **{name: column[:rows] for name, column in columns.items()})
+
+        for column in [offsets, *columns.values()]:
+            column.flush()
+        with open(os.path.join(directory, f"{META_FILE}.new"), 'w', encoding='utf-8') as f:
+            json.dump({'rows': rows}, f)
+        del columns, offsets
+        for name in [*COUNT_COLUMNS, 'timestamp', 'text_offsets']:
+            os.replace(os.path.join(directory, f"{name}.npy.new"), os.path.join(directory, f"{name}.npy"))
+        os.replace(os.path.join(directory, f"{TEXT_FILE}.new"), os.path.join(directory, TEXT_FILE))
+        os.replace(os.path.join(directory, f"{META_FILE}.new"), os.path.join(directory, META_FILE))
+        return cls.load(directory)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """Open columns written by from_chunks, memory-mapped unless mmap is False."""
+        with open(os.path.join(directory, META_FILE), 'r', encoding='utf-8') as f:
+            rows = json.load(f)['rows']
+        mode = 'r' if mmap else None
+        columns = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mode)[:rows]
+            for name in [*COUNT_COLUMNS, 'timestamp']
+        }
+        offsets = np.load(os.path.join(directory, 'text_offsets.npy'), mmap_mode=mode)[:rows + 1]
+        text_path = os.path.join(directory, TEXT_FILE)
+        if not os.path.getsize(text_path):
+            data = np.zeros(0, dtype=np.uint8)
+        elif mmap:
+            data = np.memmap(text_path, dtype=np.uint8, mode='r')
+        else:
+            data = np.fromfile(text_path, dtype=np.uint8)
+        return cls(StringColumn(data, offsets), **columns)
+
+    def __len__(self):
+        return len(self.likes)
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+    def counts(self):
+        """Likes, comments and shares as an int64 (posts x 3) matrix."""
+        return np.column_stack([self.likes, self.comments, self.shares]).astype(np.int64)
+
+    def totals(self):
+        """Total engagement of each post, as int64."""
+        return self.counts().sum(axis=1)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the columns (on disk rather than in RAM when memory-mapped)."""
+        return self.text.nbytes + sum(self[name].nbytes for name in [*COUNT_COLUMNS, 'timestamp'])
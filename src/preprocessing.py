@@ -0,0 +1,191 @@
+import hashlib
+import multiprocessing
+import os
+import re
+import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import nltk
+from nltk.tag.perceptron import PerceptronTagger
+from nltk.tokenize import word_tokenize
+from metrics import metrics
+
+NOUN_TAGS = ("NN", "NNS", "NNP", "NNPS")
+
+# NLTK data packages the analyzer needs, and where nltk.data.find looks for them
+NLTK_RESOURCES = {
+    'punkt': 'tokenizers/punkt',
+    'stopwords': 'corpora/stopwords',
+    'averaged_perceptron_tagger': 'taggers/averaged_perceptron_tagger'
+}
+
+_nltk_ready = False
+_tagger = None
+
+def ensure_nltk_resources():
+    """Download any missing NLTK data, checking at most once per process."""
+    global _nltk_ready
+    if _nltk_ready:
+        return
+    for package, path in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            nltk.download(package, quiet=True)
+    _nltk_ready = True
+
+def get_tagger():
+    """Return the process-wide POS tagger, loading its model on first use.
+
+    nltk.pos_tag/pos_tag_sents reload the model on every call; tagging with one
+    PerceptronTagger gives the same tags without that cost.
+    """
+    global _tagger
+    if _tagger is None:
+        _tagger = PerceptronTagger()
+    return _tagger
+
+URL_PATTERN = re.compile(r'http\S+|www\S+|https\S+', flags=re.MULTILINE)
+PUNCTUATION_PATTERN = re.compile(r'[^\w\s]')
+DIGIT_PATTERN = re.compile(r'\d+')
+
+def clean_text(text):
+    """Lowercase text and strip URLs, punctuation and digits."""
+    text = text.lower()
+    text = URL_PATTERN.sub('', text)
+    text = PUNCTUATION_PATTERN.sub('', text)
+    return DIGIT_PATTERN.sub('', text)
+
+def extract_nouns(texts):
+    """POS-tag a chunk of texts and return the nouns/proper nouns of each as a string."""
+    tagged = get_tagger().tag_sents([word_tokenize(clean_text(text)) for text in texts])
+    return [' '.join(word for word, pos in sentence if pos in NOUN_TAGS) for sentence in tagged]
+
+def content_hash(text):
+    """Return the cache key for a post's text."""
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+class TokenCache:
+    """On-disk cache of noun tokens keyed by content hash."""
+
+    # Stay below SQLite's bound-parameter limit on older builds
+    LOOKUP_BATCH = 500
+
+    def __init__(self, cache_path='data/token_cache.db'):
+        if os.path.dirname(cache_path):
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        # Used on the same threads as the analyzer's post store (see AnalysisPipeline.scrape)
+        self.conn = sqlite3.connect(cache_path, check_same_thread=False)
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS nouns (hash TEXT PRIMARY KEY, nouns TEXT NOT NULL)"
+            )
+
+    def get_many(self, hashes):
+        """Return a dict of hash -> nouns for the hashes present in the cache."""
+        found = {}
+        for i in range(0, len(hashes), self.LOOKUP_BATCH):
+            batch = hashes[i:i + self.LOOKUP_BATCH]
+            placeholders = ','.join('?' * len(batch))
+            found.update(self.conn.execute(
+                f"SELECT hash, nouns FROM nouns WHERE hash IN ({placeholders})", batch
+            ))
+        return found
+
+    def put_many(self, entries):
+        """Store (hash, nouns) pairs."""
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO nouns (hash, nouns) VALUES (?, ?)", entries)
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+# Pool processes are started from the app's job and ingest threads; forking a
+# multi-threaded process can copy locks held by other threads (SQLite, logging,
+# the metrics registry), so workers start from a clean single-threaded process
+POOL_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+def _init_tagging_worker():
+    """Load the tagger once when a pool process starts, rather than with its first chunk."""
+    get_tagger()
+
+class TextPreprocessor:
+    """Batched, cached and optionally parallel noun extraction for post text.
+
+    The process pool is started on the first batch large enough to need it and
+    kept, with the tagger loaded in each process, until close().
+    """
+
+    def __init__(self, stop_words, cache_path='data/token_cache.db', workers=None, chunk_size=256):
+        self.stop_words = stop_words
+        self.cache = TokenCache(cache_path) if cache_path else None
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def preprocess(self, text):
+        """Clean and preprocess one text, keeping only non-stopword nouns/proper nouns."""
+        return self.preprocess_many([text])[0]
+
+    @metrics.timed('preprocess')
+    def preprocess_many(self, texts):
+        """Preprocess a list of texts, tagging each distinct unseen text exactly once."""
+        hashes = [content_hash(text) for text in texts]
+        unique = dict(zip(hashes, texts))
+
+        nouns = self.cache.get_many(list(unique)) if self.cache else {}
+        missing = [h for h in unique if h not in nouns]
+        metrics.increment('token_cache_hits', len(unique) - len(missing))
+        metrics.increment('token_cache_misses', len(missing))
+        if missing:
+            with metrics.span('pos_tagging'):
+                tagged = self._tag([unique[h] for h in missing])
+            fresh = list(zip(missing, tagged))
+            nouns.update(fresh)
+            if self.cache:
+                self.cache.put_many(fresh)
+
+        return [self._filter(nouns[h]) for h in hashes]
+
+    def _tag(self, texts):
+        """Extract nouns from texts in chunks, fanning out to a process pool when worthwhile."""
+        chunks = [texts[i:i + self.chunk_size] for i in range(0, len(texts), self.chunk_size)]
+        if self.workers <= 1 or len(chunks) <= 1:
+            results = map(extract_nouns, chunks)
+            return [nouns for chunk in results for nouns in chunk]
+
+        try:
+            return [nouns for chunk in self._pool().map(extract_nouns, chunks) for nouns in chunk]
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start a fresh pool for the next batch
+            self._shutdown_pool()
+            raise
+
+    def _pool(self):
+        """The tagging process pool, started on first use."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context(POOL_START_METHOD),
+                    initializer=_init_tagging_worker
+                )
+            return self._executor
+
+    def _shutdown_pool(self):
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def _filter(self, nouns):
+        """Remove stopwords and short words from a cached noun string."""
+        return ' '.join(token for token in nouns.split() if token not in self.stop_words and len(token) > 2)
+
+    def close(self):
+        """Stop the tagging processes and release the token cache."""
+        self._shutdown_pool()
+        if self.cache:
+            self.cache.close()
@@ -0,0 +1,162 @@
+from collections import Counter
+from datetime import date, datetime, timedelta
+import pandas as pd
+
+PERIODS = ('day', 'week')
+
+def period_start(moment, period):
+    """Return the first day of the day/week (ISO, Monday-based) containing moment."""
+    day = moment.date() if isinstance(moment, datetime) else moment
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    return day
+
+class TopicRollups:
+    """Per-day and per-week topic and engagement aggregates, kept next to the post store.
+
+    Rollups are updated as posts are ingested, so windowed queries such as
+    "trending this week vs last week" read a handful of aggregate rows instead
+    of rescanning raw posts.
+    """
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._create_tables()
+
+    def _create_tables(self):
+        """Create one topic and one engagement table per period."""
+        with self.conn:
+            for period in PERIODS:
+                self.conn.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {period}_topics (
+                        bucket TEXT NOT NULL,
+                        term TEXT NOT NULL,
+                        mentions INTEGER NOT NULL,
+                        posts INTEGER NOT NULL,
+                        PRIMARY KEY (bucket, term)
+                    )
+                """)
+                self.conn.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {period}_engagement (
+                        bucket TEXT PRIMARY KEY,
+                        posts INTEGER NOT NULL,
+                        likes INTEGER NOT NULL,
+                        comments INTEGER NOT NULL,
+                        shares INTEGER NOT NULL
+                    )
+                """)
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS rollup_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+
+    def posts_rolled_up(self):
+        """Number of posts (dated or not) folded into the rollups so far."""
+        row = self.conn.execute("SELECT value FROM rollup_meta WHERE key = 'posts'").fetchone()
+        return row[0] if row else 0
+
+    def add_posts(self, posts, tokens):
+        """Fold a batch of posts and their token strings into the rollups."""
+        topics = {period: Counter() for period in PERIODS}
+        documents = {period: Counter() for period in PERIODS}
+        engagement = {period: {} for period in PERIODS}
+
+        moments = pd.to_datetime([post.get('timestamp') for post in posts], format='ISO8601', errors='coerce')
+        for post, post_tokens, moment in zip(posts, tokens, moments):
+            if pd.isna(moment):
+                continue
+            terms = Counter(post_tokens.split())
+            counts = post.get('engagement') or {}
+            for period in PERIODS:
+                bucket = period_start(moment, period).isoformat()
+                for term, mentions in terms.items():
+                    topics[period][(bucket, term)] += mentions
+                    documents[period][(bucket, term)] += 1
+                totals = engagement[period].setdefault(bucket, [0, 0, 0, 0])
+                totals[0] += 1
+                totals[1] += int(counts.get('likes', 0))
+                totals[2] += int(counts.get('comments', 0))
+                totals[3] += int(counts.get('shares', 0))
+
+        with self.conn:
+            for period in PERIODS:
+                self.conn.executemany(
+                    f"INSERT INTO {period}_topics (bucket, term, mentions, posts) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (bucket, term) DO UPDATE SET "
+                    "mentions = mentions + excluded.mentions, posts = posts + excluded.posts",
+                    [(bucket, term, mentions, documents[period][(bucket, term)])
+                     for (bucket, term), mentions in topics[period].items()]
+                )
+                self.conn.executemany(
+                    f"INSERT INTO {period}_engagement (bucket, posts, likes, comments, shares) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (bucket) DO UPDATE SET posts = posts + excluded.posts, "
+                    "likes = likes + excluded.likes, comments = comments + excluded.comments, "
+                    "shares = shares + excluded.shares",
+                    [(bucket, *totals) for bucket, totals in engagement[period].items()]
+                )
+            self.conn.execute(
+                "INSERT INTO rollup_meta (key, value) VALUES ('posts', ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = value + excluded.value",
+                (len(posts),)
+            )
+
+    def clear(self):
+        """Drop every aggregate."""
+        with self.conn:
+            for period in PERIODS:
+                self.conn.execute(f"DELETE FROM {period}_topics")
+                self.conn.execute(f"DELETE FROM {period}_engagement")
+            self.conn.execute("DELETE FROM rollup_meta")
+
+    def topic_counts(self, period, start, end):
+        """Mentions per term over the buckets in [start, end)."""
+        rows = self.conn.execute(
+            f"SELECT term, SUM(mentions) FROM {period}_topics WHERE bucket >= ? AND bucket < ? GROUP BY term",
+            (start.isoformat(), end.isoformat())
+        )
+        return dict(rows)
+
+    def trending(self, period='week', reference=None, top_n=10):
+        """Terms whose mentions grew most in the current period vs the one before it."""
+        reference = reference or date.today()
+        current_start = period_start(reference, period)
+        length = timedelta(days=7 if period == 'week' else 1)
+        previous_start = current_start - length
+
+        current = self.topic_counts(period, current_start, current_start + length)
+        previous = self.topic_counts(period, previous_start, current_start)
+        ranked = sorted(
+            current.items(),
+            key=lambda item: (item[1] - previous.get(item[0], 0), item[1], item[0]),
+            reverse=True
+        )
+        return [
+            {
+                'topic': term,
+                'current': mentions,
+                'previous': previous.get(term, 0),
+                'change': mentions - previous.get(term, 0)
+            }
+            for term, mentions in ranked[:top_n]
+        ]
+
+    def engagement_series(self, period='week', start=None, end=None):
+        """Posts and mean engagement per bucket, oldest first, optionally limited to [start, end)."""
+        start = period_start(start, period).isoformat() if start else ''
+        end = end.isoformat() if end else '9999-12-31'
+        rows = self.conn.execute(
+            f"SELECT bucket, posts, likes, comments, shares FROM {period}_engagement "
+            "WHERE bucket >= ? AND bucket < ? ORDER BY bucket",
+            (start, end)
+        )
+        return [
+            {
+                'bucket': bucket,
+                'posts': posts,
+                'average_engagement': {
+                    'likes': likes / posts,
+                    'comments': comments / posts,
+                    'shares': shares / posts
+                }
+            }
+            for bucket, posts, likes, comments, shares in rows
+        ]
@@ -1,6 +1,7 @@
 import os
-import time
+import sys
 import json
+from contextlib import closing
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
@@ -8,18 +9,67 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
 from dotenv import load_dotenv
 from bs4 import BeautifulSoup
-import re
+from ad_classifier import AdClassifier
+from extraction import (
+    EXTRACT_POSTS_JS, HTML_PARSER, POST_STRAINER, build_post, parse_posts_json, raw_fields
+)
+from feed_files import FeedWriter
+from seen_posts import SeenPosts
+from sessions import SessionStore
+from metrics import metrics
+from waits import POST_COUNT_JS, SCROLL_JS, AdaptiveScroll, ScrapeTimings, feed_or_login_wall, scroll_settled
+
+LOGIN_URL = "https://www.linkedin.com/login"
+# Cookies can only be set for the domain the browser is on
+COOKIE_URL = "https://www.linkedin.com/"
+
+# Used when CHROMEDRIVER_PATH isn't set and the Homebrew chromedriver isn't installed
+DEFAULT_CHROMEDRIVER_PATH = '/opt/homebrew/bin/chromedriver'
+
+class AuthenticationError(Exception):
+    """Raised when neither the saved session nor a fresh login gets the scraper onto the feed."""
+
+def env_flag(name, default=False):
+    """Read a boolean environment variable such as SCRAPER_HEADLESS=1."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+def save_posts(data, filename=None):
+    """Save scraped posts to a timestamped JSON file under data/raw and return its name."""
+    if filename is None:
+        filename = f"data/raw/linkedin_feed_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+
+    os.makedirs(os.path.dirname(filename), exist_ok=True)
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return filename
 
 class LinkedInScraper:
-    def __init__(self):
+    def __init__(self, driver_factory=None, seen_path='data/seen_posts.db', stop_after_seen=5,
+                 feed_url="https://www.linkedin.com/feed/", email=None, password=None,
+                 headless=None, chromedriver_path=None, session_store=None):
         load_dotenv()
-        self.email = os.getenv('LINKEDIN_EMAIL')
-        self.password = os.getenv('LINKEDIN_PASSWORD')
+        self.email = email or os.getenv('LINKEDIN_EMAIL')
+        self.password = password or os.getenv('LINKEDIN_PASSWORD')
+        self.headless = env_flag('SCRAPER_HEADLESS') if headless is None else headless
+        self.chromedriver_path = chromedriver_path or os.getenv('CHROMEDRIVER_PATH')
+        self.driver_factory = driver_factory
         self.driver = None
         self.setup_driver()
+        # Posts extracted by earlier runs; a run of this many in a row means we've caught up
+        self.seen_posts = SeenPosts(seen_path)
+        self.stop_after_seen = stop_after_seen
+        self.feed_url = feed_url
+        self.timings = ScrapeTimings()
+        self.session_store = session_store or SessionStore()
+        # 'session' when saved cookies were reused, 'login' after a full login
+        self.login_method = None
         # Common advertisement indicators
         self.ad_indicators = [
             "sponsored", "advertisement", "promoted", "download now", "get the full report",
@@ -30,34 +80,42 @@ class LinkedInScraper:
             "we help", "we provide", "we offer", "we deliver", "we create",
             "gofund.me", "bit.ly", "hubs.la", "lnkd.in", "t.co"
         ]
+        self.ad_classifier = AdClassifier(self.ad_indicators)
 
     def setup_driver(self):
         """Set up the Chrome WebDriver with appropriate options."""
+        if self.driver_factory:
+            self.driver = self.driver_factory()
+            return
+
         chrome_options = Options()
         chrome_options.add_argument("--start-maximized")
         chrome_options.add_argument("--disable-notifications")
-        # Uncomment the line below if you want to run in headless mode
-        # chrome_options.add_argument("--headless")
-        
-        # Use system ChromeDriver
-        service = Service('/opt/homebrew/bin/chromedriver')
+        if self.headless:
+            chrome_options.add_argument("--headless=new")
+            chrome_options.add_argument("--window-size=1920,1080")
+
+        # Prefer a configured or system ChromeDriver, otherwise download a matching one
+        path = self.chromedriver_path
+        if not path and os.path.exists(DEFAULT_CHROMEDRIVER_PATH):
+            path = DEFAULT_CHROMEDRIVER_PATH
+        service = Service(path or ChromeDriverManager().install())
         self.driver = webdriver.Chrome(service=service, options=chrome_options)
 
     def login(self):
         """Log in to LinkedIn."""
         try:
-            self.driver.get("https://www.linkedin.com/login")
-            time.sleep(5)  # Increased wait time for page load
+            self.driver.get(LOGIN_URL)
 
-            # Enter email
-            email_field = self.driver.find_element(By.ID, "username")
+            # Enter email as soon as the form is rendered
+            email_field = WebDriverWait(self.driver, 15).until(
+                EC.presence_of_element_located((By.ID, "username"))
+            )
             email_field.send_keys(self.email)
-            time.sleep(1)
 
             # Enter password
             password_field = self.driver.find_element(By.ID, "password")
             password_field.send_keys(self.password)
-            time.sleep(1)
 
             # Click login button
             login_button = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
@@ -70,6 +128,11 @@ class LinkedInScraper:
                 )
                 return True
             except Exception as e:
+                # Without a terminal (e.g. a job in the web app) nobody can answer the challenge
+                if not sys.stdin or not sys.stdin.isatty():
+                    print("Login failed: LinkedIn asked for security verification and no terminal is attached.")
+                    return False
+
                 print("\nLinkedIn may be asking for security verification.")
                 print("Please complete any security challenges in the browser window.")
                 print("The script will continue once you've completed the verification.")
@@ -90,119 +153,200 @@ class LinkedInScraper:
             print(f"Login failed: {str(e)}")
             return False
 
-    def scroll_feed(self, scroll_count=5):
-        """Scroll through the feed to load more posts."""
+    def restore_session(self, probe_timeout=10):
+        """Load the saved cookies and check them with a feed probe; returns False if they don't work."""
+        cookies = self.session_store.load(self.email)
+        if not cookies:
+            return False
+        self.driver.get(COOKIE_URL)
+        self.driver.delete_all_cookies()
+        for cookie in cookies:
+            self.driver.add_cookie(cookie)
+        self.driver.get(self.feed_url)
+        try:
+            landed = WebDriverWait(self.driver, probe_timeout, poll_frequency=0.1).until(feed_or_login_wall())
+        except TimeoutException:
+            landed = None
+        if landed != 'feed':
+            # Expired or revoked: LinkedIn redirects to the login wall instead of the feed
+            self.session_store.clear(self.email)
+            return False
+        return True
+
+    def authenticate(self):
+        """Reuse the saved session if it still works, else log in and save the new session."""
+        if self.restore_session():
+            self.login_method = 'session'
+            return True
+        if not self.login():
+            return False
+        self.login_method = 'login'
+        self.session_store.save(self.email, self.driver.get_cookies())
+        return True
+
+    def open_feed(self):
+        """Navigate to the feed unless login already landed there, and wait for the first posts."""
+        if not (self.driver.current_url or "").startswith(self.feed_url):
+            self.driver.get(self.feed_url)
+        WebDriverWait(self.driver, 20).until(
+            EC.presence_of_element_located((By.CLASS_NAME, "feed-shared-update-v2"))
+        )
+
+    def scroll_feed(self, scroll_count=5, timeout=2.0):
+        """Scroll through the feed, waiting until new posts load; returns False if a scroll loaded none."""
         for _ in range(scroll_count):
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(2)  # Wait for content to load
+            previous_count = self.driver.execute_script(POST_COUNT_JS)
+            self.driver.execute_script(SCROLL_JS)
+            try:
+                settled = WebDriverWait(self.driver, timeout, poll_frequency=0.1).until(
+                    scroll_settled(previous_count)
+                )
+            except TimeoutException:
+                return False
+            if settled != 'loaded':
+                return False
+        return True
 
+    @metrics.timed('extract_post_data')
     def extract_post_data(self, post_element):
         """Extract relevant data from a post element."""
         try:
-            soup = BeautifulSoup(post_element.get_attribute('outerHTML'), 'html.parser')
-            
-            # Extract post text
-            post_text = soup.find('div', {'class': 'feed-shared-update-v2__description'})
-            post_text = post_text.get_text().strip() if post_text else ""
-
-            # Extract engagement metrics
-            engagement = {
-                'likes': 0,
-                'comments': 0,
-                'shares': 0
-            }
-            
-            engagement_elements = soup.find_all('span', {'class': 'social-details-social-counts__reactions-count'})
-            if engagement_elements:
-                # Remove commas and convert to integer
-                likes_text = engagement_elements[0].get_text().strip() or "0"
-                engagement['likes'] = int(likes_text.replace(',', ''))
-
-            return {
-                'text': post_text,
-                'engagement': engagement,
-                'timestamp': datetime.now().isoformat()
-            }
+            soup = BeautifulSoup(
+                post_element.get_attribute('outerHTML'), HTML_PARSER,
+                parse_only=POST_STRAINER
+            )
+            return build_post(raw_fields(soup))
         except Exception as e:
             print(f"Error extracting post data: {str(e)}")
             return None
 
+    @metrics.timed('extract_visible_posts')
+    def extract_visible_posts(self):
+        """Extract every post currently in the feed with a single script round-trip."""
+        try:
+            return parse_posts_json(self.driver.execute_script(EXTRACT_POSTS_JS))
+        except Exception as e:
+            print(f"Error extracting posts: {str(e)}")
+            return []
+
     def is_advertisement(self, text):
         """Check if a post is likely an advertisement."""
-        if not text:
-            return True
-            
-        text_lower = text.lower()
-        
-        # Check for common ad indicators
-        for indicator in self.ad_indicators:
-            if indicator in text_lower:
-                return True
-                
-        # Check for promotional language patterns
-        promotional_patterns = [
-            r'\b(?:download|get|sign up|register|book|schedule|try|join|subscribe)\b.*\b(?:now|today|free|demo|call)\b',
-            r'\b(?:our|we|us)\b.*\b(?:product|service|solution|platform|tool|help|provide|offer|deliver|create)\b',
-            r'\b(?:limited time|special offer|free trial|exclusive|discount|deal)\b',
-            r'\b(?:click|check|learn|find|discover)\b.*\b(?:more|out|here|now)\b'
-        ]
-        
-        for pattern in promotional_patterns:
-            if re.search(pattern, text_lower):
-                return True
-                
-        return False
+        return self.ad_classifier.is_advertisement(text)
+
+    def classify_advertisement(self, text):
+        """Return the ad rule that matched the text (for auditing), or None for organic posts."""
+        return self.ad_classifier.classify(text)
 
     def scrape_feed(self, num_posts=200):
         """Scrape posts from the LinkedIn feed."""
-        if not self.login():
-            return []
+        with metrics.span('scrape_feed'):
+            return list(self.iter_feed(num_posts))
+
+    def iter_feed(self, num_posts=200, on_progress=None, record_seen=True):
+        """Yield organic posts as each extraction pass finds them, so callers can write or analyze them right away.
+
+        on_progress, if given, is called after every pass with the running
+        counts of new posts scraped, ads filtered out and posts kept.
+        A post is recorded as seen once the consumer has taken it (asked for
+        the next one), so posts dropped by closing the generator are found
+        again next run. With record_seen=False only filtered-out ads are
+        recorded, and the caller records the posts it keeps.
+        Raises AuthenticationError if the scraper can't sign in, rather than
+        yielding nothing as if the feed were empty.
+        """
+        with self.timings.measure('login'):
+            if not self.authenticate():
+                raise AuthenticationError(f"Could not sign in to LinkedIn as {self.email}")
+
+        with self.timings.measure('waiting'):
+            self.open_feed()
 
-        posts_data = []
         organic_posts = 0
+        new_posts = 0
         scroll_count = 0
+        run_ids = set()
+        consecutive_seen = 0
+        caught_up = False
+        scrolling = AdaptiveScroll()
         
-        # Keep scrolling until we have enough organic posts or reach max attempts
-        while organic_posts < num_posts and scroll_count < 30:  # Max 30 scrolls
-            self.scroll_feed(scroll_count=1)
-            scroll_count += 1
-            
-            # Find all posts
-            post_elements = self.driver.find_elements(By.CLASS_NAME, "feed-shared-update-v2")
-            
-            for post in post_elements:
+        # Keep scrolling until we have enough organic posts, the feed stops growing or we reach max attempts
+        while organic_posts < num_posts and scroll_count < 30 and not caught_up:  # Max 30 scrolls
+            # Extract only the posts loaded since the previous pass, in one round-trip
+            with self.timings.measure('extracting'):
+                visible_posts = self.extract_visible_posts()
+
+            new_ids = []
+            found = []
+            for post_data in visible_posts:
                 if organic_posts >= num_posts:
                     break
-                    
-                post_data = self.extract_post_data(post)
-                if post_data and not self.is_advertisement(post_data['text']):
-                    posts_data.append(post_data)
+
+                post_id = post_data['post_id']
+                if post_id in run_ids:
+                    continue  # Same post re-rendered in a new node
+                run_ids.add(post_id)
+
+                if post_id in self.seen_posts:
+                    consecutive_seen += 1
+                    if consecutive_seen >= self.stop_after_seen:
+                        caught_up = True
+                        break
+                    continue
+                consecutive_seen = 0
+                new_ids.append(post_id)
+
+                if not self.is_advertisement(post_data['text']):
+                    found.append(post_data)
                     organic_posts += 1
-                time.sleep(0.5)  # Small delay between posts
 
-        return posts_data
+            # Ads are never yielded, so they are recorded straight away
+            kept_ids = {post['post_id'] for post in found}
+            self.seen_posts.add_many([post_id for post_id in new_ids if post_id not in kept_ids])
+            new_posts += len(new_ids)
+            metrics.increment('posts_scraped', len(new_ids))
+            metrics.increment('ads_filtered', len(new_ids) - len(found))
+            if on_progress:
+                on_progress({'scraped': new_posts, 'ads_filtered': new_posts - organic_posts, 'kept': organic_posts})
+            taken = []
+            try:
+                for post_data in found:
+                    yield post_data
+                    taken.append(post_data['post_id'])
+            finally:
+                # Also runs when the consumer closes the generator at a yield
+                if record_seen:
+                    self.seen_posts.add_many(taken)
+            if organic_posts >= num_posts or caught_up:
+                break
+
+            with self.timings.measure('waiting'):
+                scrolling.record(self.scroll_feed(scroll_count=1, timeout=scrolling.timeout))
+            scroll_count += 1
+            if scrolling.exhausted:
+                break
 
     def save_data(self, data, filename=None):
         """Save scraped data to a JSON file."""
-        if filename is None:
-            filename = f"data/raw/linkedin_feed_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        return save_posts(data, filename)
 
     def close(self):
         """Close the browser."""
         if self.driver:
             self.driver.quit()
+        self.seen_posts.close()
 
 def main():
     scraper = LinkedInScraper()
     try:
         print("Starting LinkedIn feed scraping...")
-        posts_data = scraper.scrape_feed(num_posts=200)
-        scraper.save_data(posts_data)
-        print(f"Successfully scraped {len(posts_data)} posts")
+        # Posts are appended to the NDJSON file as they are found, so a crash keeps what was scraped
+        feed = scraper.iter_feed(num_posts=200)
+        with FeedWriter(compress=env_flag('FEED_COMPRESS')) as writer, closing(feed):
+            for post in feed:
+                writer.write(post)
+        print(f"Successfully scraped {writer.count} posts into {writer.filename}")
+        print(f"Signed in via {scraper.login_method}")
+        print(f"Time spent (s): {scraper.timings.report()}")
     except Exception as e:
         print(f"An error occurred: {str(e)}")
     finally:
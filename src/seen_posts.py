@@ -0,0 +1,39 @@
+import os
+import sqlite3
+from datetime import datetime
+
+class SeenPosts:
+    """Persistent set of post IDs already extracted by earlier scrape runs."""
+
+    def __init__(self, db_path='data/seen_posts.db'):
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS seen_posts (post_id TEXT PRIMARY KEY, first_seen TEXT NOT NULL)"
+            )
+        self.ids = {row[0] for row in self.conn.execute("SELECT post_id FROM seen_posts")}
+
+    def __contains__(self, post_id):
+        return post_id in self.ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add_many(self, post_ids):
+        """Record post IDs as seen, persisting only the ones that are new."""
+        new_ids = [post_id for post_id in dict.fromkeys(post_ids) if post_id not in self.ids]
+        if not new_ids:
+            return
+        now = datetime.now().isoformat()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO seen_posts (post_id, first_seen) VALUES (?, ?)",
+                [(post_id, now) for post_id in new_ids]
+            )
+        self.ids.update(new_ids)
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
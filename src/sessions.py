@@ -0,0 +1,57 @@
+import hashlib
+import json
+import os
+import time
+from cryptography.fernet import Fernet, InvalidToken
+
+class SessionStore:
+    """Encrypted on-disk browser cookies, one file per account.
+
+    Cookies are encrypted with Fernet using SESSION_KEY from the environment or,
+    if that isn't set, a key generated once into <session_dir>/session.key
+    (readable only by its owner).
+    """
+
+    def __init__(self, session_dir='data/sessions', key=None):
+        self.session_dir = session_dir
+        os.makedirs(session_dir, exist_ok=True)
+        self.fernet = Fernet(key or os.getenv('SESSION_KEY') or self._load_key())
+
+    def _load_key(self):
+        """Read the local key file, creating it on first use."""
+        path = os.path.join(self.session_dir, 'session.key')
+        if not os.path.exists(path):
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(Fernet.generate_key())
+        with open(path, 'rb') as f:
+            return f.read().strip()
+
+    def _path(self, account):
+        # Hashed, so account emails don't appear in file names
+        return os.path.join(self.session_dir, hashlib.sha1((account or '').encode('utf-8')).hexdigest()[:16] + '.session')
+
+    def load(self, account):
+        """Return the account's unexpired cookies, or None if there is no usable session."""
+        try:
+            with open(self._path(account), 'rb') as f:
+                cookies = json.loads(self.fernet.decrypt(f.read()))
+        except (FileNotFoundError, InvalidToken, ValueError):
+            return None
+        now = time.time()
+        cookies = [cookie for cookie in cookies if cookie.get('expiry') is None or cookie['expiry'] > now]
+        return cookies or None
+
+    def save(self, account, cookies):
+        """Encrypt and store the account's cookies, replacing the previous session."""
+        path = self._path(account)
+        with open(path + '.tmp', 'wb') as f:
+            f.write(self.fernet.encrypt(json.dumps(cookies).encode('utf-8')))
+        os.replace(path + '.tmp', path)
+
+    def clear(self, account):
+        """Forget the account's session."""
+        try:
+            os.remove(self._path(account))
+        except FileNotFoundError:
+            pass
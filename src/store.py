@@ -0,0 +1,187 @@
+import json
+import os
+import sqlite3
+from datetime import datetime
+from post_columns import PostColumns
+
+class PostStore:
+    """Persistent SQLite archive of scraped posts and their preprocessed tokens."""
+
+    FIRST_IN_CLUSTER = "id IN (SELECT MIN(id) FROM posts GROUP BY cluster_id)"
+
+    def __init__(self, db_path='data/analysis.db'):
+        self.db_path = db_path
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        # Created and used on different threads; AnalysisPipeline.scrape explains why that is safe
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._create_tables()
+
+    def _create_tables(self):
+        """Create the manifest and post tables if they don't exist yet."""
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS ingested_files (
+                    path TEXT PRIMARY KEY,
+                    post_count INTEGER NOT NULL,
+                    ingested_at TEXT NOT NULL,
+                    read_offset INTEGER,
+                    file_size INTEGER
+                )
+            """)
+            # Databases created before NDJSON support lack the resume columns
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(ingested_files)")}
+            for column in ('read_offset', 'file_size'):
+                if column not in columns:
+                    self.conn.execute(f"ALTER TABLE ingested_files ADD COLUMN {column} INTEGER")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS posts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    source TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    likes INTEGER NOT NULL DEFAULT 0,
+                    comments INTEGER NOT NULL DEFAULT 0,
+                    shares INTEGER NOT NULL DEFAULT 0,
+                    timestamp TEXT,
+                    tokens TEXT NOT NULL,
+                    raw TEXT NOT NULL,
+                    cluster_id INTEGER
+                )
+            """)
+            # Databases created before near-duplicate detection are clustered by the analyzer
+            if 'cluster_id' not in {row[1] for row in self.conn.execute("PRAGMA table_info(posts)")}:
+                self.conn.execute("ALTER TABLE posts ADD COLUMN cluster_id INTEGER")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS posts_cluster ON posts (cluster_id, id)")
+
+    def pending_files(self, paths):
+        """Return the paths not ingested yet, or (for NDJSON) grown since, in the given order."""
+        ingested = {
+            path: (read_offset, file_size)
+            for path, read_offset, file_size in self.conn.execute(
+                "SELECT path, read_offset, file_size FROM ingested_files"
+            )
+        }
+        pending = []
+        for path in paths:
+            key = self._key(path)
+            if key not in ingested:
+                pending.append(path)
+                continue
+            read_offset, file_size = ingested[key]
+            # JSON arrays are read in one go; NDJSON is pending until read to its current size
+            if read_offset is not None and (file_size is None or os.path.getsize(path) != file_size):
+                pending.append(path)
+        return pending
+
+    def read_offset(self, path):
+        """Where reading a partially ingested NDJSON file should resume (0 if it's new)."""
+        row = self.conn.execute(
+            "SELECT read_offset FROM ingested_files WHERE path = ?", (self._key(path),)
+        ).fetchone()
+        return (row[0] or 0) if row else 0
+
+    def add_file(self, path, posts, tokens, cluster_ids=None, read_offset=None, file_size=None):
+        """Store posts from one raw file and update its manifest entry atomically.
+
+        cluster_ids gives each post's near-duplicate cluster. For NDJSON files,
+        read_offset is how far the file has been read and file_size its size on
+        disk once read that far (None while it is still being read). If the file
+        changes size later, it is pending again and read from read_offset.
+        """
+        rows = []
+        cluster_ids = cluster_ids or [None] * len(posts)
+        for post, post_tokens, cluster_id in zip(posts, tokens, cluster_ids):
+            engagement = post.get('engagement') or {}
+            rows.append((
+                self._key(path),
+                post.get('text') or "",
+                int(engagement.get('likes', 0)),
+                int(engagement.get('comments', 0)),
+                int(engagement.get('shares', 0)),
+                post.get('timestamp'),
+                post_tokens,
+                json.dumps(post, ensure_ascii=False),
+                cluster_id
+            ))
+
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO posts (source, text, likes, comments, shares, timestamp, tokens, raw, cluster_id) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self.conn.execute(
+                "INSERT INTO ingested_files (path, post_count, ingested_at, read_offset, file_size) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (path) DO UPDATE SET post_count = post_count + excluded.post_count, "
+                "ingested_at = excluded.ingested_at, read_offset = excluded.read_offset, "
+                "file_size = excluded.file_size",
+                (self._key(path), len(rows), datetime.now().isoformat(), read_offset, file_size)
+            )
+
+    def post_count(self):
+        """Return the number of posts in the archive."""
+        return self.conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+    def cluster_count(self):
+        """Return the number of near-duplicate clusters (distinct posts) in the archive."""
+        return self.conn.execute("SELECT COUNT(DISTINCT cluster_id) FROM posts").fetchone()[0]
+
+    def unclustered_posts(self):
+        """Return (id, text) of posts not assigned to a cluster yet, oldest first."""
+        return self.conn.execute("SELECT id, text FROM posts WHERE cluster_id IS NULL ORDER BY id").fetchall()
+
+    def set_clusters(self, post_ids, cluster_ids):
+        """Assign clusters to stored posts, without committing."""
+        self.conn.executemany(
+            "UPDATE posts SET cluster_id = ? WHERE id = ?", list(zip(cluster_ids, post_ids))
+        )
+
+    def load_columns(self, directory=None, chunk_size=10000):
+        """Load one row per cluster into compact PostColumns, in cluster order, chunk_size rows at a time.
+
+        Each cluster is represented by its highest-engagement post, with its
+        size in cluster_size. With a directory, the columns are written there
+        and memory-mapped (see PostColumns.from_chunks).
+        """
+        # Unlike cluster_count, counts not-yet-clustered posts as one group, as the window query does
+        size = self.conn.execute("SELECT COUNT(*) FROM (SELECT 1 FROM posts GROUP BY cluster_id)").fetchone()[0]
+        # Clusters are ranked on ids and counts only; text is read for the chosen posts
+        cursor = self.conn.execute("""
+            SELECT posts.text, posts.likes, posts.comments, posts.shares, posts.timestamp, ranked.cluster_size
+            FROM (
+                SELECT id, cluster_id,
+                    COUNT(*) OVER (PARTITION BY cluster_id) AS cluster_size,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY cluster_id ORDER BY likes + comments + shares DESC, id
+                    ) AS rank
+                FROM posts
+            ) AS ranked
+            JOIN posts ON posts.id = ranked.id
+            WHERE ranked.rank = 1
+            ORDER BY ranked.cluster_id
+        """)
+        chunks = iter(lambda: cursor.fetchmany(chunk_size), [])
+        return PostColumns.from_chunks(chunks, size, directory=directory)
+
+    def load_tokens(self):
+        """Return the token strings of each cluster's first post, in cluster order."""
+        return [row[0] for row in self.conn.execute(
+            f"SELECT tokens FROM posts WHERE {self.FIRST_IN_CLUSTER} ORDER BY cluster_id"
+        )]
+
+    def load_posts(self):
+        """Return (post records, token strings) of each cluster's first post, in cluster order."""
+        rows = self.conn.execute(
+            f"SELECT raw, tokens FROM posts WHERE {self.FIRST_IN_CLUSTER} ORDER BY cluster_id"
+        ).fetchall()
+        return [json.loads(raw) for raw, _ in rows], [tokens for _, tokens in rows]
+
+    def close(self):
+        """Close the database connection."""
+        self.conn.close()
+
+    @staticmethod
+    def _key(path):
+        """Normalize a file path for the manifest."""
+        return os.path.normpath(path)
@@ -0,0 +1,131 @@
+import numpy as np
+import scipy.sparse as sp
+
+def build_topic_index(mentions, totals, topics, related=10):
+    """Per-topic engagement statistics and most co-occurring topics.
+
+    mentions is a sparse posts x topics matrix (non-zero where a post uses the
+    topic) and totals each post's total engagement. Returns a list of
+    {'topic', 'posts', 'total_engagement', 'related': [[topic, posts], ...]}
+    in the order of topics, where related counts the posts mentioning both.
+    """
+    mentions = sp.csr_matrix((mentions > 0).astype(np.int64))
+    posts = np.asarray(mentions.sum(axis=0)).ravel()
+    engagement = mentions.T @ np.asarray(totals, dtype=np.int64)
+    cooccurrence = (mentions.T @ mentions).tocsr()
+    cooccurrence.setdiag(0)
+    cooccurrence.eliminate_zeros()
+
+    index = []
+    for i, topic in enumerate(topics):
+        row = slice(cooccurrence.indptr[i], cooccurrence.indptr[i + 1])
+        others, counts = cooccurrence.indices[row], cooccurrence.data[row]
+        strongest = np.lexsort((others, -counts))[:related]
+        index.append({
+            'topic': topic,
+            'posts': int(posts[i]),
+            'total_engagement': int(engagement[i]),
+            'related': [[topics[others[j]], int(counts[j])] for j in strongest]
+        })
+    return index
+
+def topic_index_from_insights(insights):
+    """The insights' topic index, or one rebuilt from top_topics for insights saved before it existed."""
+    if insights.get('topic_index'):
+        return insights['topic_index']
+    by_topic = insights.get('engagement_analysis', {}).get('by_topic', {})
+    index = []
+    for topic, _ in insights.get('top_topics', []):
+        stats = by_topic.get(topic, {'posts': 0, 'average_total': 0.0})
+        index.append({
+            'topic': topic,
+            'posts': stats['posts'],
+            'total_engagement': stats['average_total'] * stats['posts'],
+            'related': []
+        })
+    return index
+
+class SuggestionIndex:
+    """Engagement-ranked post suggestions over a topic index, answered in batches.
+
+    A topic's score is its mean engagement per post, shrunk towards the
+    overall mean when few posts mention it (prior is the weight of that mean,
+    in posts). A topic filter matches its own topics and, with a weight of
+    P(topic | filter topic), the topics that co-occur with them, so a batch of
+    filters is ranked with one sparse product.
+    """
+
+    def __init__(self, topic_index, template_categories, prior=5, related_shown=3):
+        self.topics = [entry['topic'] for entry in topic_index]
+        self.positions = {topic: i for i, topic in enumerate(self.topics)}
+        posts = np.array([entry['posts'] for entry in topic_index], dtype=np.float64)
+        totals = np.array([entry['total_engagement'] for entry in topic_index], dtype=np.float64)
+        self.mean = totals.sum() / posts.sum() if posts.sum() else 0.0
+        self.scores = (totals + prior * self.mean) / (posts + prior)
+        # Highest score first; ties keep the topic index order (TF-IDF rank)
+        self.order = np.lexsort((np.arange(len(self.topics)), -self.scores))
+
+        rows, cols, weights = [], [], []
+        for i, entry in enumerate(topic_index):
+            for other, count in entry['related']:
+                if other in self.positions and posts[i]:
+                    rows.append(i)
+                    cols.append(self.positions[other])
+                    weights.append(count / posts[i])
+        size = len(self.topics)
+        related = sp.csr_matrix((weights, (rows, cols)), shape=(size, size))
+        self.expand = (sp.identity(size, format='csr') + related).tocsr()
+        self.related_names = [[other for other, _ in entry['related'][:related_shown]] for entry in topic_index]
+
+        self.categories = list(template_categories)
+        self.templates = [template_categories[category] for category in self.categories]
+
+    def suggest(self, k=5, topics=None):
+        """Top-k suggestions, optionally for a list of topics of interest."""
+        return self.suggest_many([topics], k)[0]
+
+    def suggest_many(self, topic_filters, k=5):
+        """Top-k suggestions for each filter (a list of topics, or None for every topic), in one call."""
+        results = [None] * len(topic_filters)
+        filtered = [i for i, topics in enumerate(topic_filters) if topics is not None]
+        if filtered:
+            rows, cols = [], []
+            for row, i in enumerate(filtered):
+                matched = {self.positions[topic] for topic in topic_filters[i] if topic in self.positions}
+                rows.extend([row] * len(matched))
+                cols.extend(matched)
+            selection = sp.csr_matrix(
+                (np.ones(len(rows)), (rows, cols)), shape=(len(filtered), len(self.topics))
+            )
+            relevance = (selection @ self.expand).tocsr()
+            for row, i in enumerate(filtered):
+                span = slice(relevance.indptr[row], relevance.indptr[row + 1])
+                candidates = relevance.indices[span]
+                weights = relevance.data[span] * self.scores[candidates]
+                best = np.lexsort((candidates, -weights))[:k]
+                results[i] = self._suggestions(candidates[best])
+
+        if len(filtered) < len(topic_filters):
+            unfiltered = self._suggestions(self.order[:k])
+            for i, topics in enumerate(topic_filters):
+                if topics is None:
+                    results[i] = [dict(suggestion) for suggestion in unfiltered]
+        return results
+
+    def _suggestions(self, positions):
+        """Suggestion dicts for ranked topic positions, cycling through the template categories."""
+        suggestions = []
+        for rank, position in enumerate(positions.tolist()):
+            topic = self.topics[position]
+            category = rank % len(self.categories)
+            templates = self.templates[category]
+            score = self.scores[position]
+            suggestions.append({
+                'topic': topic,
+                'template': templates[(position + rank // len(self.categories)) % len(templates)].format(topic=topic),
+                'category': self.categories[category],
+                'engagement_potential': 'High' if score >= self.mean else 'Medium',
+                'expected_engagement': round(float(score), 1),
+                'related_topics': self.related_names[position]
+            })
+        return suggestions
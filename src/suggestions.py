@@ -1,12 +1,15 @@
 import json
 import os
-import glob
 from datetime import datetime
-import random
+from insights_history import InsightsHistory
+from metrics import metrics
+from suggestion_index import SuggestionIndex, topic_index_from_insights
 
 class ContentSuggestions:
-    def __init__(self):
+    def __init__(self, history_dir='data'):
         self.insights = None
+        self.history_dir = history_dir
+        self._history = None
         self.template_categories = {
             'industry_insights': [
                 "Here's what I've learned about {topic} in the industry...",
@@ -30,39 +33,51 @@ class ContentSuggestions:
             ]
         }
 
-    def load_insights(self, insights_dir='data'):
-        """Load the most recent insights file."""
-        insight_files = glob.glob(os.path.join(insights_dir, 'analysis_insights_*.json'))
-        if not insight_files:
-            raise FileNotFoundError("No insights files found")
-        
-        latest_file = max(insight_files, key=os.path.getctime)
-        with open(latest_file, 'r', encoding='utf-8') as f:
-            self.insights = json.load(f)
+    @property
+    def insights(self):
+        return self._insights
 
-    def generate_topic_suggestions(self, num_suggestions=5):
-        """Generate topic suggestions based on trending topics."""
+    @insights.setter
+    def insights(self, insights):
+        self._insights = insights
+        # Rebuilt from the new insights on first use
+        self._index = None
+
+    @property
+    def index(self):
+        """The suggestion index for the current insights."""
         if not self.insights:
             raise ValueError("No insights loaded")
+        if self._index is None:
+            self._index = SuggestionIndex(topic_index_from_insights(self.insights), self.template_categories)
+        return self._index
 
-        topics = [topic for topic, _ in self.insights['top_topics']]
-        suggestions = []
+    @property
+    def history(self):
+        """The insights history, opened on first use."""
+        if self._history is None:
+            self._history = InsightsHistory(self.history_dir)
+        return self._history
 
-        for _ in range(num_suggestions):
-            topic = random.choice(topics)
-            category = random.choice(list(self.template_categories.keys()))
-            template = random.choice(self.template_categories[category])
-            
-            suggestion = {
-                'topic': topic,
-                'template': template.format(topic=topic),
-                'category': category,
-                'engagement_potential': 'High' if topic in [t for t, _ in self.insights['top_topics'][:3]] else 'Medium'
-            }
-            suggestions.append(suggestion)
+    @metrics.timed('load_insights')
+    def load_insights(self):
+        """Load the most recent insights from the insights history."""
+        insights = self.history.latest()
+        if insights is None:
+            raise FileNotFoundError("No insights found in the history")
+        self.insights = insights
+
+    @metrics.timed('generate_topic_suggestions')
+    def generate_topic_suggestions(self, num_suggestions=5):
+        """Generate suggestions for the topics whose posts get the most engagement."""
+        return self.index.suggest(num_suggestions)
 
-        return suggestions
+    @metrics.timed('generate_suggestions_batch')
+    def generate_suggestions_batch(self, topic_filters, num_suggestions=5):
+        """Ranked suggestions for each topic filter (a list of topics of interest, or None) in one call."""
+        return self.index.suggest_many(topic_filters, num_suggestions)
 
+    @metrics.timed('generate_best_practices')
     def generate_best_practices(self):
         """Generate best practices based on engagement analysis."""
         if not self.insights:
@@ -86,20 +101,25 @@ class ContentSuggestions:
 
         return best_practices
 
+    @metrics.timed('save_suggestions')
     def save_suggestions(self, suggestions, best_practices, filename=None):
-        """Save content suggestions to a JSON file."""
-        if filename is None:
-            filename = f"data/content_suggestions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        
+        """Append content suggestions to the insights history; returns the run id.
+
+        With a filename, the suggestions are also exported to that JSON file.
+        """
         output = {
             'suggestions': suggestions,
             'best_practices': best_practices,
             'generated_at': datetime.now().isoformat()
         }
-        
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(output, f, ensure_ascii=False, indent=2)
+
+        run_id = self.history.record(output, kind='suggestions', run_at=output['generated_at'])
+        if filename is not None:
+            if os.path.dirname(filename):
+                os.makedirs(os.path.dirname(filename), exist_ok=True)
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(output, f, ensure_ascii=False, indent=2)
+        return run_id
 
 def main():
     suggester = ContentSuggestions()
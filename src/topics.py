@@ -0,0 +1,223 @@
+import glob
+import heapq
+import os
+from operator import itemgetter
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.preprocessing import normalize
+
+class TopicState:
+    """Incrementally updated term statistics for TF-IDF topic ranking.
+
+    Each added batch of documents is stored as a sparse term-count segment, so an
+    update costs time proportional to the batch. top_terms() reproduces
+    TfidfVectorizer(max_features=...) fitted on every document added so far,
+    without re-tokenizing the corpus. State persists as a vocabulary file plus
+    one .npz file per segment, and two states can be merged. Past max_segments,
+    the newest small segments are merged into one, so the segment count stays
+    bounded while large, older segments are rarely rewritten.
+    """
+
+    def __init__(self, state_dir=None, max_segments=8):
+        self.state_dir = state_dir
+        self.max_segments = max_segments
+        # Same tokenization as TfidfVectorizer's defaults
+        self.analyzer = CountVectorizer().build_analyzer()
+        self.terms = []
+        self.vocabulary = {}
+        self.segments = []
+        self.term_totals = np.zeros(0, dtype=np.int64)
+        self._matrix = None
+        # (max_features, features, mean TF-IDF scores) of the current documents
+        self._scores = None
+        if state_dir:
+            self._load()
+            # States saved before compaction can have a segment per ingest batch
+            self._compact()
+
+    @property
+    def n_docs(self):
+        return sum(segment.shape[0] for segment in self.segments)
+
+    def add_documents(self, documents):
+        """Count the terms of a batch of documents and append it as a new segment."""
+        rows, cols = [], []
+        first_new_term = len(self.terms)
+        for row, document in enumerate(documents):
+            for token in self.analyzer(document):
+                col = self.vocabulary.get(token)
+                if col is None:
+                    col = self.vocabulary[token] = len(self.terms)
+                    self.terms.append(token)
+                rows.append(row)
+                cols.append(col)
+
+        segment = sp.csr_matrix(
+            (np.ones(len(rows), dtype=np.int64), (rows, cols)),
+            shape=(len(documents), len(self.terms))
+        )
+        segment.sum_duplicates()
+        self._append(segment)
+        if self.state_dir:
+            self._save_segment(segment, self.terms[first_new_term:])
+        self._compact()
+
+    def merge(self, other):
+        """Fold another state's documents into this one."""
+        if other.n_docs == 0:
+            return
+        first_new_term = len(self.terms)
+        remap = np.empty(len(other.terms), dtype=np.int64)
+        for index, term in enumerate(other.terms):
+            col = self.vocabulary.get(term)
+            if col is None:
+                col = self.vocabulary[term] = len(self.terms)
+                self.terms.append(term)
+            remap[index] = col
+
+        counts = other.matrix().tocoo()
+        segment = sp.csr_matrix(
+            (counts.data, (counts.row, remap[counts.col])),
+            shape=(counts.shape[0], len(self.terms))
+        )
+        self._append(segment)
+        if self.state_dir:
+            self._save_segment(segment, self.terms[first_new_term:])
+        self._compact()
+
+    def matrix(self):
+        """All documents as one CSR term-count matrix over the current vocabulary."""
+        if self._matrix is None:
+            width = len(self.terms)
+            if not self.segments:
+                self._matrix = sp.csr_matrix((0, width), dtype=np.int64)
+            else:
+                self._matrix = sp.vstack([self._widen(segment, width) for segment in self.segments], format='csr')
+        return self._matrix
+
+    def top_terms(self, top_n=10, max_features=1000):
+        """Top terms by mean TF-IDF score, matching a full TfidfVectorizer refit.
+
+        The scores are computed once per max_features until documents are added,
+        so asking for the top 10 and then the top 50 weights the corpus once.
+        """
+        if self._scores is None or self._scores[0] != max_features:
+            features, tfidf = self.tfidf(max_features)
+            scores = np.asarray(tfidf.mean(axis=0)).ravel() if len(features) else np.zeros(0)
+            self._scores = (max_features, features.tolist(), scores.tolist())
+        _, features, scores = self._scores
+        if not features:
+            return []
+        # nlargest keeps the alphabetical order of features among equal scores, like a stable sort
+        return heapq.nlargest(top_n, zip(features, scores), key=itemgetter(1))
+
+    def tfidf(self, max_features=1000):
+        """Return (feature names, TF-IDF matrix) as TfidfVectorizer would produce them."""
+        counts = self.matrix()
+        if counts.shape[1] == 0:
+            return np.array([], dtype=object), counts.astype(np.float64)
+
+        # TfidfVectorizer sorts features alphabetically, then keeps the most frequent ones.
+        # Terms with no occurrences (left over from an interrupted save) aren't features.
+        terms = np.array(self.terms)
+        order = np.where(self.term_totals > 0)[0]
+        order = order[np.argsort(terms[order])]
+        features = terms[order].astype(object)
+        counts, totals = counts[:, order], self.term_totals[order]
+        if len(features) == 0:
+            return features, counts.astype(np.float64)
+        if max_features is not None and len(features) > max_features:
+            kept = np.zeros(len(features), dtype=bool)
+            kept[(-totals).argsort()[:max_features]] = True
+            kept = np.where(kept)[0]
+            counts, features = counts[:, kept], features[kept]
+
+        doc_freq = np.bincount(counts.indices, minlength=counts.shape[1]).astype(np.float64)
+        idf = np.log((counts.shape[0] + 1) / (doc_freq + 1)) + 1
+        tfidf = normalize(counts.astype(np.float64) @ sp.diags(idf, format='csr'), norm='l2', copy=False)
+        return features, tfidf
+
+    def mentions(self, terms):
+        """Sparse documents x terms matrix of counts for the given terms."""
+        return self.matrix()[:, [self.vocabulary[term] for term in terms]]
+
+    def clear(self):
+        """Drop every document, including persisted segments."""
+        self.terms, self.vocabulary, self.segments = [], {}, []
+        self.term_totals = np.zeros(0, dtype=np.int64)
+        self._matrix = self._scores = None
+        if self.state_dir:
+            for path in glob.glob(os.path.join(self.state_dir, 'segment_*.npz')):
+                os.remove(path)
+            open(self._vocabulary_path(), 'w', encoding='utf-8').close()
+
+    def _append(self, segment):
+        """Add a segment to the in-memory state and its term totals."""
+        self.segments.append(segment)
+        totals = np.zeros(len(self.terms), dtype=np.int64)
+        totals[:len(self.term_totals)] = self.term_totals
+        totals[:segment.shape[1]] += np.asarray(segment.sum(axis=0)).ravel()
+        self.term_totals = totals
+        self._matrix = self._scores = None
+
+    def _compact(self):
+        """Merge the newest segments into one while there are more than max_segments.
+
+        Walking back from the newest segment, older segments join the merge
+        while they hold no more rows than the merge so far, so a large segment
+        is only rewritten once the segments after it add up to its size.
+        """
+        if len(self.segments) <= self.max_segments:
+            return
+        start = len(self.segments) - 1
+        rows = self.segments[start].shape[0]
+        while start > 0 and (len(self.segments) - start < 2 or self.segments[start - 1].shape[0] <= rows):
+            start -= 1
+            rows += self.segments[start].shape[0]
+
+        tail = self.segments[start:]
+        width = tail[-1].shape[1]
+        merged = sp.vstack([self._widen(segment, width) for segment in tail], format='csr')
+        if self.state_dir:
+            # Write the merged segment under the first one's name, then drop the rest.
+            # After a crash in between, n_docs no longer matches the store and the analyzer rebuilds the state.
+            staged = os.path.join(self.state_dir, 'compacting.npz')
+            sp.save_npz(staged, merged)
+            os.replace(staged, self._segment_path(start + 1))
+            # Newest first, so the files left after a crash are still numbered without gaps
+            for position in range(len(self.segments), start + 1, -1):
+                os.remove(self._segment_path(position))
+        self.segments[start:] = [merged]
+
+    @staticmethod
+    def _widen(segment, width):
+        """Pad a segment with empty columns for terms added after it."""
+        return sp.csr_matrix((segment.data, segment.indices, segment.indptr), shape=(segment.shape[0], width))
+
+    def _vocabulary_path(self):
+        return os.path.join(self.state_dir, 'vocabulary.txt')
+
+    def _segment_path(self, position):
+        """File of the segment at a 1-based position; names sort in segment order."""
+        return os.path.join(self.state_dir, f"segment_{position:06d}.npz")
+
+    def _save_segment(self, segment, new_terms):
+        """Persist one segment and the terms it introduced."""
+        os.makedirs(self.state_dir, exist_ok=True)
+        with open(self._vocabulary_path(), 'a', encoding='utf-8') as f:
+            f.writelines(term + '\n' for term in new_terms)
+        sp.save_npz(self._segment_path(len(self.segments)), segment)
+
+    def _load(self):
+        """Load the persisted vocabulary and segments, if any."""
+        if not os.path.exists(self._vocabulary_path()):
+            return
+        with open(self._vocabulary_path(), 'r', encoding='utf-8') as f:
+            self.terms = f.read().splitlines()
+        self.vocabulary = {term: index for index, term in enumerate(self.terms)}
+        self.term_totals = np.zeros(len(self.terms), dtype=np.int64)
+        for path in sorted(glob.glob(os.path.join(self.state_dir, 'segment_*.npz'))):
+            segment = sp.load_npz(path).tocsr()
+            self.segments.append(segment)
+            self.term_totals[:segment.shape[1]] += np.asarray(segment.sum(axis=0)).ravel()
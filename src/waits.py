@@ -0,0 +1,106 @@
+import time
+from contextlib import contextmanager
+from selenium.webdriver.common.by import By
+from extraction import POST_CLASS
+from metrics import metrics
+
+POST_COUNT_JS = f"return document.getElementsByClassName('{POST_CLASS}').length;"
+RESOURCE_COUNT_JS = "return performance.getEntriesByType('resource').length;"
+SCROLL_JS = "window.scrollTo(0, document.body.scrollHeight);"
+# Where LinkedIn sends signed-out or challenged sessions
+LOGIN_WALL_PATHS = ('/login', '/authwall', '/checkpoint', '/uas/login')
+
+class post_count_increased:
+    """WebDriverWait condition: the feed holds more posts than it did before scrolling."""
+
+    def __init__(self, previous_count):
+        self.previous_count = previous_count
+
+    def __call__(self, driver):
+        count = driver.execute_script(POST_COUNT_JS)
+        return count if count > self.previous_count else False
+
+class network_idle:
+    """WebDriverWait condition: no new network resources for quiet_period seconds."""
+
+    def __init__(self, quiet_period=0.5):
+        self.quiet_period = quiet_period
+        self.last_count = None
+        self.last_change = None
+
+    def __call__(self, driver):
+        count = driver.execute_script(RESOURCE_COUNT_JS)
+        now = time.monotonic()
+        if count != self.last_count:
+            self.last_count = count
+            self.last_change = now
+            return False
+        return now - self.last_change >= self.quiet_period
+
+class scroll_settled:
+    """WebDriverWait condition: 'loaded' once new posts appear, 'idle' if the network goes quiet first."""
+
+    def __init__(self, previous_count, quiet_period=0.5):
+        self.posts_loaded = post_count_increased(previous_count)
+        self.network_idle = network_idle(quiet_period)
+
+    def __call__(self, driver):
+        if self.posts_loaded(driver):
+            return 'loaded'
+        if self.network_idle(driver):
+            return 'idle'
+        return False
+
+class feed_or_login_wall:
+    """WebDriverWait condition: 'feed' once posts render, 'login' as soon as LinkedIn redirects to a login wall."""
+
+    def __call__(self, driver):
+        if any(path in (driver.current_url or '') for path in LOGIN_WALL_PATHS):
+            return 'login'
+        if driver.find_elements(By.CLASS_NAME, POST_CLASS):
+            return 'feed'
+        return False
+
+class AdaptiveScroll:
+    """Scroll wait budget that backs off while the feed is idle and resets when posts load."""
+
+    def __init__(self, initial_timeout=2.0, max_timeout=8.0, max_idle_scrolls=3):
+        self.initial_timeout = initial_timeout
+        self.max_timeout = max_timeout
+        self.max_idle_scrolls = max_idle_scrolls
+        self.idle_scrolls = 0
+
+    @property
+    def timeout(self):
+        """Seconds to wait for new posts after the next scroll."""
+        return min(self.initial_timeout * (2 ** self.idle_scrolls), self.max_timeout)
+
+    @property
+    def exhausted(self):
+        """True once enough scrolls in a row have loaded nothing."""
+        return self.idle_scrolls >= self.max_idle_scrolls
+
+    def record(self, loaded):
+        """Record whether the last scroll loaded new posts."""
+        self.idle_scrolls = 0 if loaded else self.idle_scrolls + 1
+
+class ScrapeTimings:
+    """Wall-clock time a scrape spends per phase (waiting, extracting, ...), also recorded as scrape_<phase> spans."""
+
+    def __init__(self):
+        self.totals = {}
+
+    @contextmanager
+    def measure(self, phase):
+        """Add the duration of the block to the given phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.totals[phase] = self.totals.get(phase, 0.0) + elapsed
+            metrics.observe(f"scrape_{phase}", elapsed)
+
+    def report(self):
+        """Return the per-phase totals in seconds, rounded for display."""
+        return {phase: round(seconds, 3) for phase, seconds in self.totals.items()}
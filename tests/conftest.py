@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+# Modules in src/ import each other flat, as when run as scripts; the fakes live with the benchmarks
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+@pytest.fixture
+def app_module(monkeypatch, tmp_path):
+    """The Flask app module, run from an empty directory with a LinkedIn account configured."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('LINKEDIN_EMAIL', 'user@example.com')
+    monkeypatch.setenv('LINKEDIN_PASSWORD', 'secret')
+    import app
+    return app
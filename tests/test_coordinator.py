@@ -0,0 +1,86 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from coordinator import ScrapeCoordinator, load_accounts
+from fake_driver import FakeFeedDriver
+from scraper import AuthenticationError, LinkedInScraper
+from synthetic import generate_feed_html
+
+class LockedOutScraper(LinkedInScraper):
+    """A scraper whose saved session has expired and whose login hits a security challenge."""
+
+    def authenticate(self):
+        return False
+
+def account_feed(account, count):
+    """count organic posts, newest first, with URNs unique to the account."""
+    start = datetime(2024, 1, 1)
+    posts = [{
+        'text': f"Notes on distributed systems design, part {i} from {account}",
+        'engagement': {'likes': i, 'comments': 0, 'shares': 0},
+        'timestamp': (start - timedelta(hours=i)).isoformat()
+    } for i in range(count)]
+    base = 7000000000000000000 + (1000 if account == 'account1' else 0)
+    return generate_feed_html(posts, [base + i for i in range(count)])
+
+def scrape(seen_dir, feeds, num_posts, scraper_factory=LinkedInScraper):
+    coordinator = ScrapeCoordinator(
+        accounts=[{'name': name, 'email': f"{name}@example.com", 'password': 'x'} for name in feeds],
+        driver_factory=lambda account: FakeFeedDriver(feeds[account['name']], page_size=10),
+        scraper_factory=scraper_factory,
+        seen_dir=seen_dir
+    )
+    posts = coordinator.scrape_feed(num_posts=num_posts)
+    return [post['post_id'] for post in posts], coordinator.report()
+
+def test_posts_dropped_by_the_coordinator_are_scraped_next_run(tmp_path):
+    feeds = {name: account_feed(name, 10) for name in ('account0', 'account1')}
+
+    # A quota of 4 per account for 7 posts: both workers over-fetch, and one post is dropped
+    first, report = scrape(str(tmp_path), feeds, num_posts=7)
+    assert len(first) == len(set(first)) == 7
+    assert sum(stats['posts'] for stats in report) == 8
+
+    second, _ = scrape(str(tmp_path), feeds, num_posts=20)
+    assert not set(first) & set(second)
+    # The first four posts of each feed were fetched in run one; every one of them has now been returned
+    fetched = {f"urn:li:activity:{7000000000000000000 + offset + i}" for offset in (0, 1000) for i in range(4)}
+    assert fetched <= set(first) | set(second)
+
+def test_failed_sign_in_raises_instead_of_an_empty_feed(tmp_path):
+    scraper = LockedOutScraper(
+        driver_factory=lambda: FakeFeedDriver(account_feed('account0', 5)),
+        seen_path=os.path.join(tmp_path, 'seen_posts.db'), email='account0@example.com', password='x'
+    )
+    try:
+        with pytest.raises(AuthenticationError, match="account0@example.com"):
+            list(scraper.iter_feed(num_posts=5))
+    finally:
+        scraper.close()
+
+def test_coordinator_fails_when_no_account_can_sign_in(tmp_path):
+    feeds = {name: account_feed(name, 5) for name in ('account0', 'account1')}
+    with pytest.raises(RuntimeError, match="Could not sign in"):
+        scrape(str(tmp_path), feeds, num_posts=10, scraper_factory=LockedOutScraper)
+
+def test_coordinator_keeps_the_accounts_that_signed_in(tmp_path):
+    feeds = {name: account_feed(name, 5) for name in ('account0', 'account1')}
+
+    def scraper_factory(**kwargs):
+        locked_out = kwargs['email'] == 'account1@example.com'
+        return (LockedOutScraper if locked_out else LinkedInScraper)(**kwargs)
+
+    posts, report = scrape(str(tmp_path), feeds, num_posts=10, scraper_factory=scraper_factory)
+    assert len(posts) == 5
+    assert report[0]['error'] is None
+    assert "Could not sign in" in report[1]['error']
+
+def test_empty_account_list_is_rejected(tmp_path):
+    accounts_file = tmp_path / 'accounts.json'
+    accounts_file.write_text('[]')
+    with pytest.raises(ValueError, match="No accounts in"):
+        load_accounts(str(accounts_file))
+    with pytest.raises(ValueError, match="at least one account"):
+        ScrapeCoordinator(accounts=[], seen_dir=str(tmp_path))
@@ -0,0 +1,38 @@
+import json
+
+from extraction import extract_posts_from_html, parse_count, parse_posts_json
+
+def test_parse_count_formats():
+    assert parse_count("1,234") == 1234
+    assert parse_count("1.2K") == 1200
+    assert parse_count("3M") == 3000000
+    assert parse_count("") == 0
+    assert parse_count(None) == 0
+
+def test_parse_count_malformed_text():
+    assert parse_count("12 reactions") == 12
+    assert parse_count("1,2K") == 1200
+    assert parse_count("1.2.3") == 0
+    assert parse_count("reactions") == 0
+
+def test_one_bad_post_does_not_lose_the_pass():
+    payload = json.dumps([
+        {'urn': 'urn:li:activity:1', 'text': 'First post', 'likes': '12 reactions', 'age': '3h'},
+        {'urn': 'urn:li:activity:2', 'text': 'Malformed count', 'likes': '1.2.3K', 'age': '1d'},
+        # text that isn't a string makes build_post itself fail
+        {'urn': 'urn:li:activity:3', 'text': 42, 'likes': '5', 'age': '1d'},
+        {'urn': 'urn:li:activity:4', 'text': 'Last post', 'likes': '1,2K', 'age': ''},
+    ])
+    posts = parse_posts_json(payload)
+    assert [post['post_id'] for post in posts] == ['urn:li:activity:1', 'urn:li:activity:2', 'urn:li:activity:4']
+    assert [post['engagement']['likes'] for post in posts] == [12, 0, 1200]
+
+def test_html_extraction_with_malformed_count():
+    html = """
+    <div class="feed-shared-update-v2" data-urn="urn:li:activity:7">
+      <div class="feed-shared-update-v2__description">Hello feed</div>
+      <span class="social-details-social-counts__reactions-count">1,2K reactions</span>
+    </div>"""
+    posts = extract_posts_from_html(html)
+    assert len(posts) == 1
+    assert posts[0]['engagement']['likes'] == 1200
@@ -0,0 +1,78 @@
+import gzip
+import os
+
+from feed_files import FeedWriter, iter_records
+
+POSTS = [{'text': f"post {i}", 'engagement': {'likes': i, 'comments': 0, 'shares': 0}} for i in range(5)]
+
+def write_truncated_gzip(path, posts, cut=8):
+    """A gzip feed whose writer crashed: the trailer and the end of the last block are missing."""
+    with FeedWriter(path, compress=True) as writer:
+        offsets = []
+        for post in posts:
+            writer.write(post)
+            offsets.append(writer.offset)
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) - cut)
+    return offsets
+
+def test_truncated_gzip_is_read_up_to_the_damage(tmp_path):
+    path = str(tmp_path / 'feed.ndjson.gz')
+    offsets = write_truncated_gzip(path, POSTS)
+
+    records = list(iter_records(path))
+    assert [post for post, _ in records] == POSTS[:len(records)]
+    assert [offset for _, offset in records] == offsets[:len(records)]
+    # Resuming anywhere, including past the damage, never raises
+    for offset in [0, *offsets]:
+        list(iter_records(path, offset))
+
+def test_reopened_gzip_writer_starts_a_new_file(tmp_path):
+    path = str(tmp_path / 'feed.ndjson.gz')
+    write_truncated_gzip(path, POSTS[:3])
+    damaged = open(path, 'rb').read()
+
+    with FeedWriter(path, compress=True) as writer:
+        writer.write_many(POSTS[3:])
+    assert writer.filename != path
+    assert open(path, 'rb').read() == damaged
+    assert [post for post, _ in iter_records(writer.filename)] == POSTS[3:]
+    assert writer.offset == list(iter_records(writer.filename))[-1][1]
+
+def test_truncated_then_appended_gzip_does_not_raise(tmp_path):
+    """Files written before writers stopped appending: a new gzip member behind a damaged one."""
+    path = str(tmp_path / 'feed.ndjson.gz')
+    offsets = write_truncated_gzip(path, POSTS[:3])
+    with gzip.open(path, 'ab') as f:
+        f.write(b'{"text": "appended"}\n')
+
+    records = list(iter_records(path))
+    assert [post for post, _ in records] == POSTS[:len(records)]
+    assert list(iter_records(path, offsets[-1])) == []
+
+def test_plain_feed_with_a_cut_off_line_is_resumed(tmp_path):
+    path = str(tmp_path / 'feed.ndjson')
+    with FeedWriter(path) as writer:
+        writer.write_many(POSTS[:2])
+    with open(path, 'ab') as f:
+        f.write(b'{"text": "cut sh')
+    # A reader stops before the incomplete line
+    assert [post for post, _ in iter_records(path)] == POSTS[:2]
+
+    with FeedWriter(path) as writer:
+        writer.write_many(POSTS[2:])
+    assert writer.filename == path
+    records = list(iter_records(path))
+    assert [post for post, _ in records] == POSTS
+    assert records[-1][1] == writer.offset == os.path.getsize(path)
+
+def test_malformed_line_is_skipped_with_a_warning(tmp_path, caplog):
+    path = str(tmp_path / 'feed.ndjson')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('{"text": "first"}\n{"text": \n{"text": "third"}\n')
+
+    with caplog.at_level('WARNING', logger='feed_files'):
+        posts = [post['text'] for post, _ in iter_records(path)]
+    assert posts == ['first', 'third']
+    assert [record.levelname for record in caplog.records] == ['WARNING']
+    assert "malformed line" in caplog.records[0].getMessage()
@@ -0,0 +1,34 @@
+import gzip
+import json
+
+from insights_cache import InsightsCache
+from insights_history import InsightsHistory
+
+INSIGHTS = {'top_topics': [['data', 0.4], ['hiring', 0.2]], 'total_posts_analyzed': 2}
+
+def test_each_encoding_has_its_own_etag(app_module, monkeypatch, tmp_path):
+    history = InsightsHistory(str(tmp_path / 'data'))
+    history.record(INSIGHTS)
+    monkeypatch.setattr(app_module, 'insights_cache', InsightsCache(lambda: history))
+    client = app_module.app.test_client()
+
+    identity = client.get('/insights/latest')
+    gzipped = client.get('/insights/latest', headers={'Accept-Encoding': 'gzip'})
+    assert json.loads(identity.data)['data'] == INSIGHTS
+    assert json.loads(gzip.decompress(gzipped.data))['data'] == INSIGHTS
+    assert identity.headers['ETag'] != gzipped.headers['ETag']
+    assert gzipped.headers['Vary'] == 'Accept-Encoding'
+
+    # A validator only matches the representation it was issued for
+    response = client.get('/insights/latest', headers={'If-None-Match': identity.headers['ETag']})
+    assert response.status_code == 304
+    response = client.get('/insights/latest', headers={
+        'If-None-Match': identity.headers['ETag'], 'Accept-Encoding': 'gzip'
+    })
+    assert response.status_code == 200 and response.headers['Content-Encoding'] == 'gzip'
+    response = client.get('/insights/latest', headers={
+        'If-None-Match': gzipped.headers['ETag'], 'Accept-Encoding': 'gzip'
+    })
+    assert response.status_code == 304
+    assert response.headers['ETag'] == gzipped.headers['ETag']
+    history.close()
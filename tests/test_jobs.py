@@ -0,0 +1,215 @@
+import os
+import threading
+
+import pytest
+
+from jobs import JobQueue, JobQueueFullError
+from synthetic import generate_posts
+
+class GatedScraper:
+    """Stands in for LinkedInScraper: reports progress, then waits for the test before finishing its feed."""
+
+    def __init__(self, posts=5):
+        self.posts = posts
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def iter_feed(self, num_posts=200, on_progress=None):
+        for count, post in enumerate(generate_posts(self.posts, seed=1), start=1):
+            if on_progress:
+                on_progress({'posts_scraped': count, 'ads_filtered': 0, 'posts_kept': count})
+            yield post
+        self.started.set()
+        assert self.release.wait(10)
+
+    def close(self):
+        pass
+
+def scrape_stage(scraper):
+    def scrape(context):
+        events = context['events']
+        on_progress = lambda counts: events.publish('progress', counts)
+        context['posts'] = list(scraper.iter_feed(on_progress=on_progress))
+    return scrape
+
+def analyze(context):
+    context['result'] = {'total_posts_analyzed': len(context['posts'])}
+
+def test_job_reports_stages_and_progress():
+    scraper = GatedScraper()
+    queue = JobQueue([('scrape', scrape_stage(scraper)), ('analyze', analyze)])
+    job, created = queue.submit()
+    subscription = job.events.subscribe()
+    assert created
+
+    assert scraper.started.wait(10)
+    assert job.status == 'running'
+    assert [stage['status'] for stage in job.stages] == ['running', 'pending']
+
+    scraper.release.set()
+    assert job.wait(10)
+    assert job.status == 'succeeded'
+    assert [stage['status'] for stage in job.stages] == ['done', 'done']
+    assert job.result == {'total_posts_analyzed': 5}
+
+    events = []
+    while not subscription.finished:
+        events.extend(subscription.get(timeout=1))
+    progress = [message['data']['posts_scraped'] for message in events if message['event'] == 'progress']
+    assert progress == [1, 2, 3, 4, 5]
+    stages = [(message['data']['name'], message['data']['status']) for message in events if message['event'] == 'stage']
+    assert stages == [('scrape', 'running'), ('scrape', 'done'), ('analyze', 'running'), ('analyze', 'done')]
+    assert events[-1]['event'] == 'done'
+    queue.shutdown()
+
+def test_second_submit_joins_the_running_job():
+    scraper = GatedScraper()
+    queue = JobQueue([('scrape', scrape_stage(scraper)), ('analyze', analyze)])
+    job, _ = queue.submit()
+    assert scraper.started.wait(10)
+
+    joined, created = queue.submit()
+    assert joined is job and not created
+    scraper.release.set()
+    assert job.wait(10)
+
+    # Once the job has finished, the next submit starts a new one
+    scraper.release.clear()
+    next_job, created = queue.submit()
+    assert created and next_job is not job
+    scraper.release.set()
+    assert next_job.wait(10)
+    queue.shutdown()
+
+def test_stage_exception_fails_the_job():
+    def scrape(context):
+        raise RuntimeError("LinkedIn login failed")
+
+    queue = JobQueue([('scrape', scrape), ('analyze', analyze)])
+    job, _ = queue.submit()
+    assert job.wait(10)
+    assert job.status == 'failed'
+    assert job.error == "LinkedIn login failed"
+    assert [stage['status'] for stage in job.stages] == ['failed', 'pending']
+    assert job.result is None
+    queue.shutdown()
+
+def test_jobs_endpoint_reports_a_busy_queue(app_module, monkeypatch):
+    scraper = GatedScraper()
+    # One worker and one waiting slot
+    queue = JobQueue([('scrape', scrape_stage(scraper)), ('analyze', analyze)], max_queued=1)
+    monkeypatch.setattr(app_module, 'job_queue', queue)
+    client = app_module.app.test_client()
+
+    running, _ = queue.submit('other')
+    assert scraper.started.wait(10)
+    response = client.post('/jobs')
+    assert response.status_code == 202
+    assert not response.json['coalesced']
+    job_id = response.json['job']['id']
+    assert response.headers['Location'].endswith(f"/jobs/{job_id}")
+    assert client.get(f"/jobs/{job_id}").json['job']['status'] == 'queued'
+
+    response = client.post('/jobs')
+    assert response.status_code == 202
+    assert response.json['coalesced'] and response.json['job']['id'] == job_id
+
+    # The analysis job holds the only waiting slot, so another key is refused
+    with pytest.raises(JobQueueFullError):
+        queue.submit('third')
+
+    scraper.release.set()
+    assert running.wait(10) and queue.get(job_id).wait(10)
+    assert client.get(f"/jobs/{job_id}").json['job']['status'] == 'succeeded'
+    queue.shutdown()
+
+def test_jobs_endpoint_refuses_when_the_queue_is_full(app_module, monkeypatch):
+    scraper = GatedScraper()
+    queue = JobQueue([('scrape', scrape_stage(scraper)), ('analyze', analyze)], max_queued=1)
+    monkeypatch.setattr(app_module, 'job_queue', queue)
+    client = app_module.app.test_client()
+
+    running, _ = queue.submit('other')
+    assert scraper.started.wait(10)
+    waiting, _ = queue.submit('waiting')
+    response = client.post('/jobs')
+    assert response.status_code == 429
+    assert not response.json['success']
+
+    scraper.release.set()
+    assert running.wait(10) and waiting.wait(10)
+    queue.shutdown()
+
+def test_run_analysis_answers_with_the_finished_result(app_module, monkeypatch):
+    def scrape(context):
+        context['posts'] = list(generate_posts(3, seed=2))
+
+    queue = JobQueue([('scrape', scrape), ('analyze', analyze)])
+    monkeypatch.setattr(app_module, 'job_queue', queue)
+    response = app_module.app.test_client().post('/run-analysis')
+    assert response.status_code == 200
+    assert response.json == {'success': True, 'data': {'total_posts_analyzed': 3}}
+    queue.shutdown()
+
+def test_run_analysis_reports_a_failed_job(app_module, monkeypatch):
+    def scrape(context):
+        raise RuntimeError("LinkedIn login failed")
+
+    queue = JobQueue([('scrape', scrape), ('analyze', analyze)])
+    monkeypatch.setattr(app_module, 'job_queue', queue)
+    response = app_module.app.test_client().post('/run-analysis')
+    assert response.status_code == 500
+    assert response.json == {'success': False, 'error': "LinkedIn login failed"}
+    queue.shutdown()
+
+def nltk_data_available():
+    import nltk
+    try:
+        for path in ('corpora/stopwords', 'taggers/averaged_perceptron_tagger', 'tokenizers/punkt'):
+            nltk.data.find(path)
+    except LookupError:
+        return False
+    return True
+
+@pytest.mark.skipif(not nltk_data_available(), reason="NLTK data is not installed")
+def test_pipeline_job_with_a_fixture_scraper(monkeypatch, tmp_path):
+    from pipeline import AnalysisPipeline
+
+    monkeypatch.chdir(tmp_path)
+    scraper = GatedScraper(posts=20)
+    scraper.release.set()
+    pipeline = AnalysisPipeline(scraper_factory=lambda: scraper, num_posts=20, compress=False)
+    queue = JobQueue(pipeline.stages)
+    job, _ = queue.submit()
+    subscription = job.events.subscribe()
+    assert job.wait(60)
+    assert job.status == 'succeeded', job.error
+    assert [stage['name'] for stage in job.stages] == ['prepare', 'scrape', 'analyze', 'suggest']
+    assert all(stage['status'] == 'done' for stage in job.stages)
+    assert job.result['total_posts_analyzed'] > 0
+    assert os.listdir(os.path.join(tmp_path, 'data', 'raw'))
+
+    events = []
+    while not subscription.finished:
+        events.extend(subscription.get(timeout=1))
+    assert [message['data']['posts_scraped'] for message in events if message['event'] == 'progress'][-1] == 20
+    queue.shutdown()
+
+def test_failed_sign_in_fails_the_scrape_stage(monkeypatch, tmp_path):
+    from pipeline import AnalysisPipeline
+    from scraper import AuthenticationError
+
+    class SignedOutScraper(GatedScraper):
+        def iter_feed(self, num_posts=200, on_progress=None):
+            raise AuthenticationError("Could not sign in to LinkedIn as user@example.com")
+            yield
+
+    monkeypatch.chdir(tmp_path)
+    pipeline = AnalysisPipeline(scraper_factory=SignedOutScraper, compress=False)
+    queue = JobQueue([('scrape', pipeline.scrape), ('analyze', analyze)])
+    job, _ = queue.submit()
+    assert job.wait(10)
+    assert job.status == 'failed'
+    assert job.error == "Could not sign in to LinkedIn as user@example.com"
+    assert [stage['status'] for stage in job.stages] == ['failed', 'pending']
+    queue.shutdown()
@@ -0,0 +1,48 @@
+import os
+
+from topics import TopicState
+
+def batch(index, size=5):
+    return [f"growth team{index} data{j} hiring" for j in range(size)]
+
+def test_many_small_batches_are_compacted_and_reload_unchanged(tmp_path):
+    state_dir = str(tmp_path / 'topic_state')
+    state = TopicState(state_dir, max_segments=4)
+    reference = TopicState()
+    for index in range(30):
+        state.add_documents(batch(index))
+        reference.add_documents(batch(index))
+        assert len(state.segments) <= 4
+
+    files = sorted(name for name in os.listdir(state_dir) if name.startswith('segment_'))
+    assert files == [f"segment_{position:06d}.npz" for position in range(1, len(state.segments) + 1)]
+
+    reloaded = TopicState(state_dir, max_segments=4)
+    assert reloaded.n_docs == reference.n_docs == 150
+    assert reloaded.top_terms(10) == reference.top_terms(10)
+    assert (reloaded.matrix() != reference.matrix()).nnz == 0
+
+def test_uncompacted_state_is_compacted_on_load(tmp_path):
+    state_dir = str(tmp_path / 'topic_state')
+    state = TopicState(state_dir, max_segments=100)
+    for index in range(11):
+        state.add_documents(batch(index))
+
+    reloaded = TopicState(state_dir, max_segments=4)
+    assert len(reloaded.segments) <= 4
+    assert len([name for name in os.listdir(state_dir) if name.startswith('segment_')]) == len(reloaded.segments)
+    assert reloaded.top_terms(10) == state.top_terms(10)
+
+def test_top_terms_scores_are_reused_until_documents_are_added():
+    state, reference = TopicState(), TopicState()
+    for index in range(3):
+        state.add_documents(batch(index))
+    top = state.top_terms(50)
+    assert state.top_terms(5) == top[:5]
+
+    state.add_documents(["launch launch launch"] * 20)
+    for index in range(3):
+        reference.add_documents(batch(index))
+    reference.add_documents(["launch launch launch"] * 20)
+    assert state.top_terms(5) == reference.top_terms(5)
+    assert state.top_terms(5)[0][0] == 'launch'